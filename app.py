@@ -1,11 +1,11 @@
 import streamlit as st
-from src.prompt_generator import PromptGenerator
 from src.gemini_client import GeminiClient
 from src.session_manager import SessionManager
 from src.conversation_handler import ConversationHandler
 from src.visualization import Visualization
 from utils.helpers import load_custom_css
-from config import SUPPORTED_LANGUAGES
+from src.hedged_stream import LatencyTracker
+from config import SUPPORTED_LANGUAGES, DEBUG, SESSION_LIST_PAGE_SIZE
 
 # Set page config
 st.set_page_config(
@@ -89,6 +89,20 @@ with st.sidebar:
                 if tech_fig:
                     st.plotly_chart(tech_fig, use_container_width=True)
     
+    # Response latency across all sessions in this process
+    if DEBUG:
+        latency = LatencyTracker.shared().summary()
+        if latency["calls"]:
+            with st.container():
+                st.subheader("Response Latency")
+                for name in ["first_chunk", "total"]:
+                    if latency[name]:
+                        st.markdown(
+                            f"**{name.replace('_', ' ').title()}:** "
+                            + ", ".join(f"{pct} {value:.2f}s" for pct, value in latency[name].items())
+                        )
+                st.markdown(f"**Calls:** {latency['calls']} (hedged: {latency['hedged']}, timed out: {latency['timed_out']})")
+    
     # Session management
     with st.container():
         st.subheader("Session Management")
@@ -102,18 +116,45 @@ with st.sidebar:
         
         with col2:
             if st.button("Save Session", key="save_btn") and len(st.session_state.messages) > 1:
-                filename = SessionManager.save_session()
-                st.success(f"Session saved as: {filename}")
+                session_id = SessionManager.save_session()
+                st.success(f"Session saved as: {session_id}")
+        
+        # Session loading: one cached page of search results at a time
+        def reset_session_page():
+            st.session_state.session_page = 0
+        
+        search = st.text_input("Search Sessions", key="session_search", placeholder="Name, email or session ID", on_change=reset_session_page)
+        prefix = st.checkbox("Match from the start", key="session_search_prefix", on_change=reset_session_page)
+        page = st.session_state.get("session_page", 0)
+        summaries, total = SessionManager.session_page(search, prefix, page)
         
-        # Session loading
-        saved_sessions = SessionManager.list_saved_sessions()
-        if saved_sessions:
-            selected_session = st.selectbox("Load Previous Session", ["Select a session..."] + saved_sessions)
+        if summaries:
+            labels = {summary["session_id"]: SessionManager.session_label(summary) for summary in summaries}
+            selected_session = st.selectbox(
+                "Load Previous Session",
+                ["Select a session..."] + list(labels),
+                format_func=lambda session_id: labels.get(session_id, session_id)
+            )
+            
+            pages = -(-total // SESSION_LIST_PAGE_SIZE)
+            prev_col, page_col, next_col = st.columns([1, 2, 1])
+            with prev_col:
+                if st.button("‹", key="session_prev", disabled=page == 0):
+                    st.session_state.session_page = page - 1
+                    st.rerun()
+            with page_col:
+                st.caption(f"Page {page + 1} of {pages} ({total} sessions)")
+            with next_col:
+                if st.button("›", key="session_next", disabled=page + 1 >= pages):
+                    st.session_state.session_page = page + 1
+                    st.rerun()
             
             if selected_session != "Select a session..." and st.button("Load Session"):
                 if SessionManager.load_session(selected_session):
-                    st.success(f"Session '{selected_session}' loaded successfully!")
+                    st.success(f"Session '{labels[selected_session]}' loaded successfully!")
                     st.rerun()
+        elif search:
+            st.caption("No saved sessions match your search.")
 
 
 
@@ -126,7 +167,7 @@ chat_container = st.container()
 
 with chat_container:
     # Display chat messages
-    for msg in st.session_state.messages:
+    for msg in SessionManager.messages():
         with st.chat_message(msg["role"]):
             st.write(msg["content"])
     
@@ -139,30 +180,8 @@ with chat_container:
             # If this is the first message, initiate the conversation
             if not st.session_state.messages:
                 # Generate initial greeting
-                prompt = PromptGenerator.create_prompt(
-                    "greeting", 
-                    st.session_state.candidate_info,
-                    st.session_state.language
-                )
-                
-                # Get response from model
-                try:
-                    response_text = ""
-                    for chunk in st.session_state.gemini_client.generate_content(prompt, st.session_state.messages):
-                        if chunk.text:
-                            response_text += chunk.text
-                    
-                    # Display the initial greeting
-                    st.session_state.messages.append({"role": "assistant", "content": response_text})
-                    
-                    # Update session state
-                    st.session_state.current_stage = "greeting"
-                    
+                if conversation_handler.start_conversation():
                     st.rerun()
-                
-                except Exception as e:
-                    st.error(f"Error generating initial greeting: {str(e)}")
-  
             
             # Get user input
             user_input = st.chat_input("Type your message here...")
@@ -0,0 +1,199 @@
+"""Offline latency benchmark for the Hiring Assistant using the fake Gemini backend.
+
+Measures time to first chunk and total time for:
+  * GeminiClient streaming under concurrent load ("client" mode)
+  * full interviews through the headless ConversationEngine, spread over
+    several worker processes ("engine" mode)
+  * the full Streamlit rerun path of app.py, driven with AppTest ("app" mode)
+
+Run from the project root:
+    python -m benchmarks.bench_conversation --mode client --sessions 50
+    python -m benchmarks.bench_conversation --mode engine --sessions 50 --processes 4
+    python -m benchmarks.bench_conversation --mode app --turns 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# The fake backend must be selected before config is imported
+os.environ.setdefault("GEMINI_BACKEND", "fake")
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+CANDIDATE_TURNS = [
+    "Hi, my name is Jane Doe",
+    "jane.doe@example.com",
+    "+1 555 123 4567",
+    "I have 4 years of experience",
+    "Backend Engineer",
+    "Berlin, Germany",
+    "Python, Django, PostgreSQL and Docker",
+    "Yes, that's correct",
+    "A decorator wraps a function to extend its behaviour without modifying it.",
+    "Indexes speed up reads at the cost of slower writes.",
+]
+
+
+def percentile(values, pct):
+    """Return the given percentile of a list of values."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def report(name, values):
+    """Print summary statistics for a list of durations in seconds."""
+    print(
+        f"{name:<22} n={len(values):<5} mean={statistics.mean(values) * 1000:8.1f}ms "
+        f"p50={percentile(values, 50) * 1000:8.1f}ms p95={percentile(values, 95) * 1000:8.1f}ms "
+        f"p99={percentile(values, 99) * 1000:8.1f}ms"
+    )
+
+
+def run_client_session(client, turns):
+    """Stream one interview's worth of turns and return (first chunk, total) timings."""
+    first_chunk_times = []
+    total_times = []
+    history = []
+    for message in CANDIDATE_TURNS[:turns]:
+        history.append({"role": "user", "content": message})
+        started = time.perf_counter()
+        first_chunk = None
+        parts = []
+        for chunk in client.generate_content("Benchmark prompt", history):
+            if first_chunk is None:
+                first_chunk = time.perf_counter() - started
+            parts.append(chunk.text)
+        total_times.append(time.perf_counter() - started)
+        first_chunk_times.append(first_chunk or 0.0)
+        history.append({"role": "assistant", "content": "".join(parts)})
+    return first_chunk_times, total_times
+
+
+def bench_client(sessions, turns):
+    """Run many concurrent simulated interviews against GeminiClient."""
+    from src.gemini_client import GeminiClient
+
+    client = GeminiClient("benchmark")
+    started = time.perf_counter()
+    first_chunk_times = []
+    total_times = []
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        for first, total in pool.map(lambda _: run_client_session(client, turns), range(sessions)):
+            first_chunk_times.extend(first)
+            total_times.extend(total)
+    elapsed = time.perf_counter() - started
+
+    print(f"{sessions} sessions x {turns} turns in {elapsed:.2f}s ({len(total_times) / elapsed:.1f} requests/s)")
+    report("time to first chunk", first_chunk_times)
+    report("total stream time", total_times)
+
+
+def run_engine_session(engine, turns):
+    """Run one interview through the engine and return per-turn (first chunk, total) timings."""
+    from src.interview_state import InterviewState
+
+    state = InterviewState()
+    turn = engine.start(state)
+    turn.run()
+    state = turn.state
+
+    first_chunk_times = []
+    total_times = []
+    for message in CANDIDATE_TURNS[:turns]:
+        if state.conversation_ended:
+            break
+        started = time.perf_counter()
+        first_chunk = None
+        turn = engine.process_message(state, message)
+        for _ in turn.stream():
+            if first_chunk is None:
+                first_chunk = time.perf_counter() - started
+        total_times.append(time.perf_counter() - started)
+        first_chunk_times.append(first_chunk or 0.0)
+        state = turn.state
+    return first_chunk_times, total_times
+
+
+def run_engine_worker(sessions, turns):
+    """Run concurrent interviews in one worker process."""
+    from src.gemini_client import GeminiClient
+    from src.conversation_engine import ConversationEngine
+
+    engine = ConversationEngine(GeminiClient("benchmark"))
+    first_chunk_times = []
+    total_times = []
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        for first, total in pool.map(lambda _: run_engine_session(engine, turns), range(sessions)):
+            first_chunk_times.extend(first)
+            total_times.extend(total)
+    return first_chunk_times, total_times
+
+
+def bench_engine(sessions, turns, processes):
+    """Run many headless interviews spread over several worker processes."""
+    per_process = [sessions // processes + (1 if i < sessions % processes else 0) for i in range(processes)]
+    started = time.perf_counter()
+    first_chunk_times = []
+    total_times = []
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        futures = [pool.submit(run_engine_worker, count, turns) for count in per_process if count]
+        for future in futures:
+            first, total = future.result()
+            first_chunk_times.extend(first)
+            total_times.extend(total)
+    elapsed = time.perf_counter() - started
+
+    print(f"{sessions} interviews on {processes} processes in {elapsed:.2f}s ({len(total_times) / elapsed:.1f} turns/s)")
+    report("time to first chunk", first_chunk_times)
+    report("total turn time", total_times)
+
+
+def bench_app(turns):
+    """Drive app.py through a scripted interview and time each rerun."""
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(os.path.join(PROJECT_ROOT, "app.py"), default_timeout=60)
+    app.run()
+    app.text_input(key="api_key_input").input("benchmark")
+
+    started = time.perf_counter()
+    app.run()
+    report("greeting rerun", [time.perf_counter() - started])
+
+    rerun_times = []
+    for message in CANDIDATE_TURNS[:turns]:
+        if not app.chat_input:
+            break
+        started = time.perf_counter()
+        app.chat_input[0].set_value(message).run()
+        rerun_times.append(time.perf_counter() - started)
+
+    if app.exception:
+        print(f"App raised: {app.exception[0].message}")
+    report("chat turn rerun", rerun_times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["client", "engine", "app"], default="client")
+    parser.add_argument("--sessions", type=int, default=20, help="concurrent interviews (client and engine modes)")
+    parser.add_argument("--processes", type=int, default=os.cpu_count() or 1, help="worker processes (engine mode)")
+    parser.add_argument("--turns", type=int, default=len(CANDIDATE_TURNS), help="candidate turns per interview")
+    args = parser.parse_args()
+
+    if args.mode == "client":
+        bench_client(args.sessions, args.turns)
+    elif args.mode == "engine":
+        bench_engine(args.sessions, args.turns, args.processes)
+    else:
+        bench_app(args.turns)
+
+
+if __name__ == "__main__":
+    main()
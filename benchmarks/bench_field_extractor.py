@@ -0,0 +1,83 @@
+"""Benchmark the single-pass candidate field extractor against the old regex chain.
+
+The legacy chain is reproduced from the gather_info branch it replaced: it ran
+the email regex twice, rebuilt the digit string twice for the phone regex and
+filled at most one field per message.
+
+Run from the project root:
+    python -m benchmarks.bench_field_extractor --repeat 20000
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.field_extractor import extract_candidate_fields, CANDIDATE_FIELDS
+
+MESSAGES = [
+    "Hi, my name is Jane Doe and I live in Berlin, Germany",
+    "You can reach me at jane.doe@example.com or +49 30 901820",
+    "555-123-4567",
+    "I have 4 years of experience and I'm applying for a Backend Engineer role",
+    "Backend Engineer",
+    "Currently based in Bangalore, India",
+    "Sure! My email is raj.kumar@mail.co.in and my phone is 98765 43210",
+    "I have been coding for a long time, mostly in Python and Go.",
+]
+
+
+def legacy_extract(message, candidate_info):
+    """The field extraction chain that used to run in _process_stage_specific_message."""
+    if not candidate_info["email"] and re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', message):
+        candidate_info["email"] = re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', message).group(0)
+    elif not candidate_info["phone"] and re.search(r'\b\d{10}\b', message.replace("-", "").replace(" ", "")):
+        candidate_info["phone"] = re.search(r'\b\d{10}\b', message.replace("-", "").replace(" ", "")).group(0)
+    elif not candidate_info["experience"]:
+        if any(word in message.lower() for word in ["year", "years", "yrs", "experience"]):
+            match = re.search(r'\b\d+\s*(?:year|years|yrs|experience)\b', message, re.IGNORECASE)
+            # The original called .group(0) unconditionally and crashed here
+            if match:
+                candidate_info["experience"] = match.group(0)
+    elif not candidate_info["position"]:
+        candidate_info["position"] = message
+    elif not candidate_info["location"]:
+        candidate_info["location"] = message
+    return candidate_info
+
+
+def run_legacy():
+    info = {key: None for key in CANDIDATE_FIELDS}
+    for message in MESSAGES:
+        legacy_extract(message, info)
+    return info
+
+
+def run_single_pass():
+    info = {key: None for key in CANDIDATE_FIELDS}
+    for message in MESSAGES:
+        missing = [key for key in CANDIDATE_FIELDS if not info[key]]
+        for key, value in extract_candidate_fields(message, missing[0] if missing else None).items():
+            if not info[key]:
+                info[key] = value
+    return info
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=20000, help="number of passes over the sample messages")
+    args = parser.parse_args()
+
+    for name, func in [("legacy regex chain", run_legacy), ("single-pass extractor", run_single_pass)]:
+        seconds = timeit.timeit(func, number=args.repeat)
+        per_message = seconds / (args.repeat * len(MESSAGES)) * 1e6
+        filled = {key: value for key, value in func().items() if value}
+        print(f"{name:<22} {per_message:6.2f}us/message, fields filled: {len(filled)}/{len(CANDIDATE_FIELDS)}")
+        for key, value in filled.items():
+            print(f"    {key:<10} {value}")
+
+
+if __name__ == "__main__":
+    main()
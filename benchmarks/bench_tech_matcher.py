@@ -0,0 +1,86 @@
+"""Benchmark the trie tech matcher against the old per-keyword regex loop as the taxonomy grows.
+
+The built-in keywords are padded with synthetic skills (single words and
+multi-word names) up to each taxonomy size. The legacy loop is reproduced
+from the extract_tech it replaced: one re.search per keyword per message.
+
+Run from the project root:
+    python -m benchmarks.bench_tech_matcher --sizes 120 1000 5000 10000
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.skill_index import SkillIndex
+from src.tech_matcher import TechMatcher
+
+MESSAGES = [
+    "I mostly work with Python and Django, plus some React Native for mobile.",
+    "My stack is node.js, express, PostgreSQL and Redis, deployed on AWS with Docker and k8s.",
+    "Recently I've been doing machine learning with PyTorch and scikit-learn on Google Cloud.",
+    "Java and Spring at work, Rust and Go for side projects, and a bit of C++ and C#.",
+    "Honestly I prefer to keep it simple: HTML, CSS and plain JavaScript.",
+    "I have 6 years of experience building data pipelines with Airflow, Spark and BigQuery.",
+]
+
+SYLLABLES = ["ka", "zo", "ri", "pex", "lu", "dra", "mon", "tis", "vek", "qua", "ny", "bor", "sel", "fim", "gra"]
+
+
+def synthetic_aliases(size, seed=0):
+    """Return the built-in alias table padded with made-up skills up to `size` aliases."""
+    rng = random.Random(seed)
+    aliases = dict(SkillIndex.build(taxonomy_path=None).aliases)
+    while len(aliases) < size:
+        words = ["".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))) for _ in range(rng.choice([1, 1, 1, 2]))]
+        name = " ".join(words)
+        aliases.setdefault(name, name)
+    return aliases
+
+
+def legacy_extract(keywords, text):
+    """The keyword loop extract_tech used to run on every message."""
+    text = text.lower()
+    return [tech for tech in keywords if re.search(r'\b' + re.escape(tech) + r'\b', text)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[120, 1000, 5000, 10000], help="taxonomy sizes (aliases)")
+    parser.add_argument("--repeat", type=int, default=2000, help="passes over the sample messages for the matcher")
+    parser.add_argument("--legacy-repeat", type=int, default=5, help="passes over the sample messages for the legacy loop")
+    args = parser.parse_args()
+
+    print(f"{'aliases':>8} {'build':>9} {'trie':>12} {'legacy loop':>14}")
+    for size in args.sizes:
+        aliases = synthetic_aliases(size)
+
+        start = time.perf_counter()
+        matcher = TechMatcher(aliases)
+        build = time.perf_counter() - start
+
+        def run_matcher():
+            for message in MESSAGES:
+                matcher.find(message)
+
+        def run_legacy():
+            for message in MESSAGES:
+                legacy_extract(list(aliases), message)
+
+        trie_us = timeit.timeit(run_matcher, number=args.repeat) / (args.repeat * len(MESSAGES)) * 1e6
+        legacy_us = timeit.timeit(run_legacy, number=args.legacy_repeat) / (args.legacy_repeat * len(MESSAGES)) * 1e6
+        print(f"{len(aliases):>8} {build * 1000:>7.0f}ms {trie_us:>8.1f}us/msg {legacy_us:>10.0f}us/msg")
+
+    print()
+    matcher = TechMatcher(SkillIndex.build(taxonomy_path=None).aliases)
+    for message in MESSAGES:
+        print(f"{message[:60]:<60} -> {', '.join(matcher.find(message))}")
+
+
+if __name__ == "__main__":
+    main()
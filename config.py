@@ -8,10 +8,125 @@ load_dotenv()
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 GEMINI_MODEL = "gemini-2.0-flash"
 
+# Backend used to generate responses: "genai" (Gemini API) or "fake" (local stand-in for load tests)
+GEMINI_BACKEND = os.getenv("GEMINI_BACKEND", "genai")
+
+# Fake backend timing and error injection (only used when GEMINI_BACKEND=fake)
+FAKE_BACKEND_LATENCY = float(os.getenv("FAKE_BACKEND_LATENCY", "0.05"))
+FAKE_BACKEND_FIRST_TOKEN_LATENCY = float(os.getenv("FAKE_BACKEND_FIRST_TOKEN_LATENCY", "0.3"))
+FAKE_BACKEND_TOKENS_PER_SECOND = float(os.getenv("FAKE_BACKEND_TOKENS_PER_SECOND", "150"))
+FAKE_BACKEND_ERROR_RATE = float(os.getenv("FAKE_BACKEND_ERROR_RATE", "0"))
+FAKE_BACKEND_SEED = int(os.getenv("FAKE_BACKEND_SEED", "0"))
+
+# Gemini connection pooling (shared across all sessions in this process)
+GEMINI_MAX_CONCURRENT_REQUESTS = int(os.getenv("GEMINI_MAX_CONCURRENT_REQUESTS", "16"))
+GEMINI_MAX_CONNECTIONS = int(os.getenv("GEMINI_MAX_CONNECTIONS", "32"))
+GEMINI_CLIENT_IDLE_TTL = float(os.getenv("GEMINI_CLIENT_IDLE_TTL", "300"))
+
+# Per-key quotas and retry policy for the request scheduler (0 disables a limit)
+GEMINI_RPM_LIMIT = int(os.getenv("GEMINI_RPM_LIMIT", "2000"))
+GEMINI_TPM_LIMIT = int(os.getenv("GEMINI_TPM_LIMIT", "4000000"))
+GEMINI_ESTIMATED_OUTPUT_TOKENS = int(os.getenv("GEMINI_ESTIMATED_OUTPUT_TOKENS", "400"))
+GEMINI_MAX_RETRIES = int(os.getenv("GEMINI_MAX_RETRIES", "4"))
+GEMINI_RETRY_BASE_DELAY = float(os.getenv("GEMINI_RETRY_BASE_DELAY", "1.0"))
+GEMINI_RETRY_MAX_DELAY = float(os.getenv("GEMINI_RETRY_MAX_DELAY", "20.0"))
+
+# Streaming deadlines in seconds (0 disables). A slow first chunk triggers one hedged duplicate request.
+GEMINI_FIRST_CHUNK_TIMEOUT = float(os.getenv("GEMINI_FIRST_CHUNK_TIMEOUT", "8"))
+GEMINI_CHUNK_GAP_TIMEOUT = float(os.getenv("GEMINI_CHUNK_GAP_TIMEOUT", "15"))
+GEMINI_TOTAL_TIMEOUT = float(os.getenv("GEMINI_TOTAL_TIMEOUT", "90"))
+GEMINI_HEDGE_REQUESTS = os.getenv("GEMINI_HEDGE_REQUESTS", "True").lower() == "true"
+LATENCY_HISTORY_SIZE = int(os.getenv("LATENCY_HISTORY_SIZE", "1000"))
+
+# Cache the stable system-instruction prefix with Gemini's cached-content API.
+# Only prefixes above the model's minimum cacheable size are cached; others are sent inline.
+GEMINI_CONTEXT_CACHING = os.getenv("GEMINI_CONTEXT_CACHING", "False").lower() == "true"
+GEMINI_CONTEXT_CACHE_TTL = int(os.getenv("GEMINI_CONTEXT_CACHE_TTL", "3600"))
+
+# Response cache for stages whose prompt is the same for every candidate (e.g. the greeting)
+RESPONSE_CACHE_STAGES = [stage.strip() for stage in os.getenv("RESPONSE_CACHE_STAGES", "greeting").split(",") if stage.strip()]
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "86400"))
+RESPONSE_CACHE_PATH = os.getenv("RESPONSE_CACHE_PATH")  # e.g. "cache/responses.json" to persist on disk
+
 # App configuration
 DEBUG = os.getenv("DEBUG", "False").lower() == "true"
 DEFAULT_LANGUAGE = os.getenv("DEFAULT_LANGUAGE", "en")
 
+# Conversation history compaction
+HISTORY_KEEP_TURNS = int(os.getenv("HISTORY_KEEP_TURNS", "4"))
+HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "6000"))
+HISTORY_SUMMARY_LINE_CHARS = int(os.getenv("HISTORY_SUMMARY_LINE_CHARS", "160"))
+
+# Local NLP analysis runs on a shared thread pool while the model streams its reply.
+# The prompt waits at most ANALYSIS_PROMPT_TIMEOUT seconds for the sentiment result.
+ANALYSIS_POOL_WORKERS = int(os.getenv("ANALYSIS_POOL_WORKERS", "4"))
+ANALYSIS_PROMPT_TIMEOUT = float(os.getenv("ANALYSIS_PROMPT_TIMEOUT", "0.05"))
+
+# Streamed replies are redrawn at most STREAM_RENDER_MAX_FPS times per second,
+# or sooner once STREAM_RENDER_MIN_CHARS new characters have arrived
+STREAM_RENDER_MAX_FPS = float(os.getenv("STREAM_RENDER_MAX_FPS", "10"))
+STREAM_RENDER_MIN_CHARS = int(os.getenv("STREAM_RENDER_MIN_CHARS", "400"))
+
+# Structured responses: each reply ends with a JSON trailer (extracted fields, techs,
+# next stage, scores) that replaces the keyword heuristics for stage transitions
+STRUCTURED_RESPONSES = os.getenv("STRUCTURED_RESPONSES", "False").lower() == "true"
+STRUCTURED_TRAILER_MARKER = os.getenv("STRUCTURED_TRAILER_MARKER", "<<<STATE>>>")
+
+# Technical questions are generated in the background once the tech stack and
+# experience are known; the first question waits up to QUESTION_PREFETCH_WAIT
+# seconds for a pending set before falling back to asking the model directly
+QUESTION_PREFETCH = os.getenv("QUESTION_PREFETCH", "True").lower() == "true"
+QUESTION_PREFETCH_WORKERS = int(os.getenv("QUESTION_PREFETCH_WORKERS", "4"))
+QUESTION_PREFETCH_WAIT = float(os.getenv("QUESTION_PREFETCH_WAIT", "2"))
+# Pending sets of abandoned interviews are cancelled after this many seconds,
+# or sooner once more than QUESTION_PREFETCH_MAX_PENDING interviews have one
+QUESTION_PREFETCH_TTL = int(os.getenv("QUESTION_PREFETCH_TTL", "1800"))
+QUESTION_PREFETCH_MAX_PENDING = int(os.getenv("QUESTION_PREFETCH_MAX_PENDING", "256"))
+TECHNICAL_QUESTION_COUNT = int(os.getenv("TECHNICAL_QUESTION_COUNT", "5"))
+
+# Local question bank indexed by (technology, difficulty); stacks it fully covers
+# are served from the bank instead of asking the model to write questions
+QUESTION_BANK = os.getenv("QUESTION_BANK", "True").lower() == "true"
+QUESTION_BANK_PATH = os.getenv("QUESTION_BANK_PATH", "data/question_bank.json")
+# Candidates whose asked questions are remembered (least recently interviewed are forgotten first)
+QUESTION_BANK_MAX_CANDIDATES = int(os.getenv("QUESTION_BANK_MAX_CANDIDATES", "1024"))
+
+# Saved sessions: "sqlite" (indexed, WAL mode) or "json" (one file per session in SESSIONS_DIR);
+# the SQLite store imports the files in SESSIONS_DIR the first time it is opened
+SESSION_STORE = os.getenv("SESSION_STORE", "sqlite")
+SESSIONS_DIR = os.getenv("SESSIONS_DIR", "sessions")
+SESSION_DB_PATH = os.getenv("SESSION_DB_PATH", os.path.join(SESSIONS_DIR, "sessions.db"))
+SESSION_LIST_PAGE_SIZE = int(os.getenv("SESSION_LIST_PAGE_SIZE", "20"))
+
+# How sessions are written: "compact" (compressed, header readable without the transcript)
+# or "json" (the original indented JSON); both formats are always readable
+SESSION_FORMAT = os.getenv("SESSION_FORMAT", "compact")
+
+# Every turn is autosaved by appending to a per-session JSONL journal; the journal is
+# folded into a snapshot in the session store every SESSION_SNAPSHOT_EVERY entries
+SESSION_AUTOSAVE = os.getenv("SESSION_AUTOSAVE", "True").lower() == "true"
+SESSION_JOURNAL_DIR = os.getenv("SESSION_JOURNAL_DIR", os.path.join(SESSIONS_DIR, "journal"))
+SESSION_SNAPSHOT_EVERY = int(os.getenv("SESSION_SNAPSHOT_EVERY", "50"))
+
+# Saves of one session are serialized across processes with advisory lock files
+# in SESSION_LOCK_DIR; a background scan moves sessions that cannot be decoded
+# to quarantine every SESSION_INTEGRITY_SCAN_INTERVAL seconds (0 disables it)
+SESSION_LOCK_DIR = os.getenv("SESSION_LOCK_DIR", os.path.join(SESSIONS_DIR, "locks"))
+SESSION_LOCK_TIMEOUT = float(os.getenv("SESSION_LOCK_TIMEOUT", "10"))
+SESSION_INTEGRITY_SCAN_INTERVAL = float(os.getenv("SESSION_INTEGRITY_SCAN_INTERVAL", "3600"))
+
+# Extra skills (canonical names, aliases and categories) merged into TECH_KEYWORDS
+# for tech stack detection; .json, .jsonl or .csv, skipped if the file is missing
+TECH_TAXONOMY_PATH = os.getenv("TECH_TAXONOMY_PATH", "data/tech_taxonomy.json")
+
+# Typo-tolerant pass for skills the exact matcher missed ("postgress", "tensor flow");
+# only matches with at least TECH_FUZZY_MIN_CONFIDENCE are added to the tech stack,
+# and each message gets at most TECH_FUZZY_BUDGET_MS milliseconds of fuzzy matching
+TECH_FUZZY_MATCHING = os.getenv("TECH_FUZZY_MATCHING", "True").lower() == "true"
+TECH_FUZZY_MIN_CONFIDENCE = float(os.getenv("TECH_FUZZY_MIN_CONFIDENCE", "0.85"))
+TECH_FUZZY_BUDGET_MS = float(os.getenv("TECH_FUZZY_BUDGET_MS", "5"))
+
 # Conversation stages
 STAGES = [
     "greeting",
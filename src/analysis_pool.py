@@ -0,0 +1,35 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import ANALYSIS_POOL_WORKERS
+
+class AnalysisPool:
+    """Process-wide thread pool for the local NLP analyzers.
+
+    Sentiment and language analysis run here while the Gemini request is in
+    flight instead of before it. Tasks must not touch st.session_state; their
+    results are merged by the caller on the script thread.
+    """
+
+    _executor = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def executor(cls):
+        """Get (or create) the shared executor."""
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=ANALYSIS_POOL_WORKERS, thread_name_prefix="analysis")
+            return cls._executor
+
+    @classmethod
+    def submit(cls, fn, *args, **kwargs):
+        """Run a function on the shared pool and return its future."""
+        return cls.executor().submit(fn, *args, **kwargs)
+
+    @staticmethod
+    def result(future, timeout=None, default=None):
+        """Return a future's result, or the default if it isn't ready in time or failed."""
+        try:
+            return future.result(timeout=timeout)
+        except Exception:
+            return default
@@ -0,0 +1,149 @@
+import json
+import re
+from src.request_scheduler import PRIORITY_INTERACTIVE
+
+# Structured output schema for the grading response
+GRADING_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "evaluations": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "question_number": {"type": "INTEGER"},
+                    "technology": {"type": "STRING"},
+                    "verdict": {"type": "STRING", "enum": ["correct", "partially correct", "incorrect"]},
+                    "score": {"type": "NUMBER"},
+                    "feedback": {"type": "STRING"}
+                },
+                "required": ["question_number", "technology", "verdict", "score"]
+            }
+        },
+        "scores": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "technology": {"type": "STRING"},
+                    "score": {"type": "NUMBER"}
+                },
+                "required": ["technology", "score"]
+            }
+        },
+        "overall_score": {"type": "NUMBER"}
+    },
+    "required": ["evaluations", "scores", "overall_score"]
+}
+
+
+class AnswerGrader:
+    """Class to grade all technical answers of an interview in a single model call."""
+
+    def __init__(self, gemini_client):
+        """Initialize the grader with the Gemini client."""
+        self.gemini_client = gemini_client
+
+    def grade(self, candidate_info, technical_assessment):
+        """Grade every question/answer pair and return the assessment fields to update.
+
+        Returns a dict with "evaluations", "scores" (technology -> 1-5) and
+        "overall_score", or None if there is nothing to grade or the response
+        could not be parsed.
+        """
+        pairs = list(zip(technical_assessment.get("questions_asked", []), technical_assessment.get("answers", [])))
+        if not pairs or not self.gemini_client or not self.gemini_client.is_initialized():
+            return None
+
+        response_text = "".join(
+            chunk.text for chunk in self.gemini_client.generate_content(
+                self._grading_prompt(candidate_info, pairs),
+                temperature=0.0,
+                max_tokens=2048,
+                response_mime_type="application/json",
+                response_schema=GRADING_SCHEMA,
+                priority=PRIORITY_INTERACTIVE
+            ) if chunk.text
+        )
+
+        return self.parse_grading(response_text, candidate_info.get("tech_stack", []))
+
+    @staticmethod
+    def _grading_prompt(candidate_info, pairs):
+        """Build the prompt listing every question and answer."""
+        prompt = f"""
+        You are grading the technical screening answers of a candidate for TalentScout.
+        The candidate's declared tech stack is: {', '.join(candidate_info.get("tech_stack", [])) or "unknown"}.
+        Their experience is: {candidate_info.get("experience") or "unknown"}.
+
+        For each question below:
+        1. Identify which technology from the tech stack it assesses.
+        2. Judge the answer as correct, partially correct or incorrect.
+        3. Assign a score from 1 to 5 and give one sentence of feedback.
+
+        Then give a score from 1 to 5 for each technology (the average of its questions)
+        and an overall score from 1 to 5.
+        """
+
+        for number, (question, answer) in enumerate(pairs, start=1):
+            prompt += f"\n\nQuestion {number}:\n{question.strip()}\n\nAnswer {number}:\n{answer.strip()}"
+
+        return prompt
+
+    @staticmethod
+    def parse_grading(response_text, tech_stack=None):
+        """Parse the structured grading response into assessment fields."""
+        # Tolerate a fenced code block around the JSON
+        text = re.sub(r'^```(?:json)?\s*|\s*```$', '', (response_text or "").strip())
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+
+        def clamp(score):
+            try:
+                return round(min(max(float(score), 1.0), 5.0), 1)
+            except (TypeError, ValueError):
+                return None
+
+        def objects(key):
+            # Ignore a field that isn't a list of objects rather than failing on it
+            value = data.get(key)
+            if not isinstance(value, list):
+                return []
+            return [item for item in value if isinstance(item, dict)]
+
+        # Report scores under the names the candidate's tech stack uses
+        canonical = {tech.lower(): tech for tech in tech_stack or []}
+
+        scores = {}
+        for item in objects("scores"):
+            score = clamp(item.get("score"))
+            technology = str(item.get("technology", "")).strip()
+            if technology and score is not None:
+                scores[canonical.get(technology.lower(), technology)] = score
+
+        evaluations = []
+        for item in objects("evaluations"):
+            evaluations.append({
+                "question_number": item.get("question_number"),
+                "technology": canonical.get(str(item.get("technology", "")).lower(), item.get("technology")),
+                "verdict": item.get("verdict"),
+                "score": clamp(item.get("score")),
+                "feedback": item.get("feedback", "")
+            })
+
+        overall_score = clamp(data.get("overall_score"))
+        if overall_score is None and scores:
+            overall_score = round(sum(scores.values()) / len(scores), 1)
+
+        if not scores and overall_score is None:
+            return None
+
+        return {
+            "evaluations": evaluations,
+            "scores": scores,
+            "overall_score": overall_score or 0
+        }
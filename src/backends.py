@@ -0,0 +1,171 @@
+import random
+import threading
+import time
+import httpx
+from google import genai
+from google.genai import errors, types
+from config import (
+    GEMINI_MAX_CONNECTIONS,
+    GEMINI_CLIENT_IDLE_TTL,
+    FAKE_BACKEND_LATENCY,
+    FAKE_BACKEND_FIRST_TOKEN_LATENCY,
+    FAKE_BACKEND_TOKENS_PER_SECOND,
+    FAKE_BACKEND_ERROR_RATE,
+    FAKE_BACKEND_SEED
+)
+
+
+class TextChunk:
+    """A minimal streamed response chunk exposing the same `.text` attribute as Gemini's."""
+
+    def __init__(self, text):
+        """Initialize the chunk with its text."""
+        self.text = text
+
+
+class GenerationBackend:
+    """Interface for the services GeminiClient streams responses from."""
+
+    name = "base"
+    # The genai client when the backend talks to the real API (used for cached contents)
+    client = None
+
+    def generate_content_stream(self, model, contents, config):
+        """Return an iterator of chunks with a `.text` attribute."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the backend."""
+
+
+class GenaiBackend(GenerationBackend):
+    """Backend that streams from the Gemini API through a pooled genai client."""
+
+    name = "genai"
+
+    def __init__(self, api_key):
+        """Create the genai client with a pooled HTTP transport."""
+        http_options = types.HttpOptions(
+            client_args={
+                "limits": httpx.Limits(
+                    max_connections=GEMINI_MAX_CONNECTIONS,
+                    max_keepalive_connections=GEMINI_MAX_CONNECTIONS,
+                    keepalive_expiry=GEMINI_CLIENT_IDLE_TTL
+                )
+            }
+        )
+        self.client = genai.Client(api_key=api_key, http_options=http_options)
+
+    def generate_content_stream(self, model, contents, config):
+        """Stream a response from the Gemini API."""
+        return self.client.models.generate_content_stream(
+            model=model,
+            contents=contents,
+            config=config,
+        )
+
+    def close(self):
+        """Close the underlying HTTP transport."""
+        close = getattr(self.client, "close", None)
+        if close:
+            close()
+
+
+class FakeBackend(GenerationBackend):
+    """Local stand-in for Gemini that streams canned or templated text.
+
+    Latency, time to first token, streaming speed and error injection are all
+    configurable, so the app can be load-tested and benchmarked without network
+    access or API quota. With a seed, runs are fully deterministic.
+    """
+
+    name = "fake"
+
+    DEFAULT_TEMPLATE = (
+        "Thank you for your message. You said: \"{last_message}\". "
+        "Could you tell me a little more about your background and experience?"
+    )
+
+    def __init__(self, responses=None, template=DEFAULT_TEMPLATE, latency=FAKE_BACKEND_LATENCY,
+                 first_token_latency=FAKE_BACKEND_FIRST_TOKEN_LATENCY,
+                 tokens_per_second=FAKE_BACKEND_TOKENS_PER_SECOND, tokens_per_chunk=8,
+                 error_rate=FAKE_BACKEND_ERROR_RATE, error_code=503, seed=FAKE_BACKEND_SEED):
+        """Initialize the fake backend.
+
+        Args:
+            responses: Canned responses returned in turn; overrides the template.
+            template: Response template, formatted with `last_message` and `turn`.
+            latency: Fixed delay in seconds before the request is "sent".
+            first_token_latency: Additional delay in seconds before the first chunk.
+            tokens_per_second: Streaming speed; 0 streams without delay.
+            tokens_per_chunk: Number of words per streamed chunk.
+            error_rate: Probability that a request fails instead of streaming.
+            error_code: HTTP status of injected errors (e.g. 429 or 503).
+            seed: Seed for the random generator used for error injection.
+        """
+        self.responses = list(responses) if responses else None
+        self.template = template
+        self.latency = latency
+        self.first_token_latency = first_token_latency
+        self.tokens_per_second = tokens_per_second
+        self.tokens_per_chunk = max(tokens_per_chunk, 1)
+        self.error_rate = error_rate
+        self.error_code = error_code
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def generate_content_stream(self, model, contents, config):
+        """Stream a canned or templated response with the configured timing."""
+        with self._lock:
+            turn = self.requests
+            self.requests += 1
+            fail = self._random.random() < self.error_rate
+
+        text = self._response_text(contents, turn)
+        return self._stream(text, fail)
+
+    def _stream(self, text, fail):
+        """Yield the response in chunks, sleeping to simulate network and decoding time."""
+        time.sleep(self.latency + self.first_token_latency)
+
+        if fail:
+            raise self._error()
+
+        words = text.split(" ")
+        for start in range(0, len(words), self.tokens_per_chunk):
+            chunk_words = words[start:start + self.tokens_per_chunk]
+            if start and self.tokens_per_second:
+                time.sleep(len(chunk_words) / self.tokens_per_second)
+            chunk_text = " ".join(chunk_words)
+            yield TextChunk(chunk_text if start + self.tokens_per_chunk >= len(words) else chunk_text + " ")
+
+    def _response_text(self, contents, turn):
+        """Pick the canned response for this turn or fill in the template."""
+        if self.responses:
+            return self.responses[turn % len(self.responses)]
+
+        last_message = ""
+        for content in reversed(contents or []):
+            if content.role == "user" and content.parts:
+                last_message = content.parts[0].text or ""
+                break
+
+        return self.template.format(last_message=last_message.strip()[:200], turn=turn + 1)
+
+    def _error(self):
+        """Build an error shaped like the ones the Gemini SDK raises."""
+        status = "RESOURCE_EXHAUSTED" if self.error_code == 429 else "UNAVAILABLE"
+        response_json = {"error": {"code": self.error_code, "message": "Injected by FakeBackend", "status": status}}
+        if self.error_code >= 500:
+            return errors.ServerError(self.error_code, response_json)
+        return errors.ClientError(self.error_code, response_json)
+
+
+def create_backend(name, api_key=None):
+    """Create a backend by name ("genai" or "fake")."""
+    if name == FakeBackend.name:
+        return FakeBackend()
+    if name == GenaiBackend.name:
+        return GenaiBackend(api_key)
+    raise ValueError(f"Unknown Gemini backend: {name}")
@@ -0,0 +1,118 @@
+import hashlib
+import threading
+import time
+from src.backends import create_backend
+from src.prefix_cache import PrefixCache
+from src.request_scheduler import RequestScheduler
+from config import GEMINI_MAX_CONCURRENT_REQUESTS, GEMINI_CLIENT_IDLE_TTL
+
+
+class PooledClient:
+    """A shared Gemini backend for one API key with a cap on in-flight requests."""
+
+    def __init__(self, backend):
+        """Wrap a generation backend with request slots and usage tracking."""
+        self.backend = backend
+        self.client = backend.client
+        self.prefix_cache = PrefixCache(self.client) if self.client else None
+        self.scheduler = RequestScheduler()
+        self.slots = threading.BoundedSemaphore(GEMINI_MAX_CONCURRENT_REQUESTS)
+        self.in_flight = 0
+        self.handles = 0
+        self.last_used = time.monotonic()
+        self._lock = threading.Lock()
+
+    def touch(self):
+        """Mark the client as recently used."""
+        self.last_used = time.monotonic()
+
+    def acquire_slot(self):
+        """Block until a request slot is free."""
+        self.slots.acquire()
+        with self._lock:
+            self.in_flight += 1
+        self.touch()
+
+    def release_slot(self):
+        """Return a request slot to the pool."""
+        with self._lock:
+            self.in_flight -= 1
+        self.slots.release()
+        self.touch()
+
+    def is_idle(self, now, idle_ttl):
+        """Check whether the client has no users and has not been used recently."""
+        return self.in_flight == 0 and self.handles == 0 and now - self.last_used > idle_ttl
+
+    def close(self):
+        """Close the underlying backend."""
+        self.backend.close()
+
+
+class ClientRegistry:
+    """Process-wide registry of pooled Gemini clients keyed by API key.
+
+    Every Streamlit session talking to the same API key shares one client, so
+    connections are reused across browser tabs instead of being opened per session.
+    """
+
+    _clients = {}
+    _lock = threading.Lock()
+
+    @staticmethod
+    def _key(api_key, backend_name):
+        """Hash the API key so it is not kept around as a dictionary key."""
+        return hashlib.sha256(f"{backend_name}:{api_key}".encode("utf-8")).hexdigest()
+
+    @classmethod
+    def acquire(cls, api_key, backend_name):
+        """Get (or create) the pooled client for an API key and register a handle."""
+        cls.cleanup_idle()
+        key = cls._key(api_key, backend_name)
+        with cls._lock:
+            pooled = cls._clients.get(key)
+            if pooled is None:
+                pooled = PooledClient(create_backend(backend_name, api_key))
+                cls._clients[key] = pooled
+            pooled.handles += 1
+            pooled.touch()
+            return pooled
+
+    @classmethod
+    def release(cls, api_key, backend_name):
+        """Drop a handle on the pooled client for an API key."""
+        key = cls._key(api_key, backend_name)
+        with cls._lock:
+            pooled = cls._clients.get(key)
+            if pooled is not None and pooled.handles > 0:
+                pooled.handles -= 1
+                pooled.touch()
+
+    @classmethod
+    def cleanup_idle(cls, idle_ttl=GEMINI_CLIENT_IDLE_TTL):
+        """Close and forget clients that nobody has used for a while."""
+        now = time.monotonic()
+        with cls._lock:
+            idle_keys = [key for key, pooled in cls._clients.items() if pooled.is_idle(now, idle_ttl)]
+            idle_clients = [cls._clients.pop(key) for key in idle_keys]
+        for pooled in idle_clients:
+            try:
+                pooled.close()
+            except Exception:
+                pass
+        return len(idle_clients)
+
+    @classmethod
+    def stats(cls):
+        """Return per-client usage figures for monitoring."""
+        with cls._lock:
+            return [
+                {
+                    "backend": pooled.backend.name,
+                    "handles": pooled.handles,
+                    "in_flight": pooled.in_flight,
+                    "queued": pooled.scheduler.queue_length(),
+                    "idle_seconds": round(time.monotonic() - pooled.last_used, 1)
+                }
+                for pooled in cls._clients.values()
+            ]
@@ -0,0 +1,473 @@
+import re
+import time
+from datetime import datetime
+from src.prompt_generator import PromptGenerator
+from src.tech_analyzer import TechAnalyzer
+from src.sentiment_analyzer import SentimentAnalyzer
+from src.language_detector import LanguageDetector
+from src.history_compactor import HistoryCompactor
+from src.answer_grader import AnswerGrader
+from src.field_extractor import extract_candidate_fields, CANDIDATE_FIELDS
+from src.analysis_pool import AnalysisPool
+from src.structured_response import TrailerSplitter
+from src.question_generator import QuestionGenerator
+from src.question_prefetcher import QuestionPrefetcher
+from config import (
+    ANALYSIS_PROMPT_TIMEOUT, STRUCTURED_RESPONSES, STRUCTURED_TRAILER_MARKER, STAGES,
+    QUESTION_PREFETCH, QUESTION_PREFETCH_WAIT
+)
+
+NEUTRAL_SENTIMENT = {"score": 0, "label": "neutral", "subjectivity": 0}
+
+
+class EngineTurn:
+    """One turn of an interview: a stream of response text plus the resulting state.
+
+    Iterate over `stream()` to receive the response as it is generated. Once the
+    stream is exhausted, `state` holds the updated interview, `delta` the fields
+    that changed, `text` the full response and `error` any error that occurred.
+    """
+
+    def __init__(self, original_state, state, generate):
+        """Initialize the turn; `generate` is the engine's generator for the response."""
+        self.original_state = original_state
+        self.state = state
+        self.text = ""
+        self.error = None
+        self.timings = {}
+        self._generate = generate
+        self._finished = False
+
+    def stream(self):
+        """Yield the response text chunk by chunk."""
+        if self._finished:
+            return
+        parts = []
+        for text in self._generate(self):
+            parts.append(text)
+            yield text
+        if not self.error:
+            self.text = "".join(parts)
+        self._finished = True
+
+    def run(self):
+        """Consume the whole stream and return the response text."""
+        for _ in self.stream():
+            pass
+        return self.text
+
+    @property
+    def delta(self):
+        """Return the state fields changed by this turn."""
+        return self.state.diff(self.original_state)
+
+
+class ConversationEngine:
+    """Headless interview engine that works on an explicit InterviewState.
+
+    The engine never touches Streamlit. Callers pass in the current state, consume
+    the returned turn's stream and apply the turn's delta to wherever the state
+    lives (st.session_state in the app, plain objects in workers and benchmarks).
+    Progress messages (queue position, grading) are reported through `on_status`.
+
+    In structured mode each reply ends with a JSON trailer carrying the extracted
+    fields, techs, next stage and scores, which replaces the keyword heuristics for
+    stage transitions. The trailer is stripped from the streamed text; if it is
+    missing or malformed, the turn falls back to the heuristics.
+
+    Technical questions are generated in the background while the tech stack is
+    being discussed. When the technical stage starts with a finished set, each
+    question is served straight from it without a model call.
+    """
+
+    def __init__(self, gemini_client, structured=STRUCTURED_RESPONSES):
+        """Initialize the engine with the Gemini client."""
+        self.gemini_client = gemini_client
+        self.structured = structured
+        self.tech_analyzer = TechAnalyzer()
+        self.sentiment_analyzer = SentimentAnalyzer()
+        self.language_detector = LanguageDetector()
+        self.history_compactor = HistoryCompactor()
+        self.answer_grader = AnswerGrader(gemini_client)
+        self.question_generator = QuestionGenerator(gemini_client)
+
+    def start(self, state, on_status=None):
+        """Start an interview by generating the greeting."""
+        new_state = state.copy()
+        new_state.current_stage = "greeting"
+
+        def generate(turn):
+            yield from self._generate_response(turn, None, on_status)
+
+        return EngineTurn(state, new_state, generate)
+
+    def process_message(self, state, message, record_message=True, on_status=None):
+        """Process the candidate's message and return the turn that answers it."""
+        new_state = state.copy()
+
+        # Skip empty messages
+        if not message or message.strip() == "":
+            return EngineTurn(state, new_state, lambda turn: iter(()))
+
+        # Check for conversation ending keywords
+        if re.search(r'\b(quit|exit|bye|end)\b', message.lower()):
+            new_state.current_stage = "conclusion"
+
+        if record_message:
+            new_state.messages.append({"role": "user", "content": message, "timestamp": datetime.now().isoformat()})
+
+        # Run the local analyzers while the response is generated
+        received_at = datetime.now().isoformat()
+        sentiment_future = AnalysisPool.submit(self.sentiment_analyzer.analyze_sentiment, message)
+        language_future = AnalysisPool.submit(self.language_detector.detect_language, message)
+
+        # Process based on current stage
+        self._process_stage_specific_message(new_state, message)
+        self._prefetch_questions(new_state)
+
+        def generate(turn):
+            sentiment = None
+
+            # Serve the next pre-generated technical question without a model call
+            if self._use_prefetched_questions(turn.state, on_status):
+                yield from self._serve_prefetched_question(turn)
+
+            else:
+                # Grade all technical answers in one call once the assessment is over
+                if turn.state.current_stage == "conclusion":
+                    self._grade_technical_answers(turn.state, on_status)
+
+                # Only the sentiment hint affects the prompt, so only it may delay the request (briefly)
+                sentiment = AnalysisPool.result(sentiment_future, timeout=ANALYSIS_PROMPT_TIMEOUT)
+
+                # Generate response
+                yield from self._generate_response(turn, sentiment, on_status)
+
+            # Merge the analysis results now that the response has streamed
+            sentiment = sentiment or AnalysisPool.result(sentiment_future, default=NEUTRAL_SENTIMENT)
+            turn.state.sentiment_data.append({
+                "message": message,
+                "sentiment": sentiment["label"],
+                "score": sentiment["score"],
+                "timestamp": received_at
+            })
+            detected_language = AnalysisPool.result(language_future)
+            if detected_language:
+                turn.state.detected_language = detected_language
+
+        return EngineTurn(state, new_state, generate)
+
+    def _process_stage_specific_message(self, state, message):
+        """Process the message based on the current conversation stage."""
+
+        if state.current_stage == "greeting" and state.candidate_info["name"] is None:
+            # Extract the name (and anything else volunteered) from the greeting
+            self._update_candidate_fields(state, message, expected_field="name")
+            state.current_stage = "gather_info"
+
+        elif state.current_stage == "gather_info":
+            # Extract every piece of missing information the message contains
+            missing_fields = [key for key in CANDIDATE_FIELDS if not state.candidate_info.get(key)]
+            self._update_candidate_fields(state, message, expected_field=missing_fields[0] if missing_fields else None)
+
+            # Check if we've collected all basic info to move to tech stack
+            if all(state.candidate_info.get(k) for k in CANDIDATE_FIELDS):
+                state.current_stage = "tech_stack"
+
+        elif state.current_stage == "tech_stack":
+            # Extract tech stack from message
+            found_techs = self.tech_analyzer.extract_tech(message)
+            if found_techs:
+                state.candidate_info["tech_stack"].extend(found_techs)
+                # Remove duplicates
+                state.candidate_info["tech_stack"] = list(set(state.candidate_info["tech_stack"]))
+
+            # Check if we should move to technical questions (the trailer decides in structured mode)
+            confirmation_keywords = ["confirm", "yes", "that's it", "that is it", "correct", "right", "looks good"]
+            if not self.structured and any(keyword in message.lower() for keyword in confirmation_keywords) and state.candidate_info["tech_stack"]:
+                state.current_stage = "technical_questions"
+
+        elif state.current_stage == "technical_questions":
+            # Check if technical assessment is complete; the closing message isn't an answer
+            # Match whole words so answers mentioning "extend" or "backend" don't end the assessment
+            assessment = state.technical_assessment
+            if not self.structured and state.tech_questions_generated and re.search(r'\b(end|thank you)\b', message.lower()):
+                state.current_stage = "conclusion"
+                assessment["completed"] = True
+                return
+
+            # Store the candidate's answer to technical questions
+            if state.tech_questions_generated:
+                assessment["answers"].append(message)
+
+            # A pre-generated question set is complete once every question is answered
+            if assessment.get("pregenerated") and len(assessment["answers"]) >= len(assessment["questions_asked"]):
+                state.current_stage = "conclusion"
+                assessment["completed"] = True
+
+    def _prefetch_questions(self, state):
+        """Generate the technical questions in the background once the stack and experience are known."""
+        if not QUESTION_PREFETCH or not self.gemini_client or not self.gemini_client.is_initialized():
+            return
+
+        # Drop a pending set the interview no longer needs
+        if state.tech_questions_generated or state.current_stage == "conclusion":
+            if not state.technical_assessment.get("pregenerated"):
+                QuestionPrefetcher.discard(state.interview_id)
+            return
+
+        # Scheduling again restarts the work if the stack or difficulty changed
+        if state.current_stage in ("tech_stack", "technical_questions") and state.candidate_info["tech_stack"] and state.candidate_info.get("experience"):
+            QuestionPrefetcher.schedule(state.interview_id, self.question_generator, state.candidate_info, state.language)
+
+    def _use_prefetched_questions(self, state, on_status=None):
+        """Return whether the next technical question can be served from a pre-generated set."""
+        if state.current_stage != "technical_questions":
+            return False
+
+        assessment = state.technical_assessment
+        if not state.tech_questions_generated:
+            # The technical stage is starting: adopt the background set if it's ready in time,
+            # otherwise draw from the question bank if it covers the stack
+            if QUESTION_PREFETCH and on_status:
+                on_status("Preparing your technical questions...")
+            self._adopt_questions(state, QUESTION_PREFETCH_WAIT)
+
+        return bool(assessment.get("pregenerated")) and len(assessment["answers"]) < len(assessment["questions_asked"])
+
+    def _adopt_questions(self, state, timeout):
+        """Append the pre-generated (or question bank) set to the questions asked; returns whether one was found.
+
+        Called when the technical stage starts: before the reply when the
+        candidate's message starts it, or after a reply that already asked the
+        first question itself, in which case the set supplies the questions
+        after it.
+        """
+        questions = None
+        if QUESTION_PREFETCH:
+            questions = QuestionPrefetcher.take(state.interview_id, state.candidate_info, state.language, timeout=timeout)
+        if not questions:
+            questions = self.question_generator.from_bank(state.candidate_info, state.language)
+        if not questions:
+            return False
+
+        self.question_generator.mark_asked(state.candidate_info, questions)
+        assessment = state.technical_assessment
+        assessment["questions_asked"].extend(
+            f"{item['technology']}: {item['question']}" if item["technology"] else item["question"]
+            for item in questions
+        )
+        assessment["pregenerated"] = True
+        state.tech_questions_generated = True
+        return True
+
+    @staticmethod
+    def _serve_prefetched_question(turn):
+        """Reply with the next question of the pre-generated set."""
+        started = time.monotonic()
+        state = turn.state
+        assessment = state.technical_assessment
+        index = len(assessment["answers"])
+        total = len(assessment["questions_asked"])
+
+        if index == 0:
+            intro = f"Thank you! Let's move on to the technical assessment. I'll ask you {total} questions, one at a time."
+        else:
+            intro = "Thank you for your answer."
+        response = f"{intro}\n\n**Question {index + 1} of {total}** - {assessment['questions_asked'][index]}"
+        if index + 1 == total:
+            response += "\n\nThis is the last question; your answer completes the technical assessment."
+
+        elapsed = time.monotonic() - started
+        turn.timings.update({"prefetched": True, "chunks": 1, "first_chunk": elapsed, "total": elapsed})
+        state.response_timings.append(turn.timings)
+
+        state.messages.append({
+            "role": "assistant",
+            "content": response,
+            "timestamp": datetime.now().isoformat()
+        })
+        yield response
+
+    @staticmethod
+    def _update_candidate_fields(state, message, expected_field=None):
+        """Fill in any candidate fields found in the message that are still missing."""
+        for key, value in extract_candidate_fields(message, expected_field).items():
+            if not state.candidate_info.get(key):
+                state.candidate_info[key] = value
+
+    def _generate_response(self, turn, sentiment, on_status=None):
+        """Stream a response from the Gemini model and record it in the turn's state."""
+        state = turn.state
+
+        # If client is not initialized, return error message
+        if not self.gemini_client or not self.gemini_client.is_initialized():
+            turn.error = "I'm currently unavailable. Please check your API key and try again."
+            turn.text = turn.error
+            return
+
+        # Create the prompt based on current stage and candidate information
+        system_instruction = PromptGenerator.create_system_instruction(
+            state.current_stage,
+            state.candidate_info,
+            state.language,
+            structured=self.structured
+        )
+        prompt = PromptGenerator.create_turn_context(
+            state.current_stage,
+            state.candidate_info,
+            sentiment
+        )
+
+        # Compact the history so each request stays within the token budget
+        history, state.history_summary, compaction_stats = self.history_compactor.compact(
+            state.messages,
+            state.candidate_info,
+            state.technical_assessment,
+            state.history_summary,
+            reserved_tokens=HistoryCompactor.estimate_tokens(system_instruction + prompt)
+        )
+        state.compaction_stats.append(compaction_stats)
+
+        def show_queue_status(position, expected_wait):
+            if not on_status:
+                return
+            if position:
+                on_status(f"Waiting in queue (position {position}, about {expected_wait:.0f}s)...")
+            else:
+                on_status(f"The service is busy, retrying in {expected_wait:.0f}s...")
+
+        # Get response from model; in structured mode the JSON trailer is held back from the stream
+        splitter = TrailerSplitter(STRUCTURED_TRAILER_MARKER if self.structured else None)
+        try:
+            for chunk in self.gemini_client.generate_content(
+                prompt,
+                history,
+                system_instruction=system_instruction,
+                stage=state.current_stage,
+                on_wait=show_queue_status,
+                timings=turn.timings
+            ):
+                if chunk.text:
+                    text = splitter.feed(chunk.text)
+                    if text:
+                        yield text
+            text = splitter.finish()
+            if text:
+                yield text
+        except Exception as e:
+            turn.error = f"I'm sorry, there was an error generating a response: {str(e)}"
+            turn.text = turn.error
+            state.messages.append({
+                "role": "assistant",
+                "content": turn.error,
+                "timestamp": datetime.now().isoformat()
+            })
+            return
+
+        full_response = splitter.text
+        state.response_timings.append(turn.timings)
+
+        # Add assistant message to the history
+        state.messages.append({
+            "role": "assistant",
+            "content": full_response,
+            "timestamp": datetime.now().isoformat()
+        })
+
+        # Update stage from the JSON trailer, or from the bot response without one
+        previous_stage = state.current_stage
+        trailer = splitter.trailer() if self.structured else None
+        if trailer:
+            self._apply_trailer(state, trailer, full_response)
+
+            # Grade the answers now if the reply ended the interview without scores
+            if state.conversation_ended:
+                self._grade_technical_answers(state)
+        else:
+            self._update_stage_from_response(state, full_response)
+
+        # The reply started the technical stage and asked the first question; a set that's
+        # ready by now asks the rest without further model calls
+        if previous_stage != "technical_questions" and state.current_stage == "technical_questions":
+            self._adopt_questions(state, timeout=0)
+
+    def _grade_technical_answers(self, state, on_status=None):
+        """Grade every recorded technical answer in a single structured-output call."""
+        assessment = state.technical_assessment
+        if assessment.get("graded") or not assessment.get("answers"):
+            return
+
+        if on_status:
+            on_status("Reviewing your technical answers...")
+        try:
+            grading = self.answer_grader.grade(state.candidate_info, assessment)
+        except Exception:
+            grading = None
+
+        if grading:
+            assessment["evaluations"] = grading["evaluations"]
+            assessment["scores"] = grading["scores"]
+            assessment["overall_score"] = grading["overall_score"]
+            assessment["graded"] = True
+
+    @staticmethod
+    def _apply_trailer(state, trailer, response):
+        """Apply the fields, techs, stage and scores from a structured response trailer."""
+        for key, value in trailer["candidate_info"].items():
+            if not state.candidate_info.get(key):
+                state.candidate_info[key] = value
+
+        if trailer["tech_stack"]:
+            state.candidate_info["tech_stack"] = list(set(state.candidate_info["tech_stack"] + trailer["tech_stack"]))
+
+        # Only move forward through the stages
+        previous_stage = state.current_stage
+        next_stage = trailer["next_stage"]
+        if next_stage and STAGES.index(next_stage) > STAGES.index(previous_stage):
+            state.current_stage = next_stage
+
+        # Each reply during the technical stage poses the next question
+        if state.current_stage == "technical_questions":
+            state.tech_questions_generated = True
+            state.technical_assessment["questions_asked"].append(response)
+
+        elif state.current_stage == "conclusion":
+            state.conversation_ended = True
+            if previous_stage == "technical_questions":
+                state.technical_assessment["completed"] = True
+
+            assessment = state.technical_assessment
+            if not assessment.get("graded") and trailer["scores"]:
+                assessment["scores"] = trailer["scores"]
+                assessment["overall_score"] = trailer["overall_score"] or round(
+                    sum(trailer["scores"].values()) / len(trailer["scores"]), 1
+                )
+                assessment["graded"] = True
+
+    @staticmethod
+    def _update_stage_from_response(state, response):
+        """Update the conversation stage based on the bot's response."""
+
+        # Check if we're transitioning from tech stack to technical questions
+        if state.current_stage == "tech_stack" and any(phrase in response.lower() for phrase in ["technical question", "assess your knowledge", "let's test"]):
+            state.current_stage = "technical_questions"
+            state.tech_questions_generated = True
+            state.technical_assessment["questions_asked"].append(response)
+
+        # Each response during the technical stage poses the next question
+        elif state.current_stage == "technical_questions":
+            state.tech_questions_generated = True
+            state.technical_assessment["questions_asked"].append(response)
+
+        # Check if we've reached the conclusion
+        elif state.current_stage == "conclusion":
+            state.conversation_ended = True
+
+            # Fall back to a score mentioned in the reply if batch grading didn't produce one
+            if not state.technical_assessment.get("graded") and ("overall score" in response.lower() or "score:" in response.lower()):
+                score_pattern = r'(\d+(\.\d+)?)\s*\/\s*5'
+                scores = re.findall(score_pattern, response)
+                if scores:
+                    overall_score = float(scores[0][0])
+                    state.technical_assessment["overall_score"] = overall_score
@@ -0,0 +1,138 @@
+import re
+
+# Words after "I am" that don't start a name ("I am a developer", "I am based in...")
+NOT_A_NAME = [
+    "a", "an", "the", "based", "from", "located", "living", "looking", "applying", "interested",
+    "currently", "working", "available", "not", "very", "really", "here", "ready", "fine", "good",
+    "happy", "glad", "okay", "ok", "sure", "in", "at", "with", "using"
+]
+
+# Words that end a name ("I am Jane and I live in Paris")
+NAME_STOP_WORDS = [
+    "and", "but", "or", "with", "from", "at", "in", "i", "my", "who", "based", "living", "live", "located",
+    "currently", "working", "work", "looking", "applying", "have", "am", "role", "position"
+]
+
+# Spelled-out amounts of experience ("five years", "a couple of years")
+NUMBER_WORDS = [
+    "one", "two", "three", "four", "five", "six", "seven", "eight", "nine", "ten", "eleven", "twelve",
+    "thirteen", "fourteen", "fifteen", "twenty", r"a\s+couple\s+of", r"a\s+few", "several", r"half\s+a"
+]
+
+# Order in which the basic candidate details are collected
+CANDIDATE_FIELDS = ["name", "email", "phone", "experience", "position", "location"]
+
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+
+# One alternation of every field, so a message is scanned once. Branch order
+# matters: experience ("5 years") is tried before the looser phone pattern.
+# Every field starts at a word start, checked once up front so positions inside
+# words are rejected without trying each branch.
+FIELD_PATTERN = re.compile(
+    r"""
+    (?<!\w)(?:
+    (?P<email>\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b)
+    | (?P<experience>\b(?:\d{1,2}(?:\.\d)?\+?|(?:""" + "|".join(NUMBER_WORDS) + r"""))\s*(?:years?|yrs?|months?)
+      (?:\s+of\s+(?:professional\s+|work\s+)?experience)?\b(?!\s+(?:old|of\s+age)\b)
+      | \b(?:fresher|fresh\s+graduate|entry[-\s]level|intern|no\s+(?:professional\s+|work\s+)?experience)\b)
+    | (?P<phone>(?<![\w@.])(?:\+|00)?\d[\d\s().-]{5,}\d(?![\w@]))
+    | \b(?:my\s+name\s+is|i\s+am|i'm|this\s+is|name\s*:)\s+
+      (?!(?:""" + "|".join(NOT_A_NAME) + r""")\b)
+      (?P<name>[A-Za-z][A-Za-z'-]*(?:\s+(?!(?:""" + "|".join(NAME_STOP_WORDS) + r""")\b)[A-Za-z][A-Za-z'-]*){0,3})
+    | \b(?:applying\s+for|apply\s+for|looking\s+for|work(?:ing)?\s+as|(?:desired\s+)?(?:position|role)(?:\s+is|\s+of|\s*:))\s+
+      (?:an?\s+|the\s+)?(?:(?:position|role)\s+of\s+)?
+      (?P<position>[A-Za-z][^,.;!?\n]{1,60})
+    | \b(?:based\s+in|located\s+in|live\s+in|living\s+in|i\s+am\s+from|i'm\s+from|currently\s+in|location(?:\s+is|\s*:))\s+
+      (?P<location>[A-Za-z][A-Za-z.'\ -]{1,60}(?:,\s*[A-Za-z][A-Za-z.'\ -]{1,40})?)
+    )""",
+    re.IGNORECASE | re.VERBOSE
+)
+
+DIGITS_PATTERN = re.compile(r'\D')
+
+# Words that end a captured name/position ("I am Jane and I live in...")
+TRAILING_WORDS_PATTERN = re.compile(
+    r"\s+(?:and|but|with|from|at|in|i|my|who|based|living|located|currently|role|position)\b.*$",
+    re.IGNORECASE
+)
+
+def _clean_phone(text):
+    """Normalize a phone number, or return None if it has an implausible number of digits."""
+    digits = DIGITS_PATTERN.sub("", text)
+    international = text.lstrip().startswith(("+", "00"))
+    if text.lstrip().startswith("00"):
+        digits = digits[2:]
+    if international and 7 <= len(digits) <= 15:
+        return "+" + digits
+    if 10 <= len(digits) <= 15:
+        return digits
+    return None
+
+
+def _clean_name(text):
+    """Trim a captured name, or return None if it isn't one."""
+    text = TRAILING_WORDS_PATTERN.sub("", text).strip()
+    if not text:
+        return None
+    return text.title() if text.islower() else text
+
+
+def _clean_phrase(text):
+    """Trim a captured position or location."""
+    text = TRAILING_WORDS_PATTERN.sub("", text).strip(" -'")
+    return text or None
+
+
+FIELD_CLEANERS = {
+    "email": str.strip,
+    "experience": str.strip,
+    "phone": _clean_phone,
+    "name": _clean_name,
+    "position": _clean_phrase,
+    "location": _clean_phrase
+}
+
+
+def extract_candidate_fields(message, expected_field=None):
+    """Extract every candidate detail found in a message in a single scan.
+
+    Returns a dict with any of the keys in CANDIDATE_FIELDS. If nothing can be
+    extracted and `expected_field` is "name", "experience", "position" or
+    "location" (the detail the assistant just asked for), the whole message is
+    used for that field.
+    """
+    fields = {}
+    if not message:
+        return fields
+
+    for match in FIELD_PATTERN.finditer(message):
+        key = match.lastgroup
+        if key in fields:
+            continue
+        value = FIELD_CLEANERS[key](match.group(key))
+        if value:
+            fields[key] = value
+
+    # A bare answer to a direct question ("Backend Engineer", "Berlin", "about a year")
+    if not fields and expected_field in ("name", "experience", "position", "location"):
+        value = message.strip()
+        if value:
+            fields[expected_field] = value
+
+    return fields
+
+
+def extract_email(text):
+    """Extract an email address from text."""
+    match = EMAIL_PATTERN.search(text or "")
+    return match.group(0) if match else None
+
+
+def extract_phone(text):
+    """Extract a phone number from text."""
+    for match in FIELD_PATTERN.finditer(text or ""):
+        if match.lastgroup == "phone":
+            phone = _clean_phone(match.group("phone"))
+            if phone:
+                return phone
+    return None
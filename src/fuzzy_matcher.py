@@ -0,0 +1,154 @@
+import re
+import time
+from collections import Counter
+from config import TECH_FUZZY_BUDGET_MS
+
+# Words and word pairs shorter than this are only matched exactly
+MIN_FUZZY_LENGTH = 5
+
+# Candidates kept per word after the trigram shortlist
+SHORTLIST_SIZE = 5
+
+# Confidence multiplier for two words read as one skill ("tensor flow")
+JOINED_WORDS_PENALTY = 0.95
+
+# Phrases whose fuzzy lookups are remembered; bulk screening sees the same words over and over
+PHRASE_CACHE_SIZE = 100000
+
+_WORD = re.compile(r"[a-z0-9][a-z0-9+#.\-]*[a-z0-9+#]|[a-z0-9]")
+
+
+def trigrams(text):
+    """Return the character trigrams of a word, padded so its ends count too."""
+    padded = f" {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a, b, max_distance):
+    """Return the Levenshtein distance between two strings, or None if it exceeds `max_distance`."""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b))
+        # Stop as soon as every alignment is already over the bound
+        if min(current) > max_distance:
+            return None
+        previous = current
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+class FuzzyTechMatcher:
+    """Typo-tolerant skill lookup for words the exact matcher missed.
+
+    Aliases are indexed by character trigram. Each word (and each pair of
+    adjacent words, spaced or joined) of a message is shortlisted against the
+    aliases sharing the most trigrams with it, then checked with an edit
+    distance bounded by its length. Every match gets a confidence of
+    1 - distance / length; the scan stops when the per-message time budget
+    runs out.
+    """
+
+    def __init__(self, aliases):
+        """Index a mapping of alias -> canonical name."""
+        self.aliases = {alias: canonical for alias, canonical in aliases.items() if len(alias.replace(" ", "")) >= MIN_FUZZY_LENGTH}
+        self.postings = {}
+        for alias in self.aliases:
+            for trigram in trigrams(alias):
+                self.postings.setdefault(trigram, []).append(alias)
+        self.phrase_cache = {}
+
+    @staticmethod
+    def max_distance(text):
+        """Allow one edit in short words and two in longer ones."""
+        return 1 if len(text) <= 8 else 2
+
+    def shortlist(self, text):
+        """Return the aliases sharing the most trigrams with a word, best first."""
+        word_trigrams = trigrams(text)
+        shared = Counter()
+        for trigram in word_trigrams:
+            shared.update(self.postings.get(trigram, ()))
+
+        max_distance = self.max_distance(text)
+        candidates = [
+            (count / max(len(word_trigrams), len(trigrams(alias))), alias)
+            for alias, count in shared.items()
+            if abs(len(alias) - len(text)) <= max_distance and alias[0] == text[0]
+        ]
+        candidates.sort(reverse=True)
+        return [alias for score, alias in candidates[:SHORTLIST_SIZE] if score >= 0.3]
+
+    def phrase_matches(self, phrase):
+        """Return (alias, distance) for every alias within edit distance of a phrase."""
+        matches = self.phrase_cache.get(phrase)
+        if matches is None:
+            matches = []
+            for alias in self.shortlist(phrase):
+                distance = bounded_edit_distance(phrase, alias, self.max_distance(phrase))
+                if distance is not None:
+                    matches.append((alias, distance))
+            if len(self.phrase_cache) >= PHRASE_CACHE_SIZE:
+                self.phrase_cache.clear()
+            self.phrase_cache[phrase] = matches
+        return matches
+
+    def candidate_phrases(self, text, skip_spans=(), stop=None):
+        """Yield (phrase, penalty, start) for every word and adjacent word pair outside the skipped spans.
+
+        Phrases starting at or after `stop` are left out; a pair starting
+        before it may still end after it.
+        """
+        # One sweep over the sorted spans, so long texts with many exact matches stay linear
+        spans = sorted(skip_spans)
+        words = []
+        span_index = 0
+        for match in _WORD.finditer(text.lower()):
+            while span_index < len(spans) and spans[span_index][1] <= match.start():
+                span_index += 1
+            if span_index < len(spans) and spans[span_index][0] < match.end():
+                continue
+            words.append(match)
+        for index, match in enumerate(words):
+            if stop is not None and match.start() >= stop:
+                break
+            yield match.group(0), 1.0, match.start()
+            if index + 1 < len(words) and text[match.end():words[index + 1].start()].isspace():
+                following = words[index + 1].group(0)
+                yield f"{match.group(0)} {following}", 1.0, match.start()
+                yield match.group(0) + following, JOINED_WORDS_PENALTY, match.start()
+
+    def find_all(self, text, skip_spans=(), budget_ms=TECH_FUZZY_BUDGET_MS, stop=None):
+        """Yield (start, canonical name, confidence, phrase) for every phrase close to an alias.
+
+        `skip_spans` are (start, end) ranges already matched exactly. Phrases
+        are checked until the time budget runs out; a `budget_ms` of None
+        checks every phrase. Phrases starting at or after `stop` are not
+        checked.
+        """
+        deadline = time.perf_counter() + budget_ms / 1000 if budget_ms is not None else None
+        for phrase, penalty, start in self.candidate_phrases(text, skip_spans, stop):
+            if deadline is not None and time.perf_counter() > deadline:
+                return
+            if len(phrase.replace(" ", "")) < MIN_FUZZY_LENGTH:
+                continue
+
+            for alias, distance in self.phrase_matches(phrase):
+                confidence = round((1 - distance / max(len(phrase), len(alias))) * penalty, 3)
+                yield start, self.aliases[alias], confidence, phrase
+
+    def find(self, text, skip_spans=(), budget_ms=TECH_FUZZY_BUDGET_MS):
+        """Return {"technology", "confidence", "text"} matches, best confidence per technology.
+
+        `skip_spans` are (start, end) ranges already matched exactly. Matches
+        found before the time budget runs out are returned; a `budget_ms` of
+        None checks every phrase.
+        """
+        best = {}
+        for _, canonical, confidence, phrase in self.find_all(text, skip_spans, budget_ms):
+            if confidence > best.get(canonical, {}).get("confidence", 0):
+                best[canonical] = {"technology": canonical, "confidence": confidence, "text": phrase}
+
+        return sorted(best.values(), key=lambda match: -match["confidence"])
@@ -1,27 +1,57 @@
-import os
-from google import genai
+import threading
+import weakref
 from google.genai import types
 import streamlit as st
-from config import GEMINI_API_KEY, GEMINI_MODEL
+from config import (
+    GEMINI_API_KEY,
+    GEMINI_MODEL,
+    GEMINI_BACKEND,
+    GEMINI_CONTEXT_CACHING,
+    GEMINI_ESTIMATED_OUTPUT_TOKENS,
+    RESPONSE_CACHE_STAGES
+)
+from src.backends import GenerationBackend
+from src.client_registry import ClientRegistry, PooledClient
+from src.response_cache import ResponseCache
+from src.request_scheduler import PRIORITY_INTERACTIVE
+from src.hedged_stream import hedged_stream
 
 class GeminiClient:
-    """Class to handle communication with the Gemini API."""
+    """Class to handle communication with the Gemini API.
     
-    def __init__(self, api_key=None):
+    Each instance is a thin per-session handle over a pooled client shared by
+    every session using the same API key (see ClientRegistry). The backend is
+    "genai" for the real API or "fake" for the local stand-in used in load
+    tests; a GenerationBackend instance can also be passed directly.
+    """
+    
+    def __init__(self, api_key=None, backend=None):
         """Initialize the Gemini client with API key."""
         self.api_key = api_key or GEMINI_API_KEY
+        self.backend = backend or GEMINI_BACKEND
         self.model = GEMINI_MODEL
         self.client = None
+        self.pooled = None
         self.initialize()
     
     def initialize(self):
         """Initialize the Gemini client."""
         try:
-            if not self.api_key:
+            if isinstance(self.backend, GenerationBackend):
+                # A backend supplied by the caller is private to this handle
+                self.pooled = PooledClient(self.backend)
+                self.client = self.pooled.client
+                return True
+            
+            if not self.api_key and self.backend != "fake":
                 st.error("Gemini API key is missing. Please set it in the .env file or provide it in the UI.")
                 return False
             
-            self.client = genai.Client(api_key=self.api_key)
+            api_key = self.api_key or ""
+            self.pooled = ClientRegistry.acquire(api_key, self.backend)
+            self.client = self.pooled.client
+            # Release the shared client handle once this session's handle is garbage collected
+            weakref.finalize(self, ClientRegistry.release, api_key, self.backend)
             return True
         except Exception as e:
             st.error(f"Failed to initialize Gemini client: {str(e)}")
@@ -29,48 +59,150 @@ class GeminiClient:
     
     def is_initialized(self):
         """Check if the client is initialized."""
-        return self.client is not None
+        return self.pooled is not None
     
-    def generate_content(self, prompt, messages=None, temperature=0.7, max_tokens=8192):
-        """Generate content using the Gemini API with streaming enabled."""
+    def generate_content(self, prompt, messages=None, temperature=0.7, max_tokens=8192, system_instruction=None,
+                         stage=None, priority=PRIORITY_INTERACTIVE, on_wait=None, timings=None,
+                         response_mime_type="text/plain", response_schema=None):
+        """Generate content using the Gemini API with streaming enabled.
+        
+        The optional system instruction holds the stable part of the prompt; when
+        context caching is enabled it is uploaded once and referenced by name.
+        Responses for stages listed in RESPONSE_CACHE_STAGES are served from the
+        response cache when possible and replayed as a stream.
+        
+        Requests are paced by the API key's RequestScheduler. While the request is
+        queued, `on_wait(position, expected_wait)` is called so the caller can show
+        its queue position. Errors are raised while iterating over the stream.
+        
+        Each attempt is subject to the streaming deadlines (with one hedged
+        duplicate request on a slow first chunk); its timings are written into the
+        optional `timings` dict.
+        
+        Pass response_mime_type="application/json" and a response_schema to get
+        structured output.
+        """
         if not self.is_initialized():
-            return "Error: Gemini client is not initialized."
+            raise RuntimeError("Gemini client is not initialized.")
         
-        try:
-            # Create content from prompt
-            contents = [
-                types.Content(
-                    role="user",
-                    parts=[types.Part.from_text(text=prompt)]
-                )
-            ]
-            
-            # Add conversation history if provided
-            if messages:
-                for msg in messages:
-                    contents.append(
-                        types.Content(
-                            role="user" if msg["role"] == "user" else "model",
-                            parts=[types.Part.from_text(text=msg["content"])]
-                        )
-                    )
-            
-            # Configure generation parameters
-            config = types.GenerateContentConfig(
-                temperature=temperature,
-                top_p=0.95,
-                top_k=40,
-                max_output_tokens=max_tokens,
-                response_mime_type="text/plain",
+        # Serve cacheable stages from the response cache
+        cache_key = None
+        if stage in RESPONSE_CACHE_STAGES:
+            cache = ResponseCache.shared()
+            cache_key = ResponseCache.make_key(
+                self.model, prompt, messages, system_instruction,
+                {"temperature": temperature, "max_tokens": max_tokens}
             )
-            
-            # Return a generator for streaming responses
-            return self.client.models.generate_content_stream(
-                model=self.model,
-                contents=contents,
-                config=config,
+            cached_text = cache.get(cache_key)
+            if cached_text is not None:
+                return cache.replay(cached_text)
+        
+        # Create content from prompt
+        contents = [
+            types.Content(
+                role="user",
+                parts=[types.Part.from_text(text=prompt)]
             )
+        ]
         
-        except Exception as e:
-            st.error(f"Error generating content: {str(e)}")
-            return None
+        # Add conversation history if provided
+        if messages:
+            for msg in messages:
+                contents.append(
+                    types.Content(
+                        role="user" if msg["role"] == "user" else "model",
+                        parts=[types.Part.from_text(text=msg["content"])]
+                    )
+                )
+        
+        # Configure generation parameters
+        config = types.GenerateContentConfig(
+            temperature=temperature,
+            top_p=0.95,
+            top_k=40,
+            max_output_tokens=max_tokens,
+            response_mime_type=response_mime_type,
+            response_schema=response_schema,
+        )
+        
+        if system_instruction:
+            cached_content = None
+            if GEMINI_CONTEXT_CACHING and self.pooled.prefix_cache:
+                cached_content = self.pooled.prefix_cache.get(self.model, system_instruction)
+            if cached_content:
+                config.cached_content = cached_content
+            else:
+                config.system_instruction = system_instruction
+        
+        # Estimate the tokens this request will use against the per-minute quota
+        input_text = (system_instruction or "") + prompt + "".join(msg["content"] for msg in messages or [])
+        estimated_tokens = len(input_text) // 4 + GEMINI_ESTIMATED_OUTPUT_TOKENS
+        
+        # Return a generator for streaming responses
+        def make_hedge():
+            # The hedged duplicate counts against the key's quotas like any other request
+            self.pooled.scheduler.acquire(estimated_tokens, priority)
+            return self._stream(contents, config)
+        
+        stream = self.pooled.scheduler.stream(
+            lambda: hedged_stream(lambda: self._stream(contents, config), timings=timings, make_hedge=make_hedge),
+            estimated_tokens,
+            priority,
+            on_wait
+        )
+        if cache_key:
+            return cache.record(cache_key, stream)
+        return stream
+    
+    def _stream(self, contents, config):
+        """Stream a response while holding one of the pooled client's request slots."""
+        return PooledStream(self.pooled, lambda: self.pooled.backend.generate_content_stream(self.model, contents, config))
+
+
+class PooledStream:
+    """A backend stream that holds one of the pooled client's request slots.
+
+    The slot is given back once, when the stream ends, fails or is closed.
+    Closing it from another thread (a hedged attempt that lost) frees the
+    slot straight away, even while a read is still blocked.
+    """
+    
+    def __init__(self, pooled, open_stream):
+        """Take a request slot and open the backend stream."""
+        self.pooled = pooled
+        self.stream = None
+        self._released = False
+        self._lock = threading.Lock()
+        pooled.acquire_slot()
+        try:
+            self.stream = iter(open_stream())
+        except BaseException:
+            self.release()
+            raise
+    
+    def __iter__(self):
+        """Return the stream itself."""
+        return self
+    
+    def __next__(self):
+        """Return the next chunk, giving the slot back when the stream ends or fails."""
+        try:
+            return next(self.stream)
+        except BaseException:
+            self.release()
+            raise
+    
+    def release(self):
+        """Give the request slot back (only the first call does anything)."""
+        with self._lock:
+            if self._released:
+                return
+            self._released = True
+        self.pooled.release_slot()
+    
+    def close(self):
+        """Give the slot back and close the backend stream if it can be closed now."""
+        self.release()
+        close = getattr(self.stream, "close", None)
+        if close:
+            close()
@@ -0,0 +1,192 @@
+import queue
+import threading
+import time
+from collections import deque
+from config import (
+    GEMINI_FIRST_CHUNK_TIMEOUT,
+    GEMINI_CHUNK_GAP_TIMEOUT,
+    GEMINI_TOTAL_TIMEOUT,
+    GEMINI_HEDGE_REQUESTS,
+    LATENCY_HISTORY_SIZE
+)
+
+
+class StreamTimeoutError(Exception):
+    """Raised when a streamed response misses one of its deadlines."""
+
+
+class LatencyTracker:
+    """Process-wide record of recent per-call stream timings."""
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, size=LATENCY_HISTORY_SIZE):
+        """Initialize the tracker with a bounded history."""
+        self._timings = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls):
+        """Get the process-wide latency tracker."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def record(self, timings):
+        """Add the timings of one call."""
+        with self._lock:
+            self._timings.append(dict(timings))
+
+    def summary(self):
+        """Return p50/p95/p99 of first-chunk and total times plus hedge and timeout counts."""
+        with self._lock:
+            timings = list(self._timings)
+
+        def percentiles(values):
+            if not values:
+                return {}
+            ordered = sorted(values)
+            pick = lambda pct: ordered[min(int(pct / 100 * len(ordered)), len(ordered) - 1)]
+            return {"p50": pick(50), "p95": pick(95), "p99": pick(99)}
+
+        return {
+            "calls": len(timings),
+            "first_chunk": percentiles([t["first_chunk"] for t in timings if t.get("first_chunk") is not None]),
+            "total": percentiles([t["total"] for t in timings if t.get("total") is not None]),
+            "hedged": sum(1 for t in timings if t.get("hedged")),
+            "timed_out": sum(1 for t in timings if t.get("timed_out"))
+        }
+
+
+class _Attempt:
+    """One streaming request running on a background thread."""
+
+    def __init__(self, index, make_stream, events):
+        """Start pumping the stream's chunks into the shared event queue."""
+        self.index = index
+        self.stream = None
+        self.cancelled = threading.Event()
+        self.thread = threading.Thread(target=self._pump, args=(make_stream, events), daemon=True)
+        self.thread.start()
+
+    def _pump(self, make_stream, events):
+        """Forward chunks, errors and completion to the event queue."""
+        stream = None
+        try:
+            stream = self.stream = make_stream()
+            if self.cancelled.is_set():
+                return
+            for chunk in stream:
+                if self.cancelled.is_set():
+                    break
+                events.put(("chunk", self.index, chunk))
+            events.put(("done", self.index, None))
+        except Exception as e:
+            events.put(("error", self.index, e))
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+
+    def cancel(self):
+        """Stop the attempt, closing its stream so it gives up its request slot.
+
+        A stream the pump thread is reading from can't be closed from here;
+        it stops after its current chunk instead.
+        """
+        self.cancelled.set()
+        close = getattr(self.stream, "close", None)
+        if close:
+            try:
+                close()
+            except ValueError:
+                # "generator already executing": the pump thread closes it
+                pass
+
+
+def hedged_stream(make_stream, first_chunk_timeout=GEMINI_FIRST_CHUNK_TIMEOUT,
+                  chunk_gap_timeout=GEMINI_CHUNK_GAP_TIMEOUT, total_timeout=GEMINI_TOTAL_TIMEOUT,
+                  hedge=GEMINI_HEDGE_REQUESTS, timings=None, make_hedge=None):
+    """Yield chunks from a stream, enforcing deadlines and hedging a slow start.
+
+    If no chunk arrives within `first_chunk_timeout`, one duplicate request is
+    started and whichever stream produces a chunk first is kept; the other is
+    cancelled and its stream closed. `make_hedge` starts the duplicate (by
+    default `make_stream`), so callers can schedule it like any other
+    request. After that, each chunk must arrive within `chunk_gap_timeout` of
+    the previous one and the whole response within `total_timeout`, otherwise
+    StreamTimeoutError is raised. A timeout of 0 disables that deadline.
+
+    Timings for the call are written into `timings` (if given) and recorded in
+    the process-wide LatencyTracker.
+    """
+    timings = timings if timings is not None else {}
+    timings.update({"first_chunk": None, "total": None, "chunks": 0, "hedged": False, "timed_out": False})
+
+    events = queue.Queue()
+    started = time.monotonic()
+    attempts = [_Attempt(0, make_stream, events)]
+    failed = set()
+    winner = None
+    hedged_at = None
+    last_chunk_at = started
+
+    try:
+        while True:
+            now = time.monotonic()
+            deadlines = []
+            if total_timeout:
+                deadlines.append(("total", started + total_timeout))
+            if winner is None and first_chunk_timeout:
+                if not hedge:
+                    deadlines.append(("first_chunk", started + first_chunk_timeout))
+                elif len(attempts) == 1:
+                    deadlines.append(("hedge", started + first_chunk_timeout))
+                else:
+                    # The hedged request gets its own first-chunk allowance
+                    deadlines.append(("first_chunk", hedged_at + first_chunk_timeout))
+            if winner is not None and chunk_gap_timeout:
+                deadlines.append(("chunk_gap", last_chunk_at + chunk_gap_timeout))
+
+            name, deadline = min(deadlines, key=lambda item: item[1]) if deadlines else (None, None)
+            try:
+                kind, index, payload = events.get(timeout=max(deadline - now, 0) if deadline else None)
+            except queue.Empty:
+                if name == "hedge":
+                    timings["hedged"] = True
+                    hedged_at = time.monotonic()
+                    attempts.append(_Attempt(1, make_hedge or make_stream, events))
+                    continue
+                timings["timed_out"] = True
+                raise StreamTimeoutError(f"No response from the model within the {name.replace('_', ' ')} deadline.")
+
+            # Ignore whatever the losing attempt sends after a winner is chosen
+            if winner is not None and index != winner:
+                continue
+
+            if kind == "chunk":
+                if winner is None:
+                    winner = index
+                    timings["first_chunk"] = time.monotonic() - started
+                    timings["winner"] = index
+                    for attempt in attempts:
+                        if attempt.index != winner:
+                            attempt.cancel()
+                last_chunk_at = time.monotonic()
+                timings["chunks"] += 1
+                yield payload
+            elif kind == "done":
+                # A stream that finishes without any chunks still counts as the response
+                return
+            elif kind == "error":
+                failed.add(index)
+                # Keep waiting for the other attempt unless every attempt has failed
+                if winner is not None or len(failed) == len(attempts):
+                    raise payload
+    finally:
+        for attempt in attempts:
+            attempt.cancel()
+        timings["total"] = time.monotonic() - started
+        LatencyTracker.shared().record(timings)
@@ -0,0 +1,125 @@
+import re
+from config import HISTORY_KEEP_TURNS, HISTORY_TOKEN_BUDGET, HISTORY_SUMMARY_LINE_CHARS
+
+class HistoryCompactor:
+    """Class to keep the conversation history sent to Gemini within a token budget.
+
+    The last few turns are sent verbatim. Older turns are folded into a running
+    summary together with the structured facts already collected about the candidate,
+    so the request size stays roughly constant instead of growing with every turn.
+    """
+
+    def __init__(self, keep_turns=HISTORY_KEEP_TURNS, token_budget=HISTORY_TOKEN_BUDGET,
+                 summary_line_chars=HISTORY_SUMMARY_LINE_CHARS):
+        """Initialize the compactor with the window size and token budget."""
+        self.keep_messages = max(keep_turns, 1) * 2
+        self.token_budget = token_budget
+        self.summary_line_chars = summary_line_chars
+
+    @staticmethod
+    def estimate_tokens(text):
+        """Roughly estimate the token count of a text (about 4 characters per token)."""
+        if not text:
+            return 0
+        return len(text) // 4 + 1
+
+    @staticmethod
+    def new_summary_state():
+        """Create an empty running summary."""
+        return {"covered": 0, "lines": []}
+
+    def compact(self, messages, candidate_info=None, technical_assessment=None,
+                summary_state=None, reserved_tokens=0):
+        """Compact the conversation history for a single request.
+
+        Returns a tuple of (messages to send, updated summary state, stats). The
+        summary state should be stored and passed back on the next turn so older
+        turns are only summarized once.
+        """
+        messages = messages or []
+        state = dict(summary_state) if summary_state else self.new_summary_state()
+        state["lines"] = list(state.get("lines", []))
+
+        # The history may have been replaced (e.g. a session was loaded)
+        if state["covered"] > len(messages):
+            state = self.new_summary_state()
+
+        original_tokens = sum(self.estimate_tokens(msg["content"]) for msg in messages)
+
+        # Fold everything outside the verbatim window into the summary
+        cutoff = max(len(messages) - self.keep_messages, state["covered"])
+        self._fold(messages, state, cutoff)
+
+        facts = self._facts(candidate_info, technical_assessment)
+
+        # Enforce the token budget, first by shrinking the verbatim window, then the summary
+        while True:
+            summary_message = self._summary_message(state["lines"], facts) if state["covered"] else None
+            compacted = ([summary_message] if summary_message else []) + list(messages[state["covered"]:])
+            sent_tokens = sum(self.estimate_tokens(msg["content"]) for msg in compacted)
+
+            if not self.token_budget or sent_tokens + reserved_tokens <= self.token_budget:
+                break
+            if len(messages) - state["covered"] > 2:
+                self._fold(messages, state, state["covered"] + 1)
+            elif state["lines"]:
+                state["lines"].pop(0)
+            else:
+                break
+
+        stats = {
+            "original_tokens": original_tokens,
+            "sent_tokens": sent_tokens,
+            "saved_tokens": max(original_tokens - sent_tokens, 0),
+            "summarized_messages": state["covered"]
+        }
+
+        return compacted, state, stats
+
+    def _fold(self, messages, state, cutoff):
+        """Add summary lines for messages up to (not including) the cutoff index."""
+        for msg in messages[state["covered"]:cutoff]:
+            speaker = "Candidate" if msg["role"] == "user" else "Assistant"
+            state["lines"].append(f"{speaker}: {self._condense(msg['content'])}")
+        state["covered"] = max(state["covered"], cutoff)
+
+    def _condense(self, text):
+        """Reduce a message to its first sentence, capped in length."""
+        text = re.sub(r'\s+', ' ', text or "").strip()
+        first_sentence = re.split(r'(?<=[.!?])\s', text, maxsplit=1)[0]
+        if len(first_sentence) > self.summary_line_chars:
+            first_sentence = first_sentence[:self.summary_line_chars].rstrip() + "..."
+        return first_sentence
+
+    @staticmethod
+    def _facts(candidate_info, technical_assessment):
+        """Describe the structured facts collected so far."""
+        facts = []
+
+        for key, value in (candidate_info or {}).items():
+            if value:
+                if key == "tech_stack":
+                    facts.append(f"- {key}: {', '.join(value)}")
+                else:
+                    facts.append(f"- {key}: {value}")
+
+        if technical_assessment:
+            if technical_assessment.get("questions_asked"):
+                facts.append(f"- technical questions asked: {len(technical_assessment['questions_asked'])}")
+            if technical_assessment.get("answers"):
+                facts.append(f"- technical answers given: {len(technical_assessment['answers'])}")
+            if technical_assessment.get("scores"):
+                scores = ", ".join(f"{tech}: {score}/5" for tech, score in technical_assessment["scores"].items())
+                facts.append(f"- technical scores: {scores}")
+
+        return facts
+
+    @staticmethod
+    def _summary_message(lines, facts):
+        """Build the synthetic message that stands in for the older turns."""
+        text = "Summary of the earlier part of this conversation (older turns were condensed):"
+        if facts:
+            text += "\nKnown facts:\n" + "\n".join(facts)
+        if lines:
+            text += "\nEarlier turns:\n" + "\n".join(lines)
+        return {"role": "user", "content": text}
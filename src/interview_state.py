@@ -0,0 +1,97 @@
+import copy
+import json
+import uuid
+from dataclasses import dataclass, field, fields, asdict
+from config import DEFAULT_LANGUAGE
+
+
+def new_candidate_info():
+    """Create an empty candidate information record."""
+    return {
+        "name": None,
+        "email": None,
+        "phone": None,
+        "experience": None,
+        "position": None,
+        "location": None,
+        "tech_stack": []
+    }
+
+
+def new_technical_assessment():
+    """Create an empty technical assessment record."""
+    return {
+        "questions_asked": [],
+        "answers": [],
+        "evaluations": [],
+        "scores": {},
+        "overall_score": 0,
+        "completed": False,
+        "graded": False,
+        "pregenerated": False
+    }
+
+
+@dataclass
+class InterviewState:
+    """Serializable state of one interview, independent of Streamlit.
+
+    ConversationEngine reads an InterviewState and returns a delta of the fields
+    it changed, so an interview can be driven from st.session_state, a worker
+    process or a benchmark alike.
+    """
+
+    interview_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    messages: list = field(default_factory=list)
+    current_stage: str = "greeting"
+    conversation_ended: bool = False
+    candidate_info: dict = field(default_factory=new_candidate_info)
+    tech_questions_generated: bool = False
+    technical_assessment: dict = field(default_factory=new_technical_assessment)
+    sentiment_data: list = field(default_factory=list)
+    detected_language: str = None
+    language: str = DEFAULT_LANGUAGE
+    history_summary: dict = None
+    compaction_stats: list = field(default_factory=list)
+    response_timings: list = field(default_factory=list)
+
+    @classmethod
+    def field_names(cls):
+        """Return the names of all state fields."""
+        return [f.name for f in fields(cls)]
+
+    @classmethod
+    def from_dict(cls, data):
+        """Build a state from a dict (e.g. st.session_state), ignoring unknown keys."""
+        known = {name: copy.deepcopy(data[name]) for name in cls.field_names() if name in data and data[name] is not None}
+        state = cls(**known)
+
+        # Fill in keys missing from older saved sessions
+        state.candidate_info = {**new_candidate_info(), **state.candidate_info}
+        state.technical_assessment = {**new_technical_assessment(), **state.technical_assessment}
+        return state
+
+    def to_dict(self):
+        """Return a deep copy of the state as plain dicts and lists."""
+        return asdict(self)
+
+    def to_json(self):
+        """Serialize the state to JSON."""
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, text):
+        """Deserialize a state from JSON."""
+        return cls.from_dict(json.loads(text))
+
+    def copy(self):
+        """Return an independent deep copy of the state."""
+        return copy.deepcopy(self)
+
+    def diff(self, other):
+        """Return the fields of this state whose values differ from `other`."""
+        return {
+            name: getattr(self, name)
+            for name in self.field_names()
+            if getattr(self, name) != getattr(other, name)
+        }
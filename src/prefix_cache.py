@@ -0,0 +1,64 @@
+import hashlib
+import threading
+import time
+from google.genai import types
+from config import GEMINI_CONTEXT_CACHE_TTL
+
+class PrefixCache:
+    """Class to manage Gemini cached contents for stable system-instruction prefixes.
+
+    Cached contents are keyed by a hash of the model and the instruction text, so
+    every session on the same stage shares one cache entry. Prefixes the API
+    refuses to cache (e.g. below the minimum token count) are sent inline and not
+    retried until the TTL has passed.
+    """
+
+    def __init__(self, client, ttl=GEMINI_CONTEXT_CACHE_TTL):
+        """Initialize the cache for a genai client."""
+        self.client = client
+        self.ttl = ttl
+        self._entries = {}
+        self._uncacheable = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def prefix_hash(model, system_instruction):
+        """Hash the model and instruction text into a cache key."""
+        return hashlib.sha256(f"{model}\n{system_instruction}".encode("utf-8")).hexdigest()
+
+    def get(self, model, system_instruction):
+        """Return the cached content name for a prefix, creating it if needed.
+
+        Returns None when the prefix cannot be cached, in which case the caller
+        should send the system instruction inline.
+        """
+        key = self.prefix_hash(model, system_instruction)
+        now = time.monotonic()
+
+        with self._lock:
+            if self._uncacheable.get(key, 0) > now:
+                return None
+            entry = self._entries.get(key)
+            # Refresh a little before the server-side TTL runs out
+            if entry and entry["expires_at"] - 60 > now:
+                return entry["name"]
+
+        try:
+            cached = self.client.caches.create(
+                model=model,
+                config=types.CreateCachedContentConfig(
+                    system_instruction=system_instruction,
+                    ttl=f"{int(self.ttl)}s",
+                    display_name=f"talentscout-{key[:16]}"
+                )
+            )
+        except Exception:
+            with self._lock:
+                # Don't retry creating this cache until the TTL has passed
+                self._uncacheable[key] = now + self.ttl
+            return None
+
+        with self._lock:
+            self._entries[key] = {"name": cached.name, "expires_at": now + self.ttl}
+        return cached.name
+
@@ -1,12 +1,18 @@
-from config import STAGES
+import re
+from config import STAGES, STRUCTURED_TRAILER_MARKER
 
 class PromptGenerator:
     """Class to generate prompts for different conversation stages."""
     
     
     @staticmethod
-    def create_prompt(stage, candidate_info, language=None, sentiment=None):
-        """Create a prompt based on the current conversation stage and candidate info."""
+    def create_system_instruction(stage, candidate_info, language=None, structured=False):
+        """Create the stable part of the prompt (persona, guidelines and stage instructions).
+        
+        This only changes when the stage, language or experience level changes, so it
+        is sent as a system instruction and can be cached between turns. With
+        `structured`, the model is also asked to end each reply with a JSON trailer.
+        """
         base_prompt = """
         You are a professional Hiring Assistant chatbot for TalentScout named "TalentScout HA", a recruitment agency specializing in technology placements. 
         Your task is to conduct an initial screening of candidates by gathering information and asking relevant technical questions.
@@ -17,30 +23,16 @@ class PromptGenerator:
         3. Don't make up information about the candidate.
         4. If the candidate mentions "quit", "exit", "bye", or "end", gracefully end the conversation.
         5. Focus on gathering accurate information and asking relevant technical questions.
-        
-        Current information collected about the candidate:
         """
         
-        # Add the current information we have
-        for key, value in candidate_info.items():
-            if value:
-                if key == "tech_stack" and len(value) > 0:
-                    base_prompt += f"\n- {key}: {', '.join(value)}"
-                else:
-                    base_prompt += f"\n- {key}: {value}"
-        
         # Add language instruction if provided
         if language and language != "en":
             base_prompt += f"\n\nThe candidate's preferred language is {language}. Please communicate in this language."
         
-        # Add sentiment-based instruction if provided
-        if sentiment and sentiment.get("label") == "negative" and sentiment.get("score", 0) < -0.3:
-            base_prompt += "\n\nThe candidate seems to be expressing negative sentiment. Please be more empathetic and supportive in your response."
-        
         # Add stage-specific instructions
         stage_prompts = {
             "greeting": PromptGenerator._greeting_prompt(),
-            "gather_info": PromptGenerator._gather_info_prompt(candidate_info),
+            "gather_info": PromptGenerator._gather_info_prompt(),
             "tech_stack": PromptGenerator._tech_stack_prompt(),
             "technical_questions": PromptGenerator._technical_questions_prompt(candidate_info),
             "conclusion": PromptGenerator._conclusion_prompt()
@@ -49,8 +41,37 @@ class PromptGenerator:
         if stage in stage_prompts:
             base_prompt += stage_prompts[stage]
         
+        if structured:
+            base_prompt += PromptGenerator._structured_response_prompt()
+        
         return base_prompt
     
+    @staticmethod
+    def create_turn_context(stage, candidate_info, sentiment=None):
+        """Create the per-turn part of the prompt (candidate facts and sentiment hint)."""
+        context = """
+        Current information collected about the candidate:
+        """
+        
+        # Add the current information we have
+        for key, value in candidate_info.items():
+            if value:
+                if key == "tech_stack" and len(value) > 0:
+                    context += f"\n- {key}: {', '.join(value)}"
+                else:
+                    context += f"\n- {key}: {value}"
+        
+        # Tell the model what is still missing while gathering information
+        if stage == "gather_info":
+            missing_info = PromptGenerator._missing_info(candidate_info)
+            context += f"\n\nCurrent missing information: {', '.join(missing_info) if missing_info else 'None'}"
+        
+        # Add sentiment-based instruction if provided
+        if sentiment and sentiment.get("label") == "negative" and sentiment.get("score", 0) < -0.3:
+            context += "\n\nThe candidate seems to be expressing negative sentiment. Please be more empathetic and supportive in your response."
+        
+        return context
+    
     @staticmethod
     def _greeting_prompt():
         """Generate the greeting stage prompt."""
@@ -65,9 +86,8 @@ class PromptGenerator:
         """
     
     @staticmethod
-    def _gather_info_prompt(candidate_info):
-        """Generate the information gathering stage prompt."""
-        # Determine what information we still need
+    def _missing_info(candidate_info):
+        """List the basic candidate information that is still missing."""
         missing_info = []
         if not candidate_info.get("email"):
             missing_info.append("email address")
@@ -80,10 +100,15 @@ class PromptGenerator:
         if not candidate_info.get("location"):
             missing_info.append("current location")
         
-        return f"""
+        return missing_info
+    
+    @staticmethod
+    def _gather_info_prompt():
+        """Generate the information gathering stage prompt."""
+        return """
         
         You are at the GATHER_INFO stage.
-        Current missing information: {', '.join(missing_info) if missing_info else "None"}
+        The current missing information is listed with the candidate's details.
         
         If information is missing:
         1. Ask for ONE piece of missing information at a time, following the order: email, phone, experience, position, location.
@@ -108,12 +133,11 @@ class PromptGenerator:
         """
     
     @staticmethod
-    def _technical_questions_prompt(candidate_info):
-        """Generate the technical questions stage prompt."""
+    def experience_level(candidate_info):
+        """Return the candidate's years of experience and the matching question difficulty."""
         exp_years = 0
         if candidate_info.get("experience"):
             # Try to extract numeric years from experience
-            import re
             years_match = re.search(r'(\d+)', candidate_info.get("experience", ""))
             if years_match:
                 exp_years = int(years_match.group(1))
@@ -124,14 +148,21 @@ class PromptGenerator:
         elif exp_years > 5:
             difficulty = "advanced"
         
+        return exp_years, difficulty
+    
+    @staticmethod
+    def _technical_questions_prompt(candidate_info):
+        """Generate the technical questions stage prompt."""
+        exp_years, difficulty = PromptGenerator.experience_level(candidate_info)
+        
         return f"""
         
         You are at the TECHNICAL_QUESTIONS stage.
         1. Based on the candidate's tech stack, generate 3-5 relevant technical questions to assess their proficiency.
         2. The candidate has approximately {exp_years} years of experience, so questions should be at a {difficulty} level.
         3. Present the questions one by one, waiting for the candidate's response before moving to the next question.
-        4. After each response, provide a brief evaluation of the answer (was it correct, partially correct, incorrect) and assign a score from 1-5.
-        5. After all questions are answered, provide a summary of the technical assessment.
+        4. After each response, briefly acknowledge it and ask the next question. Do not grade or score the answers; all answers are graded together at the end of the interview.
+        5. After all questions are answered, thank the candidate and ask them to type "end" to finish the technical assessment.
         6. Move to the CONCLUSION stage after the assessment is complete.
         
         IMPORTANT: Generate specific technical questions for each technology in their stack. Do not ask generic questions.
@@ -141,6 +172,21 @@ class PromptGenerator:
         - For databases: Ask about query optimization, normalization, or specific database features.
         """
     
+    @staticmethod
+    def _structured_response_prompt():
+        """Generate the instructions for the JSON trailer of structured responses."""
+        return f"""
+        
+        RESPONSE FORMAT:
+        First write your reply to the candidate. Then, on a new line, write {STRUCTURED_TRAILER_MARKER} followed by one JSON object (no code fences) with these keys:
+        - "candidate_info": details the candidate stated in their last message, using only the keys name, email, phone, experience, position and location. Leave out anything they did not state.
+        - "tech_stack": the technologies the candidate said they work with in their last message, in lowercase.
+        - "next_stage": the stage your reply belongs to, one of "greeting", "gather_info", "tech_stack", "technical_questions" or "conclusion". Use "technical_questions" once the candidate has confirmed their tech stack and your reply asks the first technical question, and "conclusion" once the candidate has finished the technical questions or wants to stop and your reply wraps up the interview. Otherwise keep the current stage.
+        - "scores": only when "next_stage" is "conclusion" and technical questions were answered, a score from 1 to 5 for each technology in the tech stack based on the candidate's answers; otherwise {{}}.
+        - "overall_score": the overall score from 1 to 5 when you give scores, otherwise null.
+        The candidate never sees anything after {STRUCTURED_TRAILER_MARKER}, so do not mention it in your reply.
+        """
+    
     @staticmethod
     def _conclusion_prompt():
         """Generate the conclusion stage prompt."""
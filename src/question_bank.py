@@ -0,0 +1,190 @@
+"""Local bank of technical questions indexed by (technology, difficulty).
+
+Import curated or generated questions from the command line (run from the project root):
+    python -m src.question_bank import questions.jsonl
+    python -m src.question_bank stats
+"""
+import argparse
+import json
+import os
+import random
+import threading
+from collections import OrderedDict
+from src.tech_analyzer import TechAnalyzer
+from config import QUESTION_BANK_PATH, QUESTION_BANK_MAX_CANDIDATES
+
+# Difficulty levels, matching PromptGenerator.experience_level
+DIFFICULTIES = ["beginner", "intermediate", "advanced"]
+
+
+class QuestionBank:
+    """Technical questions indexed by (technology, difficulty).
+
+    Technologies are normalized to the names TechAnalyzer extracts (so "react"
+    and "React.js" share an entry). Draws are random and never repeat a question
+    already asked to the same candidate (see `mark_served`) until their pool
+    for that technology is exhausted. Asked questions are remembered for the
+    `max_candidates` most recent candidates.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path=QUESTION_BANK_PATH, seed=None, max_candidates=QUESTION_BANK_MAX_CANDIDATES):
+        """Initialize the bank, loading questions from the path if it exists."""
+        self.path = path
+        self.max_candidates = max_candidates
+        self._index = {}
+        self._served = OrderedDict()
+        self._random = random.Random(seed)
+        self._tech_analyzer = TechAnalyzer()
+        self._lock = threading.Lock()
+        if self.path and os.path.exists(self.path):
+            self.import_file(self.path)
+
+    @classmethod
+    def shared(cls):
+        """Get the process-wide question bank."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    def normalize_technology(self, technology):
+        """Map a technology name to the name TechAnalyzer uses for it."""
+        name = str(technology or "").strip().lower()
+        found = self._tech_analyzer.extract_tech(name)
+        return found[0] if len(found) == 1 else name
+
+    def add(self, technology, difficulty, question):
+        """Add one question; returns False if it is invalid or already in the bank."""
+        technology = self.normalize_technology(technology)
+        question = str(question or "").strip()
+        if not technology or difficulty not in DIFFICULTIES or not question:
+            return False
+
+        with self._lock:
+            questions = self._index.setdefault((technology, difficulty), [])
+            if question in questions:
+                return False
+            questions.append(question)
+            return True
+
+    def bulk_import(self, records):
+        """Add many {"technology", "difficulty", "question"} records; returns how many were new."""
+        added = 0
+        for record in records:
+            if isinstance(record, dict) and self.add(record.get("technology"), record.get("difficulty"), record.get("question")):
+                added += 1
+        return added
+
+    def import_file(self, path):
+        """Import questions from a JSON file (a list or {"questions": [...]}) or a JSONL file."""
+        with open(path, "r", encoding="utf-8") as f:
+            if path.endswith(".jsonl"):
+                records = [json.loads(line) for line in f if line.strip()]
+            else:
+                data = json.load(f)
+                records = data.get("questions", []) if isinstance(data, dict) else data
+        return self.bulk_import(records)
+
+    def save(self, path=None):
+        """Write the bank to disk as JSON."""
+        path = path or self.path
+        with self._lock:
+            records = [
+                {"technology": technology, "difficulty": difficulty, "question": question}
+                for (technology, difficulty), questions in sorted(self._index.items())
+                for question in questions
+            ]
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "questions": records}, f, indent=4)
+        os.replace(temp_path, path)
+
+    def covers(self, tech_stack, difficulty):
+        """Return whether every technology in the stack has questions at this difficulty."""
+        with self._lock:
+            return bool(tech_stack) and all(
+                self._index.get((self.normalize_technology(tech), difficulty)) for tech in tech_stack
+            )
+
+    def draw(self, tech_stack, difficulty, count, candidate_key=None):
+        """Draw up to `count` questions spread across the stack, or None if the bank doesn't cover it.
+
+        Questions already served to `candidate_key` are skipped; once a
+        technology's pool is used up for that candidate it starts over. Drawn
+        questions are not marked as served: a draw may be discarded (a
+        prefetched set the interview never uses), so the caller marks them
+        with `mark_served` once they are asked.
+        """
+        if not self.covers(tech_stack, difficulty):
+            return None
+
+        with self._lock:
+            served = self._served.get(candidate_key, set()) if candidate_key else set()
+
+            pools = []
+            seen = set()
+            for tech in tech_stack:
+                technology = self.normalize_technology(tech)
+                if technology in seen:
+                    continue
+                seen.add(technology)
+                questions = self._index[(technology, difficulty)]
+                available = [question for question in questions if question not in served]
+                if not available:
+                    served.difference_update(questions)
+                    available = list(questions)
+                self._random.shuffle(available)
+                pools.append((tech, available))
+
+            # Take questions round-robin so every technology is covered before any repeats
+            drawn = []
+            while len(drawn) < count and any(available for _, available in pools):
+                for tech, available in pools:
+                    if available and len(drawn) < count:
+                        question = available.pop()
+                        drawn.append({"technology": tech, "question": question})
+            return drawn
+
+    def mark_served(self, candidate_key, questions):
+        """Remember that questions were asked to a candidate, so later draws skip them."""
+        if not candidate_key:
+            return
+        with self._lock:
+            served = self._served.setdefault(candidate_key, set())
+            served.update(questions)
+            self._served.move_to_end(candidate_key)
+            while len(self._served) > self.max_candidates:
+                self._served.popitem(last=False)
+
+    def stats(self):
+        """Return the number of questions per (technology, difficulty)."""
+        with self._lock:
+            return {f"{technology}/{difficulty}": len(questions) for (technology, difficulty), questions in sorted(self._index.items())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    import_parser = subparsers.add_parser("import", help="merge questions from JSON or JSONL files into the bank")
+    import_parser.add_argument("files", nargs="+")
+    subparsers.add_parser("stats", help="show the number of questions per technology and difficulty")
+    parser.add_argument("--bank", default=QUESTION_BANK_PATH, help="question bank file")
+    args = parser.parse_args()
+
+    bank = QuestionBank(args.bank)
+    if args.command == "import":
+        for path in args.files:
+            print(f"{path}: {bank.import_file(path)} new questions")
+        bank.save()
+    for key, total in bank.stats().items():
+        print(f"{key:<32} {total}")
+
+
+if __name__ == "__main__":
+    main()
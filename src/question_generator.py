@@ -0,0 +1,131 @@
+import json
+import re
+from src.prompt_generator import PromptGenerator
+from src.request_scheduler import PRIORITY_BACKGROUND
+from src.question_bank import QuestionBank
+from config import TECHNICAL_QUESTION_COUNT, QUESTION_BANK
+
+# Structured output schema for a generated question set
+QUESTIONS_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "technology": {"type": "STRING"},
+            "question": {"type": "STRING"}
+        },
+        "required": ["technology", "question"]
+    }
+}
+
+
+class QuestionGenerator:
+    """Class to produce the full set of technical questions for a tech stack.
+
+    Stacks the local question bank covers are served from the bank; anything
+    else is generated in one model call.
+    """
+
+    def __init__(self, gemini_client, count=TECHNICAL_QUESTION_COUNT, question_bank=None):
+        """Initialize the generator with the Gemini client and (optionally) a question bank."""
+        self.gemini_client = gemini_client
+        self.count = count
+        self.question_bank = question_bank or (QuestionBank.shared() if QUESTION_BANK else None)
+
+    def question_count(self, tech_stack):
+        """Return how many questions to ask for a stack: 3 to `count`, one per technology where possible."""
+        return min(max(len(tech_stack), 3), self.count)
+
+    def from_bank(self, candidate_info, language=None):
+        """Draw the question set from the question bank, or return None if it doesn't cover the stack."""
+        # The bank is written in English
+        if not self.question_bank or (language and language != "en"):
+            return None
+
+        tech_stack = candidate_info.get("tech_stack", [])
+        _, difficulty = PromptGenerator.experience_level(candidate_info)
+        return self.question_bank.draw(tech_stack, difficulty, self.question_count(tech_stack), self.candidate_key(candidate_info))
+
+    @staticmethod
+    def candidate_key(candidate_info):
+        """Return the key the question bank remembers a candidate's asked questions under."""
+        return (candidate_info.get("email") or candidate_info.get("name") or "").lower() or None
+
+    def mark_asked(self, candidate_info, questions):
+        """Record that a question set is being asked, so the bank doesn't repeat it to this candidate."""
+        if self.question_bank:
+            self.question_bank.mark_served(self.candidate_key(candidate_info), [item["question"] for item in questions])
+
+    def generate(self, candidate_info, language=None, cancel_event=None):
+        """Produce the question set for the candidate's tech stack and experience.
+
+        Returns a list of {"technology", "question"} dicts, or None if the
+        response could not be parsed or `cancel_event` was set while streaming.
+        """
+        if not candidate_info.get("tech_stack"):
+            return None
+
+        questions = self.from_bank(candidate_info, language)
+        if questions:
+            return questions
+
+        if not self.gemini_client or not self.gemini_client.is_initialized():
+            return None
+
+        parts = []
+        for chunk in self.gemini_client.generate_content(
+            self._questions_prompt(candidate_info, language),
+            temperature=0.7,
+            max_tokens=2048,
+            response_mime_type="application/json",
+            response_schema=QUESTIONS_SCHEMA,
+            priority=PRIORITY_BACKGROUND
+        ):
+            if cancel_event is not None and cancel_event.is_set():
+                return None
+            if chunk.text:
+                parts.append(chunk.text)
+
+        return self.parse_questions("".join(parts), self.count)
+
+    def _questions_prompt(self, candidate_info, language=None):
+        """Build the prompt asking for the whole question set."""
+        exp_years, difficulty = PromptGenerator.experience_level(candidate_info)
+        tech_stack = candidate_info.get("tech_stack", [])
+
+        prompt = f"""
+        You are preparing the technical screening questions for a candidate at TalentScout.
+        The candidate's tech stack is: {', '.join(tech_stack)}.
+        The candidate has approximately {exp_years} years of experience, so questions should be at a {difficulty} level.
+
+        Write {self.question_count(tech_stack)} questions in total, covering each technology at least once where possible.
+        Ask about specific features, common patterns or problem-solving approaches; do not ask generic questions.
+        Each question must stand on its own and be answerable in a few sentences.
+        """
+
+        if language and language != "en":
+            prompt += f"\n\nWrite the questions in the candidate's preferred language, {language}."
+
+        return prompt
+
+    @staticmethod
+    def parse_questions(response_text, count=TECHNICAL_QUESTION_COUNT):
+        """Parse the structured response into at most `count` question dicts."""
+        # Tolerate a fenced code block around the JSON
+        text = re.sub(r'^```(?:json)?\s*|\s*```$', '', (response_text or "").strip())
+        try:
+            data = json.loads(text)
+        except ValueError:
+            return None
+        if not isinstance(data, list):
+            return None
+
+        questions = []
+        for item in data:
+            if not isinstance(item, dict):
+                continue
+            question = str(item.get("question") or "").strip()
+            if question:
+                questions.append({"technology": str(item.get("technology") or "").strip(), "question": question})
+
+        return questions[:count] or None
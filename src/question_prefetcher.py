@@ -0,0 +1,122 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+from src.prompt_generator import PromptGenerator
+from config import QUESTION_PREFETCH_WORKERS, QUESTION_PREFETCH_TTL, QUESTION_PREFETCH_MAX_PENDING
+
+
+class _Prefetch:
+    """A pending question set for one interview."""
+
+    def __init__(self, signature, future, cancel_event):
+        """Initialize with what the set depends on and the generation running it."""
+        self.signature = signature
+        self.future = future
+        self.cancel_event = cancel_event
+        self.created = time.monotonic()
+
+    def cancel(self):
+        """Stop the generation, whether or not it has started."""
+        self.cancel_event.set()
+        self.future.cancel()
+
+
+class QuestionPrefetcher:
+    """Process-wide registry of technical question sets generated in the background.
+
+    A question set is scheduled per interview as soon as the tech stack and
+    experience are known, keyed by a signature of the stack, difficulty and
+    language. Scheduling again with a different signature cancels the pending
+    set and starts over; `take` hands the finished set to the interview.
+    Sets that are never taken (the candidate left mid-interview) are cancelled
+    and dropped after QUESTION_PREFETCH_TTL seconds, oldest first once more
+    than QUESTION_PREFETCH_MAX_PENDING interviews have one.
+    """
+
+    _executor = None
+    _pending = OrderedDict()
+    _lock = threading.Lock()
+
+    @classmethod
+    def executor(cls):
+        """Get (or create) the shared executor."""
+        with cls._lock:
+            if cls._executor is None:
+                cls._executor = ThreadPoolExecutor(max_workers=QUESTION_PREFETCH_WORKERS, thread_name_prefix="questions")
+            return cls._executor
+
+    @staticmethod
+    def signature(candidate_info, language=None):
+        """Return what a question set depends on: the tech stack, difficulty and language."""
+        _, difficulty = PromptGenerator.experience_level(candidate_info)
+        return (tuple(sorted(candidate_info.get("tech_stack", []))), difficulty, language)
+
+    @classmethod
+    def schedule(cls, interview_id, question_generator, candidate_info, language=None):
+        """Start generating questions unless an identical set is already pending."""
+        signature = cls.signature(candidate_info, language)
+        executor = cls.executor()
+        with cls._lock:
+            pending = cls._pending.get(interview_id)
+            if pending and pending.signature == signature:
+                return False
+            if pending:
+                pending.cancel()
+
+            cancel_event = threading.Event()
+            future = executor.submit(question_generator.generate, dict(candidate_info), language, cancel_event)
+            cls._pending[interview_id] = _Prefetch(signature, future, cancel_event)
+            cls._pending.move_to_end(interview_id)
+            cls._evict()
+            return True
+
+    @classmethod
+    def _evict(cls):
+        """Cancel and drop expired sets, then the oldest beyond the limit (call with the lock held)."""
+        now = time.monotonic()
+        while cls._pending:
+            interview_id, pending = next(iter(cls._pending.items()))
+            expired = QUESTION_PREFETCH_TTL and now - pending.created > QUESTION_PREFETCH_TTL
+            if not expired and len(cls._pending) <= QUESTION_PREFETCH_MAX_PENDING:
+                break
+            del cls._pending[interview_id]
+            pending.cancel()
+
+    @classmethod
+    def take(cls, interview_id, candidate_info, language=None, timeout=0):
+        """Remove and return the interview's question set, waiting up to `timeout` seconds.
+
+        Returns None if nothing was scheduled, the set no longer matches the
+        candidate's stack, generation failed or it did not finish in time.
+        """
+        with cls._lock:
+            pending = cls._pending.pop(interview_id, None)
+        if not pending:
+            return None
+        if pending.signature != cls.signature(candidate_info, language):
+            pending.cancel()
+            return None
+
+        try:
+            return pending.future.result(timeout=timeout)
+        except TimeoutError:
+            pending.cancel()
+            return None
+        except Exception:
+            return None
+
+    @classmethod
+    def discard(cls, interview_id):
+        """Cancel and forget the interview's pending question set, if any."""
+        with cls._lock:
+            pending = cls._pending.pop(interview_id, None)
+        if pending:
+            pending.cancel()
+
+    @classmethod
+    def pending_count(cls):
+        """Return the number of interviews with a pending question set."""
+        with cls._lock:
+            cls._evict()
+            return len(cls._pending)
@@ -0,0 +1,184 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from config import (
+    GEMINI_RPM_LIMIT,
+    GEMINI_TPM_LIMIT,
+    GEMINI_MAX_RETRIES,
+    GEMINI_RETRY_BASE_DELAY,
+    GEMINI_RETRY_MAX_DELAY
+)
+
+# Lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 1
+
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at a per-minute rate."""
+
+    def __init__(self, per_minute):
+        """Initialize a full bucket; a rate of 0 disables the limit."""
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        """Add the tokens accumulated since the last update."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount, now):
+        """Return how many seconds until the given amount is available."""
+        if not self.capacity:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount):
+        """Take tokens out of the bucket."""
+        if self.capacity:
+            self.tokens -= min(amount, self.capacity)
+
+
+class QueueTicket:
+    """A request waiting for capacity in the scheduler."""
+
+    def __init__(self, priority, sequence, estimated_tokens):
+        """Initialize the ticket."""
+        self.priority = priority
+        self.sequence = sequence
+        self.estimated_tokens = estimated_tokens
+
+    def __lt__(self, other):
+        """Order tickets by priority, then arrival."""
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+
+class RequestScheduler:
+    """Class to pace Gemini requests for one API key within its RPM/TPM quotas.
+
+    Requests wait in a priority queue (live chat before background work) until
+    both the request and the token bucket have capacity. Calls that fail with a
+    429 or 5xx before anything was streamed are retried with jittered exponential
+    backoff.
+    """
+
+    def __init__(self, requests_per_minute=GEMINI_RPM_LIMIT, tokens_per_minute=GEMINI_TPM_LIMIT,
+                 max_retries=GEMINI_MAX_RETRIES, base_delay=GEMINI_RETRY_BASE_DELAY,
+                 max_delay=GEMINI_RETRY_MAX_DELAY):
+        """Initialize the scheduler with the quotas and retry policy."""
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._queue = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def acquire(self, estimated_tokens, priority=PRIORITY_INTERACTIVE, on_wait=None):
+        """Block until the request may be sent.
+
+        While waiting, `on_wait(position, expected_wait)` is called with the
+        1-based queue position and the expected wait in seconds.
+        """
+        ticket = QueueTicket(priority, next(self._sequence), estimated_tokens)
+
+        with self._condition:
+            heapq.heappush(self._queue, ticket)
+            last_status = None
+            try:
+                while True:
+                    now = time.monotonic()
+                    position = sum(1 for other in self._queue if other < ticket)
+                    wait = max(
+                        self.request_bucket.time_until(1, now),
+                        self.token_bucket.time_until(self._tokens_ahead(ticket), now)
+                    )
+
+                    if position == 0 and wait <= 0:
+                        heapq.heappop(self._queue)
+                        self.request_bucket.consume(1)
+                        self.token_bucket.consume(estimated_tokens)
+                        self._condition.notify_all()
+                        return
+
+                    if position and self.request_bucket.rate:
+                        # Requests ahead of us each need one request token
+                        wait = max(wait, self.request_bucket.time_until(position + 1, now))
+
+                    status = (position + 1, round(wait, 1))
+                    if on_wait and status != last_status:
+                        last_status = status
+                        # Don't hold the lock while the caller updates its UI
+                        self._condition.release()
+                        try:
+                            on_wait(*status)
+                        finally:
+                            self._condition.acquire()
+
+                    self._condition.wait(timeout=min(max(wait, 0.01), 1.0))
+            except BaseException:
+                # A failing callback (or a rerun/stop raised through it) must not
+                # leave the ticket queued, or every later request waits behind it
+                if ticket in self._queue:
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                    self._condition.notify_all()
+                raise
+
+    def _tokens_ahead(self, ticket):
+        """Sum the estimated tokens of this ticket and every ticket ahead of it."""
+        return sum(other.estimated_tokens for other in self._queue if not ticket < other)
+
+    def queue_length(self):
+        """Return the number of requests waiting."""
+        with self._condition:
+            return len(self._queue)
+
+    @staticmethod
+    def is_retryable(error):
+        """Check whether an error is a rate limit or transient server error."""
+        code = getattr(error, "code", None) or getattr(error, "status_code", None)
+        if code in RETRYABLE_STATUS_CODES:
+            return True
+        return isinstance(error, (ConnectionError, TimeoutError))
+
+    def backoff_delay(self, attempt):
+        """Return the jittered exponential backoff for a retry attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    def stream(self, make_stream, estimated_tokens, priority=PRIORITY_INTERACTIVE, on_wait=None):
+        """Schedule a streaming request and yield its chunks, retrying transient failures.
+
+        `make_stream` is called for every attempt and must return a new iterator.
+        Failures after the first chunk has been yielded are not retried, since the
+        caller has already shown part of the response. Before a retry,
+        `on_wait(0, delay)` is called with the backoff delay.
+        """
+        attempt = 0
+        while True:
+            self.acquire(estimated_tokens, priority, on_wait)
+            started_streaming = False
+            try:
+                for chunk in make_stream():
+                    started_streaming = True
+                    yield chunk
+                return
+            except Exception as e:
+                if started_streaming or attempt >= self.max_retries or not self.is_retryable(e):
+                    raise
+                delay = self.backoff_delay(attempt)
+                attempt += 1
+                if on_wait:
+                    on_wait(0, round(delay, 1))
+                time.sleep(delay)
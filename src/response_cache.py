@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL, RESPONSE_CACHE_PATH
+from src.backends import TextChunk
+
+class ResponseCache:
+    """LRU cache with TTL for deterministic model responses (e.g. the greeting).
+
+    Keys are a hash of the normalized prompt, history and generation config. Cached
+    responses are replayed as a stream of chunks, so callers iterate over them
+    exactly like a live Gemini stream.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_entries=RESPONSE_CACHE_MAX_ENTRIES, ttl=RESPONSE_CACHE_TTL, path=RESPONSE_CACHE_PATH):
+        """Initialize the cache, loading persisted entries if a path is given."""
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        if self.path:
+            self._load()
+
+    @classmethod
+    def shared(cls):
+        """Get the process-wide response cache."""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+            return cls._shared
+
+    @staticmethod
+    def make_key(model, prompt, messages=None, system_instruction=None, generation_config=None):
+        """Hash a request into a cache key, ignoring whitespace and message metadata."""
+        def normalize(text):
+            return re.sub(r'\s+', ' ', text or "").strip()
+
+        payload = {
+            "model": model,
+            "system_instruction": normalize(system_instruction),
+            "prompt": normalize(prompt),
+            "messages": [[msg["role"], normalize(msg["content"])] for msg in (messages or [])],
+            "config": generation_config or {}
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def get(self, key):
+        """Return the cached text for a key, or None on a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and (not self.ttl or time.time() - entry["created"] <= self.ttl):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry["text"]
+            if entry:
+                # Expired
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, text):
+        """Store a response, evicting the least recently used entries if full."""
+        with self._lock:
+            self._entries[key] = {"text": text, "created": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self.path:
+                self._save()
+
+    def replay(self, text, chunk_size=64):
+        """Replay a cached response as a stream of chunks."""
+        for start in range(0, len(text), chunk_size):
+            yield TextChunk(text[start:start + chunk_size])
+
+    def record(self, key, stream):
+        """Pass a live stream through and cache its full text once it completes."""
+        parts = []
+        for chunk in stream:
+            if chunk.text:
+                parts.append(chunk.text)
+            yield chunk
+        if parts:
+            self.put(key, "".join(parts))
+
+    def clear(self):
+        """Remove all entries and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+            if self.path:
+                self._save()
+
+    def stats(self):
+        """Return cache size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0
+            }
+
+    def _load(self):
+        """Load persisted entries, skipping expired ones."""
+        try:
+            with open(self.path, "r") as f:
+                entries = json.load(f)
+        except (OSError, ValueError):
+            return
+        now = time.time()
+        for key, entry in sorted(entries.items(), key=lambda item: item[1]["created"]):
+            if not self.ttl or now - entry["created"] <= self.ttl:
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self):
+        """Persist entries to disk (called with the lock held)."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(dict(self._entries), f)
+        os.replace(temp_path, self.path)
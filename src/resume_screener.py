@@ -0,0 +1,277 @@
+"""Screen resumes and other free text for skills in bulk.
+
+Documents come from a directory of text files (.txt, .md) or a JSONL file
+with one {"id": ..., "text": ...} object per line. They are split into
+chunks, matched with the chatbot's TechAnalyzer across a process pool and
+written as JSONL, one result per document, in input order; throughput is
+reported on stderr.
+
+Run from the project root:
+    python -m src.resume_screener resumes/ --out screened.jsonl
+    python -m src.resume_screener linkedin_export.jsonl --text-field summary --workers 8
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from src.tech_analyzer import TechAnalyzer
+
+TEXT_EXTENSIONS = (".txt", ".md", ".text")
+
+# Characters matched at a time; large documents are never held in memory whole
+CHUNK_SIZE = 8192
+
+# Words each chunk reads past its cut; longer than any multi-word skill name
+CHUNK_OVERLAP_WORDS = 8
+
+_OVERLAP = re.compile(r"(?:\s+\S+){0,%d}" % CHUNK_OVERLAP_WORDS)
+
+
+def iter_documents(source, id_field="id", text_field="text"):
+    """Yield documents from a directory of text files or a JSONL file, one at a time.
+
+    Files are yielded as {"id", "path"} and read in chunks by the worker that
+    screens them; JSONL lines are yielded as {"id", "text"}, or as
+    {"id", "error"} when they are not JSON or have no text, so they are
+    reported instead of dropped.
+    """
+    if os.path.isdir(source):
+        for root, dirs, files in os.walk(source):
+            dirs.sort()
+            for filename in sorted(files):
+                if filename.lower().endswith(TEXT_EXTENSIONS):
+                    path = os.path.join(root, filename)
+                    yield {"id": os.path.relpath(path, source), "path": path}
+        return
+
+    with open(source, "r", encoding="utf-8") as f:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                yield {"id": line_number, "error": f"line {line_number} is not valid JSON"}
+                continue
+            if not isinstance(record, dict):
+                yield {"id": line_number, "error": f"line {line_number} is not a JSON object"}
+            elif not isinstance(record.get(text_field), str):
+                yield {"id": record.get(id_field, line_number), "error": f"line {line_number} has no '{text_field}' text"}
+            else:
+                yield {"id": record.get(id_field, line_number), "text": record[text_field]}
+
+
+def _chunk_bounds(buffer, chunk_size, final):
+    """Return (stop, end) for the next chunk of a buffer, or None if more text is needed."""
+    if len(buffer) <= chunk_size and final:
+        return len(buffer), len(buffer)
+
+    stop = max(buffer.rfind(" ", 0, chunk_size + 1), buffer.rfind("\n", 0, chunk_size + 1))
+    if stop <= 0:
+        found = [index for index in (buffer.find(" ", chunk_size), buffer.find("\n", chunk_size)) if index > 0]
+        if found:
+            stop = min(found)
+        elif len(buffer) >= 2 * chunk_size:
+            # No whitespace to cut at: hold back at most two chunks
+            return chunk_size, chunk_size
+        elif final:
+            return len(buffer), len(buffer)
+        else:
+            return None
+
+    overlap = _OVERLAP.match(buffer, stop)
+    if not final and (overlap.end() == len(buffer) or len(overlap.group(0).split()) < CHUNK_OVERLAP_WORDS):
+        # The overlap words (or the last of them) continue in the next block
+        return None
+    return stop, overlap.end()
+
+
+def iter_chunks(document, chunk_size=CHUNK_SIZE):
+    """Yield (text, stop) pairs that cover a document's text in order.
+
+    Each chunk is cut at whitespace, at `stop`, and `text` runs on for
+    CHUNK_OVERLAP_WORDS more words, so a multi-word skill or word pair across
+    the cut is still seen whole. Matches starting at or after `stop` belong
+    to the next chunk, which starts at the cut.
+    """
+    if "text" in document:
+        text = document["text"]
+        reader = (text[i:i + chunk_size] for i in range(0, len(text), chunk_size))
+    else:
+        f = open(document["path"], "r", encoding="utf-8", errors="replace")
+        reader = iter(lambda: f.read(chunk_size), "")
+
+    buffer = ""
+    try:
+        for block in reader:
+            buffer += block
+            while len(buffer) > chunk_size:
+                bounds = _chunk_bounds(buffer, chunk_size, final=False)
+                if bounds is None:
+                    break
+                stop, end = bounds
+                yield buffer[:end], stop
+                buffer = buffer[stop:]
+        while buffer:
+            stop, end = _chunk_bounds(buffer, chunk_size, final=True)
+            yield buffer[:end], stop
+            buffer = buffer[stop:]
+    finally:
+        if "text" not in document:
+            f.close()
+
+
+def screen_document(document, analyzer, chunk_size=CHUNK_SIZE):
+    """Extract and categorize the skills in one document.
+
+    The result does not depend on `chunk_size`: every mention is counted in
+    the chunk it starts in, and a skill running on past a cut is not matched
+    again from its middle in the next chunk.
+    """
+    matches = {}
+
+    def add(technology, confidence):
+        found = matches.setdefault(technology, {"technology": technology, "confidence": 0.0, "mentions": 0})
+        found["confidence"] = max(found["confidence"], confidence)
+        found["mentions"] += 1
+
+    characters = 0
+    carried = 0
+    for text, stop in iter_chunks(document, chunk_size):
+        characters += stop
+        spans = analyzer.matcher.find_spans(text)
+        for span_start, _, canonical in spans:
+            if carried <= span_start < stop:
+                add(canonical, 1.0)
+
+        if analyzer.fuzzy:
+            # A word and the word pairs starting at it are one mention; keep the closest
+            fuzzy_mentions = {}
+            skip_spans = [(span_start, span_end) for span_start, span_end, _ in spans] + [(0, carried)]
+            for start, canonical, confidence, _ in analyzer.fuzzy_matcher.find_all(text, skip_spans, analyzer.fuzzy_budget_ms, stop):
+                fuzzy_mentions[start, canonical] = max(fuzzy_mentions.get((start, canonical), 0), confidence)
+            for (_, canonical), confidence in fuzzy_mentions.items():
+                if confidence >= analyzer.min_confidence:
+                    add(canonical, confidence)
+
+        # Skip the part of the next chunk already covered by a skill that ran past the cut
+        carried = max([span_end for span_start, span_end, _ in spans if span_start < stop] + [stop]) - stop
+
+    ranked = sorted(matches.values(), key=lambda match: (-match["mentions"], -match["confidence"], match["technology"]))
+    skills = [match["technology"] for match in ranked]
+    return {
+        "id": document["id"],
+        "skills": skills,
+        "categories": analyzer.categorize_tech_stack(skills),
+        "matches": ranked,
+        "characters": characters
+    }
+
+
+def screen_batch(documents, fuzzy=True, chunk_size=CHUNK_SIZE):
+    """Screen a batch of documents (runs in a worker process).
+
+    The fuzzy pass runs without the chat's time budget, so results do not
+    depend on how busy the machine is.
+    """
+    analyzer = TechAnalyzer(fuzzy=fuzzy, fuzzy_budget_ms=None)
+    results = []
+    for document in documents:
+        if "error" in document:
+            results.append(document)
+            continue
+        try:
+            results.append(screen_document(document, analyzer, chunk_size))
+        except OSError as e:
+            results.append({"id": document["id"], "error": str(e)})
+    return results
+
+
+def _batches(documents, batch_size):
+    """Group a document stream into lists of `batch_size`."""
+    batch = []
+    for document in documents:
+        batch.append(document)
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def screen_documents(documents, workers=None, batch_size=20, fuzzy=True, chunk_size=CHUNK_SIZE, on_progress=None):
+    """Screen a stream of documents across a process pool, yielding results in input order.
+
+    At most two batches per worker are in flight, so neither the input nor
+    the results are ever held in memory whole. `on_progress` is called with
+    running statistics after every batch.
+    """
+    workers = workers or os.cpu_count() or 1
+    stats = {"documents": 0, "errors": 0, "characters": 0, "seconds": 0.0, "documents_per_second": 0.0, "mb_per_second": 0.0}
+    start = time.perf_counter()
+
+    def finish(results):
+        stats["documents"] += len(results)
+        stats["errors"] += sum(1 for result in results if "error" in result)
+        stats["characters"] += sum(result.get("characters", 0) for result in results)
+        stats["seconds"] = time.perf_counter() - start
+        if stats["seconds"]:
+            stats["documents_per_second"] = stats["documents"] / stats["seconds"]
+            stats["mb_per_second"] = stats["characters"] / stats["seconds"] / 1e6
+        if on_progress:
+            on_progress(stats)
+        return results
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = []
+        for batch in _batches(documents, batch_size):
+            in_flight.append(executor.submit(screen_batch, batch, fuzzy, chunk_size))
+            if len(in_flight) >= 2 * workers:
+                yield from finish(in_flight.pop(0).result())
+        for future in in_flight:
+            yield from finish(future.result())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="directory of .txt/.md files or a JSONL file")
+    parser.add_argument("--out", help="JSONL file to write (default: stdout)")
+    parser.add_argument("--id-field", default="id", help="JSONL field holding the document ID")
+    parser.add_argument("--text-field", default="text", help="JSONL field holding the document text")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=20, help="documents per worker batch")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="characters matched at a time")
+    parser.add_argument("--no-fuzzy", action="store_true", help="only report exact skill matches")
+    args = parser.parse_args()
+
+    final = {}
+
+    def report(stats):
+        final.update(stats)
+        print(
+            f"\r{stats['documents']} documents, {stats['documents_per_second']:.0f} docs/s, {stats['mb_per_second']:.2f} MB/s",
+            end="", file=sys.stderr, flush=True
+        )
+
+    out = open(args.out, "w", encoding="utf-8") if args.out else sys.stdout
+    try:
+        documents = iter_documents(args.source, args.id_field, args.text_field)
+        for result in screen_documents(documents, args.workers, args.batch_size, not args.no_fuzzy, args.chunk_size, report):
+            out.write(json.dumps(result) + "\n")
+    finally:
+        if args.out:
+            out.close()
+    print(file=sys.stderr)
+    if final:
+        print(
+            f"Screened {final['documents']} documents ({final['errors']} failed, {final['characters'] / 1e6:.1f}M characters) "
+            f"in {final['seconds']:.2f}s: {final['documents_per_second']:.0f} docs/s, {final['mb_per_second']:.2f} MB/s",
+            file=sys.stderr
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""Export saved sessions to flat CSV and Parquet tables for analysis.
+
+Sessions are read through SessionManager's store (snapshot plus journal
+tail), flattened in a process pool and streamed batch by batch into four
+tables: candidates, messages, sentiment and assessments. Each run writes one
+part file per table and format (<out>/<format>/<table>/part-<run>.<format>), so
+each table directory reads as one dataset (e.g. pandas.read_parquet); with
+--incremental only sessions saved or journaled since the last run are
+exported, so a changed session can appear in several parts and the latest
+export_run is the current one.
+
+Run from the project root:
+    python -m src.session_export --out exports --format csv parquet --incremental
+"""
+import argparse
+import csv
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from src.session_manager import SessionManager
+
+# Columns of each exported table and their types
+TABLES = {
+    "candidates": [
+        ("session_id", "string"), ("export_run", "string"), ("interview_id", "string"), ("timestamp", "string"),
+        ("name", "string"), ("email", "string"), ("phone", "string"), ("experience", "string"),
+        ("position", "string"), ("location", "string"), ("tech_stack", "string"), ("current_stage", "string"),
+        ("conversation_ended", "bool"), ("language", "string"), ("detected_language", "string"),
+        ("message_count", "int"), ("overall_score", "float"), ("technology_scores", "string")
+    ],
+    "messages": [
+        ("session_id", "string"), ("export_run", "string"), ("position", "int"), ("role", "string"), ("content", "string")
+    ],
+    "sentiment": [
+        ("session_id", "string"), ("export_run", "string"), ("position", "int"), ("message", "string"),
+        ("sentiment", "string"), ("score", "float"), ("timestamp", "string")
+    ],
+    "assessments": [
+        ("session_id", "string"), ("export_run", "string"), ("question_number", "int"), ("question", "string"),
+        ("answer", "string"), ("technology", "string"), ("verdict", "string"), ("score", "float"), ("feedback", "string")
+    ]
+}
+
+STATE_FILE = "export_state.json"
+
+
+def session_rows(session_id, session_data, export_run):
+    """Flatten one session into rows for each table."""
+    candidate_info = session_data.get("candidate_info") or {}
+    assessment = session_data.get("technical_assessment") or {}
+    messages = session_data.get("messages") or []
+    base = {"session_id": session_id, "export_run": export_run}
+
+    rows = {table: [] for table in TABLES}
+    rows["candidates"].append({
+        **base,
+        "interview_id": session_data.get("interview_id"),
+        "timestamp": session_data.get("timestamp"),
+        **{key: candidate_info.get(key) for key in ["name", "email", "phone", "experience", "position", "location"]},
+        "tech_stack": ", ".join(candidate_info.get("tech_stack") or []),
+        "current_stage": session_data.get("current_stage"),
+        "conversation_ended": session_data.get("conversation_ended"),
+        "language": session_data.get("language"),
+        "detected_language": session_data.get("detected_language"),
+        "message_count": len(messages),
+        "overall_score": assessment.get("overall_score"),
+        "technology_scores": json.dumps(assessment.get("scores") or {})
+    })
+
+    for position, message in enumerate(messages):
+        rows["messages"].append({**base, "position": position, "role": message.get("role"), "content": message.get("content")})
+
+    for position, point in enumerate(session_data.get("sentiment_data") or []):
+        rows["sentiment"].append({
+            **base,
+            "position": position,
+            "message": point.get("message"),
+            "sentiment": point.get("sentiment"),
+            "score": point.get("score"),
+            "timestamp": point.get("timestamp")
+        })
+
+    evaluations = {item.get("question_number"): item for item in assessment.get("evaluations") or [] if isinstance(item, dict)}
+    answers = assessment.get("answers") or []
+    for number, question in enumerate(assessment.get("questions_asked") or [], start=1):
+        evaluation = evaluations.get(number, {})
+        rows["assessments"].append({
+            **base,
+            "question_number": number,
+            "question": question,
+            "answer": answers[number - 1] if number <= len(answers) else None,
+            "technology": evaluation.get("technology"),
+            "verdict": evaluation.get("verdict"),
+            "score": evaluation.get("score"),
+            "feedback": evaluation.get("feedback")
+        })
+
+    return rows
+
+
+def _init_worker():
+    """Open the session store afresh in each worker instead of sharing the parent's connections."""
+    SessionManager._store = None
+    SessionManager._journal = None
+
+
+def export_batch(session_ids, export_run):
+    """Load and flatten a batch of sessions (runs in a worker process)."""
+    rows = {table: [] for table in TABLES}
+    for session_id in session_ids:
+        try:
+            session_data = SessionManager.saved_session_data(session_id)
+        except (OSError, ValueError):
+            continue
+        if session_data is None:
+            continue
+        for table, table_rows in session_rows(session_id, session_data, export_run).items():
+            rows[table].extend(table_rows)
+    return rows
+
+
+class CsvTableWriter:
+    """Appends rows to a CSV part file."""
+
+    def __init__(self, path, columns):
+        """Open the part file and write its header."""
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=[name for name, _ in columns])
+        self.writer.writeheader()
+
+    def write(self, rows):
+        """Append a batch of rows."""
+        self.writer.writerows(rows)
+
+    def close(self):
+        """Close the part file."""
+        self.file.close()
+
+
+class ParquetTableWriter:
+    """Appends rows to a Parquet part file, one row group per batch."""
+
+    def __init__(self, path, columns):
+        """Open the part file with the table's schema."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        types = {"string": pa.string(), "int": pa.int64(), "float": pa.float64(), "bool": pa.bool_()}
+        self.pa = pa
+        self.columns = columns
+        self.schema = pa.schema([(name, types[column_type]) for name, column_type in columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        """Append a batch of rows as a row group."""
+        if rows:
+            data = {name: [self._value(row.get(name), column_type) for row in rows] for name, column_type in self.columns}
+            self.writer.write_table(self.pa.table(data, schema=self.schema))
+
+    @staticmethod
+    def _value(value, column_type):
+        """Coerce a value to a column's type (sessions are loosely typed)."""
+        if value is None:
+            return None
+        try:
+            if column_type == "string":
+                return value if isinstance(value, str) else json.dumps(value)
+            if column_type == "int":
+                return int(value)
+            if column_type == "float":
+                return float(value)
+            return bool(value)
+        except (TypeError, ValueError):
+            return None
+
+    def close(self):
+        """Finish the part file."""
+        self.writer.close()
+
+
+WRITERS = {"csv": CsvTableWriter, "parquet": ParquetTableWriter}
+
+
+def load_export_state(out_dir):
+    """Read the incremental export state of an output directory."""
+    try:
+        with open(os.path.join(out_dir, STATE_FILE), "r") as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {}
+
+
+def save_export_state(out_dir, state):
+    """Write the incremental export state atomically."""
+    path = os.path.join(out_dir, STATE_FILE)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def changed_session_ids(since=None, page_size=1000):
+    """Return the IDs of sessions saved (or with journal entries) since an ISO timestamp, or of all sessions.
+
+    Only IDs are collected up front, so sessions saved while the export runs
+    cannot shift the pages being read.
+    """
+    store = SessionManager.store()
+    session_ids = []
+    offset = 0
+    while True:
+        page = store.list_sessions(offset=offset, limit=page_size, since=since)
+        session_ids.extend(summary["session_id"] for summary in page)
+        if len(page) < page_size:
+            break
+        offset += page_size
+
+    # Turns autosaved to the journal since the last snapshot don't change the snapshot's timestamp
+    if since:
+        seen = set(session_ids)
+        cutoff = datetime.fromisoformat(since).timestamp()
+        journal = SessionManager.journal()
+        if os.path.isdir(journal.directory):
+            for filename in os.listdir(journal.directory):
+                session_id = filename[:-len(".jsonl")]
+                if filename.endswith(".jsonl") and session_id not in seen and os.path.getmtime(journal.path(session_id)) >= cutoff:
+                    session_ids.append(session_id)
+    return session_ids
+
+
+def export_sessions(out_dir, formats=("csv", "parquet"), incremental=False, workers=None, batch_size=200, on_progress=None):
+    """Export saved sessions to part files in `out_dir` and return the run's statistics.
+
+    Batches are flattened in a process pool and written as they complete, with
+    at most two batches per worker in flight, so memory use does not grow with
+    the number of sessions.
+    """
+    started_at = datetime.now().isoformat()
+    state = load_export_state(out_dir)
+    since = state.get("last_run") if incremental else None
+    export_run = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+
+    session_ids = changed_session_ids(since)
+    batches = [session_ids[i:i + batch_size] for i in range(0, len(session_ids), batch_size)]
+
+    writers = []
+    table_writers = {table: [] for table in TABLES}
+    if batches:
+        for table, columns in TABLES.items():
+            for output_format in formats:
+                table_dir = os.path.join(out_dir, output_format, table)
+                os.makedirs(table_dir, exist_ok=True)
+                writer = WRITERS[output_format](os.path.join(table_dir, f"part-{export_run}.{output_format}"), columns)
+                table_writers[table].append(writer)
+                writers.append(writer)
+
+    stats = {"export_run": export_run, "sessions": 0, "rows": {table: 0 for table in TABLES}, "seconds": 0.0, "rows_per_second": 0.0}
+    start = time.perf_counter()
+
+    def write(rows, batch):
+        for table, table_rows in rows.items():
+            for writer in table_writers[table]:
+                writer.write(table_rows)
+            stats["rows"][table] += len(table_rows)
+        stats["sessions"] += len(batch)
+        stats["seconds"] = time.perf_counter() - start
+        stats["rows_per_second"] = sum(stats["rows"].values()) / stats["seconds"] if stats["seconds"] else 0.0
+        if on_progress:
+            on_progress(stats)
+
+    workers = workers or os.cpu_count() or 1
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            in_flight = []
+            max_in_flight = 2 * workers
+            for batch in batches:
+                in_flight.append((executor.submit(export_batch, batch, export_run), batch))
+                if len(in_flight) >= max_in_flight:
+                    future, done_batch = in_flight.pop(0)
+                    write(future.result(), done_batch)
+            for future, done_batch in in_flight:
+                write(future.result(), done_batch)
+    finally:
+        for writer in writers:
+            writer.close()
+
+    os.makedirs(out_dir, exist_ok=True)
+    state["last_run"] = started_at
+    state.setdefault("runs", []).append({"export_run": export_run, "sessions": stats["sessions"], "rows": stats["rows"]})
+    save_export_state(out_dir, state)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default="exports", help="output directory")
+    parser.add_argument("--format", nargs="+", default=["csv", "parquet"], choices=sorted(WRITERS), help="output formats")
+    parser.add_argument("--incremental", action="store_true", help="only export sessions changed since the last run")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per CPU)")
+    parser.add_argument("--batch-size", type=int, default=200, help="sessions per worker batch")
+    args = parser.parse_args()
+
+    def report(stats):
+        print(f"\r{stats['sessions']} sessions, {sum(stats['rows'].values())} rows, {stats['rows_per_second']:.0f} rows/s", end="", flush=True)
+
+    stats = export_sessions(args.out, args.format, args.incremental, args.workers, args.batch_size, on_progress=report)
+    print()
+    print(f"Export {stats['export_run']}: {stats['sessions']} sessions in {stats['seconds']:.2f}s ({stats['rows_per_second']:.0f} rows/s)")
+    for table, count in stats["rows"].items():
+        print(f"  {table}: {count} rows")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""Compact binary format for saved sessions.
+
+Layout (format version 2; the original indented JSON files are version 1):
+    b"TSS" + version byte | header length (4 bytes, big-endian) | zlib(header JSON) | zlib(transcript JSON)
+
+The header holds everything except the message bodies: candidate info,
+stage, assessment scores and the sentiment points, which refer to the
+candidate messages by index instead of repeating them. The transcript holds
+the messages, and is only decompressed when it is first needed.
+"""
+import json
+import struct
+import zlib
+
+FORMAT_VERSION = 2
+MAGIC = b"TSS" + bytes([FORMAT_VERSION])
+LENGTH = struct.Struct(">I")
+PREFIX_SIZE = len(MAGIC) + LENGTH.size
+
+# Session fields kept in the transcript rather than the header
+TRANSCRIPT_FIELDS = ["messages", "sentiment_data"]
+
+
+class CorruptSessionError(ValueError):
+    """Raised when stored session data cannot be decoded."""
+
+
+def is_compact(blob):
+    """Check whether stored bytes are in the compact format."""
+    return isinstance(blob, (bytes, bytearray, memoryview)) and bytes(blob[:len(MAGIC)]) == MAGIC
+
+
+def split_session(session_data):
+    """Split a session dict into its header and transcript dicts."""
+    messages = list(session_data.get("messages") or [])
+    header = {key: value for key, value in session_data.items() if key not in TRANSCRIPT_FIELDS}
+    header["format"] = FORMAT_VERSION
+    header["message_count"] = len(messages)
+
+    # Point each sentiment entry at the candidate message it was computed for
+    sentiment = []
+    unmatched = {}
+    next_index = 0
+    for position, point in enumerate(session_data.get("sentiment_data") or []):
+        point = dict(point)
+        text = point.pop("message", None)
+        index = next(
+            (i for i in range(next_index, len(messages))
+             if messages[i].get("role") == "user" and messages[i].get("content") == text),
+            None
+        )
+        if index is None:
+            # Messages processed without being shown (e.g. auto-submitted prompts) keep their text
+            if text is not None:
+                unmatched[str(position)] = text
+        else:
+            point["message_index"] = index
+            next_index = index + 1
+        sentiment.append(point)
+    header["sentiment"] = sentiment
+
+    transcript = {"messages": messages}
+    if unmatched:
+        transcript["sentiment_messages"] = unmatched
+    return header, transcript
+
+
+def join_session(header, transcript):
+    """Rebuild the session dict from its header and transcript."""
+    session_data = {key: value for key, value in header.items() if key not in ("format", "message_count", "sentiment")}
+    messages = transcript.get("messages", [])
+    session_data["messages"] = messages
+    session_data["sentiment_data"] = sentiment_points(header, transcript)
+    return session_data
+
+
+def sentiment_points(header, transcript=None):
+    """Return the sentiment points of a header, with their message text if the transcript is given."""
+    unmatched = (transcript or {}).get("sentiment_messages", {})
+    messages = (transcript or {}).get("messages", [])
+    points = []
+    for position, point in enumerate(header.get("sentiment", [])):
+        point = dict(point)
+        index = point.pop("message_index", None)
+        if transcript is not None:
+            if index is not None and index < len(messages):
+                point["message"] = messages[index].get("content")
+            elif str(position) in unmatched:
+                point["message"] = unmatched[str(position)]
+        points.append(point)
+    return points
+
+
+def _compress(data):
+    """Serialize and compress a dict."""
+    return zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+
+
+def _decompress(data):
+    """Decompress and parse a dict."""
+    try:
+        return json.loads(zlib.decompress(data).decode("utf-8"))
+    except (zlib.error, ValueError) as e:
+        raise CorruptSessionError(f"Unreadable session data: {e}") from e
+
+
+def encode_session(session_data):
+    """Encode a session dict in the compact format."""
+    header, transcript = split_session(session_data)
+    header_bytes = _compress(header)
+    return MAGIC + LENGTH.pack(len(header_bytes)) + header_bytes + _compress(transcript)
+
+
+def _header_length(blob):
+    """Return the compressed header length from the start of a compact blob."""
+    if not is_compact(blob) or len(blob) < PREFIX_SIZE:
+        raise CorruptSessionError("Not a compact session")
+    return LENGTH.unpack(bytes(blob[len(MAGIC):PREFIX_SIZE]))[0]
+
+
+def decode_header(blob):
+    """Decode only the header of a compact blob."""
+    end = PREFIX_SIZE + _header_length(blob)
+    return _decompress(bytes(blob[PREFIX_SIZE:end]))
+
+
+def decode_transcript(blob):
+    """Decode only the transcript of a compact blob."""
+    return _decompress(bytes(blob[PREFIX_SIZE + _header_length(blob):]))
+
+
+def decode_session(blob):
+    """Decode a compact blob into the full session dict."""
+    return join_session(decode_header(blob), decode_transcript(blob))
+
+
+def read_header(f):
+    """Read the header from an open compact session file without reading the transcript."""
+    prefix = f.read(PREFIX_SIZE)
+    return _decompress(f.read(_header_length(prefix)))
+
+
+class SavedSession:
+    """A saved session whose transcript is decoded the first time it is needed.
+
+    Wraps either a compact blob or a session dict loaded from the original
+    JSON format, so callers can treat both alike.
+    """
+
+    def __init__(self, blob=None, session_data=None):
+        """Initialize from a compact blob or an already decoded session dict."""
+        self.blob = blob
+        self._header = None
+        self._transcript = None
+        if session_data is not None:
+            self._header, self._transcript = split_session(session_data)
+
+    @property
+    def header(self):
+        """The session fields other than the transcript, plus message_count and sentiment points."""
+        if self._header is None:
+            self._header = decode_header(self.blob)
+        return self._header
+
+    @property
+    def decoded(self):
+        """Whether the transcript has been decoded."""
+        return self._transcript is not None
+
+    def transcript(self):
+        """Decode (once) and return the transcript."""
+        if self._transcript is None:
+            self._transcript = decode_transcript(self.blob)
+        return self._transcript
+
+    def sentiment_data(self):
+        """Return the sentiment points, without message text until the transcript is decoded."""
+        return sentiment_points(self.header, self._transcript)
+
+    def to_dict(self):
+        """Return the full session dict, decoding the transcript if needed."""
+        return join_session(self.header, self.transcript())
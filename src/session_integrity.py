@@ -0,0 +1,82 @@
+import threading
+import time
+from config import SESSION_INTEGRITY_SCAN_INTERVAL
+from src.session_format import CorruptSessionError
+from src.session_lock import SessionLock
+
+
+class IntegrityScanner:
+    """Process-wide background scan that quarantines saved sessions that cannot be decoded.
+
+    The scan runs on a daemon thread and pauses briefly between sessions, so
+    it never holds up the UI. A session that fails to decode is checked again
+    under its session lock before it is moved to quarantine, so a save that
+    lands mid-scan is never mistaken for corruption; if the lock can't be
+    taken the session is skipped until the next scan.
+    """
+
+    _thread = None
+    _stop = threading.Event()
+    _lock = threading.Lock()
+    last_result = None
+
+    @staticmethod
+    def scan(store, pause=0.001):
+        """Check every session in a store once; returns what was checked and quarantined."""
+        result = {"checked": 0, "quarantined": [], "skipped": [], "temp_files_removed": 0}
+        if hasattr(store, "remove_stale_temp_files"):
+            result["temp_files_removed"] = store.remove_stale_temp_files()
+        result["lock_files_removed"] = SessionLock.remove_stale()
+
+        for session_id in store.session_ids():
+            result["checked"] += 1
+            try:
+                store.check(session_id)
+            except CorruptSessionError:
+                try:
+                    with SessionLock(session_id):
+                        try:
+                            store.check(session_id)
+                        except CorruptSessionError as e:
+                            if store.quarantine(session_id, reason=str(e)):
+                                result["quarantined"].append(session_id)
+                except TimeoutError:
+                    result["skipped"].append(session_id)
+            if pause:
+                time.sleep(pause)
+        return result
+
+    @classmethod
+    def start(cls, get_store, interval=SESSION_INTEGRITY_SCAN_INTERVAL):
+        """Start scanning every `interval` seconds unless a scan thread is already running.
+
+        `get_store` is called for every scan, so the thread always checks the
+        store currently in use.
+        """
+        if interval <= 0:
+            return False
+        with cls._lock:
+            if cls._thread is not None and cls._thread.is_alive():
+                return False
+            cls._stop.clear()
+            cls._thread = threading.Thread(
+                target=cls._run, args=(get_store, interval), name="session-integrity", daemon=True
+            )
+            cls._thread.start()
+            return True
+
+    @classmethod
+    def stop(cls):
+        """Stop the scan thread after its current session."""
+        cls._stop.set()
+
+    @classmethod
+    def _run(cls, get_store, interval):
+        """Scan, then wait for the next interval, until stopped."""
+        while not cls._stop.is_set():
+            try:
+                cls.last_result = cls.scan(get_store())
+            except Exception as e:
+                # A failed scan is retried at the next interval
+                cls.last_result = {"error": str(e)}
+            cls._stop.wait(interval)
@@ -0,0 +1,124 @@
+import json
+import os
+from config import SESSION_JOURNAL_DIR
+
+# Session fields that are journaled as whole values when they change;
+# messages and sentiment points are journaled one entry per item instead
+JOURNALED_FIELDS = [
+    "interview_id",
+    "candidate_info",
+    "current_stage",
+    "conversation_ended",
+    "tech_questions_generated",
+    "technical_assessment",
+    "detected_language",
+    "language"
+]
+
+# List fields journaled item by item, and the entry type used for their items
+APPENDED_FIELDS = {"messages": "message", "sentiment_data": "sentiment"}
+
+
+class SessionJournal:
+    """Append-only JSONL journal of the changes to each saved session.
+
+    Every entry carries a sequence number. The session store holds periodic
+    snapshots that record the last sequence number they include, so loading a
+    session is the snapshot plus the journal entries after it. The journal is
+    emptied after each snapshot.
+    """
+
+    def __init__(self, directory=SESSION_JOURNAL_DIR):
+        """Initialize the journal for a directory."""
+        self.directory = directory
+
+    def path(self, session_id):
+        """Return the journal file of a session."""
+        return os.path.join(self.directory, f"{session_id}.jsonl")
+
+    def append(self, session_id, entries, last_seq=0):
+        """Append (type, data) entries; returns the new last sequence number.
+
+        Entries are numbered after `last_seq` or the journal's own last entry,
+        whichever is higher, so several writers holding the session lock in
+        turn never reuse a number.
+        """
+        if not entries:
+            return last_seq
+        os.makedirs(self.directory, exist_ok=True)
+        last_seq = max(last_seq, self.last_seq(session_id))
+
+        lines = []
+        for entry_type, data in entries:
+            last_seq += 1
+            lines.append(json.dumps({"seq": last_seq, "type": entry_type, "data": data}) + "\n")
+
+        # One write per turn keeps the entries of a turn together
+        with open(self.path(session_id), "ab+") as f:
+            # Start on a fresh line if a crash left a partial entry at the end
+            if f.seek(0, os.SEEK_END):
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    lines.insert(0, "\n")
+            f.write("".join(lines).encode("utf-8"))
+            f.flush()
+            os.fsync(f.fileno())
+        return last_seq
+
+    def last_seq(self, session_id):
+        """Return the highest sequence number in a session's journal (0 if it is empty)."""
+        return max((entry.get("seq", 0) for entry in self.read(session_id)), default=0)
+
+    def read(self, session_id, after_seq=0):
+        """Return the journal entries after `after_seq`, skipping a torn final line."""
+        entries = []
+        try:
+            with open(self.path(session_id), "r") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # A crash mid-write can leave a partial last line
+                        continue
+                    if entry.get("seq", 0) > after_seq:
+                        entries.append(entry)
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def truncate(self, session_id):
+        """Remove a session's journal once its entries are in a snapshot."""
+        try:
+            os.remove(self.path(session_id))
+        except FileNotFoundError:
+            pass
+
+    @staticmethod
+    def diff_entries(previous, current):
+        """Return the (type, data) entries that turn one session dict into another."""
+        entries = []
+        for field, entry_type in APPENDED_FIELDS.items():
+            old_items = previous.get(field) or []
+            new_items = current.get(field) or []
+            if new_items[:len(old_items)] == old_items:
+                entries.extend((entry_type, item) for item in new_items[len(old_items):])
+            else:
+                # Not a pure append (e.g. history was replaced): journal the whole list
+                entries.append(("state", {field: new_items}))
+
+        changed = {field: current.get(field) for field in JOURNALED_FIELDS if current.get(field) != previous.get(field)}
+        if changed:
+            entries.append(("state", changed))
+        return entries
+
+    @staticmethod
+    def replay(session_data, entries):
+        """Apply journal entries to a session dict in place and return it."""
+        appended = {entry_type: field for field, entry_type in APPENDED_FIELDS.items()}
+        for entry in entries:
+            if entry["type"] in appended:
+                session_data.setdefault(appended[entry["type"]], []).append(entry["data"])
+            elif entry["type"] == "state":
+                session_data.update(entry["data"])
+            session_data["journal_seq"] = entry["seq"]
+        return session_data
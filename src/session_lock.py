@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from config import SESSION_LOCK_DIR, SESSION_LOCK_TIMEOUT
+
+try:
+    import fcntl
+except ImportError:  # Windows: locks only serialize threads of this process
+    fcntl = None
+
+
+class SessionLock:
+    """Advisory lock on one saved session, shared by every process using the same lock directory.
+
+    Each session has an empty lock file that is locked with flock, so the lock
+    is released automatically if the holding process dies. The holder removes
+    the file when it releases the lock, so lock files don't pile up; a waiter
+    that ends up locking a removed file opens the new one and tries again. Use
+    as a context manager; raises TimeoutError if the lock is not acquired
+    within `timeout` seconds.
+    """
+
+    # Fallback per-session locks for platforms without fcntl
+    _thread_locks = {}
+    _thread_locks_guard = threading.Lock()
+
+    def __init__(self, session_id, directory=SESSION_LOCK_DIR, timeout=SESSION_LOCK_TIMEOUT):
+        """Initialize the lock for a session."""
+        self.session_id = session_id
+        self.directory = directory
+        self.timeout = timeout
+        self._file = None
+        self._thread_lock = None
+
+    @property
+    def path(self):
+        """Return the session's lock file."""
+        return os.path.join(self.directory, f"{self.session_id}.lock")
+
+    def acquire(self):
+        """Block until the lock is held or the timeout expires."""
+        if fcntl is None:
+            with self._thread_locks_guard:
+                self._thread_lock = self._thread_locks.setdefault(self.session_id, threading.Lock())
+            if not self._thread_lock.acquire(timeout=self.timeout):
+                raise TimeoutError(f"Session '{self.session_id}' is locked by another writer")
+            return
+
+        deadline = time.monotonic() + self.timeout
+        while True:
+            os.makedirs(self.directory, exist_ok=True)
+            self._file = open(self.path, "a")
+            while True:
+                try:
+                    fcntl.flock(self._file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        self._file.close()
+                        self._file = None
+                        raise TimeoutError(f"Session '{self.session_id}' is locked by another writer")
+                    time.sleep(0.01)
+            if self._is_current():
+                return
+            # The previous holder removed this file while we waited on it
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    def _is_current(self):
+        """Return whether the locked file is still the one at the lock path."""
+        try:
+            return os.stat(self.path).st_ino == os.fstat(self._file.fileno()).st_ino
+        except FileNotFoundError:
+            return False
+
+    def release(self):
+        """Release the lock."""
+        if self._thread_lock is not None:
+            self._thread_lock.release()
+            self._thread_lock = None
+        if self._file is not None:
+            # Removed while still locked, so no other holder can be using it
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            self._file.close()
+            self._file = None
+
+    @staticmethod
+    def remove_stale(directory=SESSION_LOCK_DIR):
+        """Remove the lock files nobody holds (left by writers that died); returns how many."""
+        if fcntl is None or not os.path.isdir(directory):
+            return 0
+        removed = 0
+        for filename in os.listdir(directory):
+            if not filename.endswith(".lock"):
+                continue
+            lock = SessionLock(filename[:-len(".lock")], directory, timeout=0)
+            try:
+                lock.acquire()
+            except (TimeoutError, OSError):
+                continue
+            lock.release()
+            removed += 1
+        return removed
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
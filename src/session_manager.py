@@ -1,50 +1,105 @@
 import streamlit as st
+import threading
+from collections import OrderedDict
 from datetime import datetime
-import json
-import os
-from config import STAGES, DEFAULT_LANGUAGE
+from config import STAGES, DEFAULT_LANGUAGE, SESSION_LIST_PAGE_SIZE, SESSION_AUTOSAVE, SESSION_SNAPSHOT_EVERY
+from src.interview_state import InterviewState
+from src.session_store import create_session_store
+from src.session_journal import SessionJournal
+from src.session_format import CorruptSessionError
+from src.session_lock import SessionLock
+from src.session_integrity import IntegrityScanner
 
 class SessionManager:
     """Class to manage the session state for the chatbot."""
     
+    _store = None
+    _journal = None
+    _store_lock = threading.Lock()
+    
+    # Session listings keyed by store version and query, shared by every browser session
+    _listing_cache = OrderedDict()
+    _listing_cache_size = 64
+    
+    @classmethod
+    def store(cls):
+        """Get the process-wide session store configured by SESSION_STORE."""
+        with cls._store_lock:
+            if cls._store is None:
+                cls._store = create_session_store()
+            return cls._store
+    
+    @classmethod
+    def journal(cls):
+        """Get the journal that autosaves record each turn in."""
+        with cls._store_lock:
+            if cls._journal is None:
+                cls._journal = SessionJournal()
+            return cls._journal
+    
     @staticmethod
     def initialize_session():
         """Initialize or get the session state variables."""
         if "initialized" not in st.session_state:
-            # Core conversation state
-            st.session_state.messages = []
-            st.session_state.current_stage = "greeting"
-            st.session_state.conversation_ended = False
+            # Conversation, candidate and assessment state
+            for key, value in InterviewState().to_dict().items():
+                st.session_state[key] = value
             
-            # Candidate information
-            st.session_state.candidate_info = {
-                "name": None,
-                "email": None,
-                "phone": None,
-                "experience": None,
-                "position": None,
-                "location": None,
-                "tech_stack": []
-            }
+            # UI-only state
+            st.session_state.selected_language = "English"
             
-            # Technical assessment tracking
-            st.session_state.tech_questions_generated = False
-            st.session_state.technical_assessment = {
-                "questions_asked": [],
-                "answers": [],
-                "evaluations": [],
-                "scores": {},
-                "overall_score": 0,
-                "completed": False
-            }
+            # Autosave bookkeeping: saved session ID, last journal entry and entries since the snapshot
+            st.session_state.session_id = None
+            st.session_state.journal_seq = 0
+            st.session_state.journal_pending = 0
+            st.session_state.snapshot_saved = False
             
-            # Advanced features state
-            st.session_state.sentiment_data = []
-            st.session_state.language = DEFAULT_LANGUAGE
-            st.session_state.selected_language = "English"
+            # Saved session whose transcript is waiting to be decoded (see load_session)
+            st.session_state.pending_transcript = None
             
             # Set initialization flag
             st.session_state.initialized = True
+            
+            # Quarantine corrupt saved sessions in the background (once per process)
+            IntegrityScanner.start(SessionManager.store)
+    
+    @staticmethod
+    def get_interview_state():
+        """Return a snapshot of the interview state held in st.session_state."""
+        SessionManager.load_transcript()
+        return InterviewState.from_dict(st.session_state)
+    
+    @staticmethod
+    def load_transcript():
+        """Decode the transcript of a loaded session if it has not been decoded yet."""
+        saved = st.session_state.get("pending_transcript")
+        if saved is None:
+            return
+        st.session_state.pending_transcript = None
+        try:
+            st.session_state.messages = saved.transcript()["messages"]
+            st.session_state.sentiment_data = saved.sentiment_data()
+        except CorruptSessionError as e:
+            session_id = st.session_state.get("session_id")
+            try:
+                with SessionLock(session_id):
+                    SessionManager.store().quarantine(session_id, reason=str(e))
+            except TimeoutError as lock_error:
+                st.error(f"The transcript of session '{session_id}' is corrupt and could not be quarantined: {str(lock_error)}")
+                return
+            st.error(f"The transcript of session '{session_id}' is corrupt and has been moved to quarantine: {str(e)}")
+    
+    @staticmethod
+    def messages():
+        """Return the chat messages, decoding a loaded session's transcript on first use."""
+        SessionManager.load_transcript()
+        return st.session_state.messages
+    
+    @staticmethod
+    def apply_state_delta(delta):
+        """Write the fields changed by a conversation turn back to st.session_state."""
+        for key, value in delta.items():
+            st.session_state[key] = value
     
     @staticmethod
     def reset_session():
@@ -67,66 +122,208 @@ class SessionManager:
         SessionManager.initialize_session()
     
     @staticmethod
-    def save_session(filename=None):
-        """Save the current session to a file."""
-        if not filename:
-            # Generate filename based on candidate name and timestamp
-            candidate_name = st.session_state.candidate_info.get("name", "anonymous")
-            candidate_name = candidate_name.replace(" ", "_").lower()
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"session_{candidate_name}_{timestamp}.json"
-        
-        # Create sessions directory if it doesn't exist
-        os.makedirs("sessions", exist_ok=True)
-        
-        # Prepare session data
-        session_data = {
+    def session_data(state):
+        """Build the saved form of an InterviewState."""
+        return {
             "timestamp": datetime.now().isoformat(),
-            "candidate_info": st.session_state.candidate_info,
-            "messages": st.session_state.messages,
-            "current_stage": st.session_state.current_stage,
-            "technical_assessment": st.session_state.technical_assessment,
-            "sentiment_data": st.session_state.sentiment_data,
-            "language": st.session_state.language
+            "interview_id": state.interview_id,
+            "candidate_info": state.candidate_info,
+            "messages": state.messages,
+            "current_stage": state.current_stage,
+            "conversation_ended": state.conversation_ended,
+            "tech_questions_generated": state.tech_questions_generated,
+            "technical_assessment": state.technical_assessment,
+            "sentiment_data": state.sentiment_data,
+            "detected_language": state.detected_language,
+            "language": state.language
         }
+    
+    @staticmethod
+    def current_session_id():
+        """Return the ID the current conversation is saved under, creating it on first use."""
+        if not st.session_state.get("session_id"):
+            # The full random interview ID keeps IDs unique across processes saving in the same second
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            st.session_state.session_id = f"session_{timestamp}_{st.session_state.interview_id}"
+        return st.session_state.session_id
+    
+    @staticmethod
+    def _saved_seq(session_id):
+        """Return the last sequence number saved for a session by any writer (call with its lock held)."""
+        journal_seq = SessionManager.journal().last_seq(session_id)
+        try:
+            saved = SessionManager.store().load_lazy(session_id)
+            snapshot_seq = saved.header.get("journal_seq", 0) if saved is not None else 0
+        except CorruptSessionError:
+            snapshot_seq = 0
+        return max(journal_seq, snapshot_seq)
+    
+    @staticmethod
+    def _write_snapshot(session_id, state):
+        """Save the full session to the store and drop the journal entries it now includes."""
+        session_data = SessionManager.session_data(state)
+        with SessionLock(session_id):
+            # Another tab or process may have journaled this session since this one last did
+            st.session_state.journal_seq = max(st.session_state.get("journal_seq", 0), SessionManager._saved_seq(session_id))
+            session_data["journal_seq"] = st.session_state.journal_seq
+            SessionManager.store().save(session_id, session_data)
+            SessionManager.journal().truncate(session_id)
+        st.session_state.journal_pending = 0
+        st.session_state.snapshot_saved = True
+    
+    @staticmethod
+    def autosave(previous_state, state):
+        """Journal the changes a turn made, compacting into a snapshot when due."""
+        if not SESSION_AUTOSAVE:
+            return
+        
+        try:
+            session_id = SessionManager.current_session_id()
+            entries = SessionJournal.diff_entries(
+                SessionManager.session_data(previous_state),
+                SessionManager.session_data(state)
+            )
+            pending = st.session_state.get("journal_pending", 0) + len(entries)
+            
+            # The first save, every SESSION_SNAPSHOT_EVERY entries and the end of the interview write a snapshot
+            if not st.session_state.get("snapshot_saved") or pending >= SESSION_SNAPSHOT_EVERY or state.conversation_ended:
+                SessionManager._write_snapshot(session_id, state)
+            elif entries:
+                with SessionLock(session_id):
+                    # Number after whatever any writer has saved, not just this tab
+                    last_seq = max(st.session_state.get("journal_seq", 0), SessionManager._saved_seq(session_id))
+                    st.session_state.journal_seq = SessionManager.journal().append(session_id, entries, last_seq)
+                st.session_state.journal_pending = pending
+        except Exception as e:
+            st.warning(f"Autosave failed: {str(e)}")
+    
+    @staticmethod
+    def save_session(session_id=None):
+        """Save the current session to the session store and return its ID."""
+        state = SessionManager.get_interview_state()
         
-        # Save to file
-        with open(os.path.join("sessions", filename), "w") as f:
-            json.dump(session_data, f, indent=4)
+        # Saving under the current ID also compacts its journal
+        if not session_id or session_id == SessionManager.current_session_id():
+            session_id = SessionManager.current_session_id()
+            SessionManager._write_snapshot(session_id, state)
+        else:
+            with SessionLock(session_id):
+                SessionManager.store().save(session_id, SessionManager.session_data(state))
         
-        return filename
+        return session_id
     
     @staticmethod
-    def load_session(filename):
-        """Load a session from a file."""
+    def saved_session_data(session_id):
+        """Return a saved session as a dict, with its journal tail replayed, or None if there is no such session."""
+        session_data = SessionManager.store().load(session_id)
+        if session_data is None:
+            return None
+        tail = SessionManager.journal().read(session_id, after_seq=session_data.get("journal_seq", 0))
+        return SessionJournal.replay(session_data, tail)
+    
+    @staticmethod
+    def load_session(session_id):
+        """Load a session from its snapshot in the session store plus its journal tail.
+        
+        Only the snapshot's header is decoded here; the messages are decoded when
+        the chat pane first renders them (or the engine first needs them). A
+        journal tail has to be replayed onto the full session, so it decodes
+        the transcript straight away.
+        """
         try:
-            with open(os.path.join("sessions", filename), "r") as f:
-                session_data = json.load(f)
+            saved = SessionManager.store().load_lazy(session_id)
+            if saved is None:
+                raise KeyError(f"No saved session named '{session_id}'")
+            session_data = dict(saved.header)
+            tail = SessionManager.journal().read(session_id, after_seq=session_data.get("journal_seq", 0))
+            if tail:
+                session_data = SessionJournal.replay(saved.to_dict(), tail)
+                st.session_state.pending_transcript = None
+                st.session_state.messages = session_data.get("messages", [])
+                st.session_state.sentiment_data = session_data.get("sentiment_data", [])
+            else:
+                st.session_state.pending_transcript = saved
+                st.session_state.messages = []
+                st.session_state.sentiment_data = saved.sentiment_data()
             
             # Restore session state
-            st.session_state.messages = session_data.get("messages", [])
+            st.session_state.interview_id = session_data.get("interview_id") or InterviewState().interview_id
             st.session_state.candidate_info = session_data.get("candidate_info", {})
             st.session_state.current_stage = session_data.get("current_stage", "greeting")
             st.session_state.technical_assessment = session_data.get("technical_assessment", {})
-            st.session_state.sentiment_data = session_data.get("sentiment_data", [])
             st.session_state.language = session_data.get("language", DEFAULT_LANGUAGE)
+            st.session_state.detected_language = session_data.get("detected_language")
             
             # Set appropriate flags
-            st.session_state.conversation_ended = st.session_state.current_stage == "conclusion"
-            st.session_state.tech_questions_generated = len(st.session_state.technical_assessment.get("questions_asked", [])) > 0
+            st.session_state.conversation_ended = session_data.get(
+                "conversation_ended", st.session_state.current_stage == "conclusion"
+            )
+            st.session_state.tech_questions_generated = session_data.get(
+                "tech_questions_generated", len(st.session_state.technical_assessment.get("questions_asked", [])) > 0
+            )
+            st.session_state.history_summary = None
+            
+            # Keep journaling the loaded session where it left off
+            st.session_state.session_id = session_id
+            st.session_state.journal_seq = session_data.get("journal_seq", 0)
+            st.session_state.journal_pending = len(tail)
+            st.session_state.snapshot_saved = True
             
             return True
+        except CorruptSessionError as e:
+            try:
+                with SessionLock(session_id):
+                    SessionManager.store().quarantine(session_id, reason=str(e))
+            except TimeoutError as lock_error:
+                st.error(f"Session '{session_id}' is corrupt and could not be quarantined: {str(lock_error)}")
+                return False
+            st.error(f"Session '{session_id}' is corrupt and has been moved to quarantine: {str(e)}")
+            return False
         except Exception as e:
             st.error(f"Error loading session: {str(e)}")
             return False
     
+    @classmethod
+    def session_page(cls, search="", prefix=False, page=0, page_size=SESSION_LIST_PAGE_SIZE):
+        """Return one page of saved session summaries matching a search, and the total number of matches.
+        
+        Results are cached until the store's version changes, so reruns only pay
+        for one cheap version check however many sessions are saved.
+        """
+        store = cls.store()
+        key = (store.version(), search or "", bool(prefix), page, page_size)
+        with cls._store_lock:
+            if key in cls._listing_cache:
+                cls._listing_cache.move_to_end(key)
+                return cls._listing_cache[key]
+        
+        filters = {"search": search or None, "prefix": prefix}
+        result = (
+            store.list_sessions(offset=page * page_size, limit=page_size, **filters),
+            store.count_sessions(**filters)
+        )
+        with cls._store_lock:
+            cls._listing_cache[key] = result
+            while len(cls._listing_cache) > cls._listing_cache_size:
+                cls._listing_cache.popitem(last=False)
+        return result
+    
     @staticmethod
-    def list_saved_sessions():
-        """List all saved session files."""
+    def session_label(summary):
+        """Format a session summary for the session picker."""
+        timestamp = (summary.get("timestamp") or "")[:16].replace("T", " ")
+        return f"{summary.get('candidate_name') or 'Anonymous'} · {summary.get('current_stage') or 'unknown'} · {timestamp}"
+    
+    @staticmethod
+    def list_saved_sessions(offset=0, limit=SESSION_LIST_PAGE_SIZE, **filters):
+        """List the IDs of one page of saved sessions, newest first.
+        
+        Filters are passed to the store: search (candidate name, email or session
+        ID), prefix, stage, min_score and since (ISO timestamp).
+        """
         try:
-            os.makedirs("sessions", exist_ok=True)
-            sessions = [f for f in os.listdir("sessions") if f.endswith(".json")]
-            return sorted(sessions, reverse=True)
+            summaries = SessionManager.store().list_sessions(offset=offset, limit=limit, **filters)
+            return [summary["session_id"] for summary in summaries]
         except Exception as e:
             st.error(f"Error listing sessions: {str(e)}")
             return []
@@ -0,0 +1,681 @@
+"""Pluggable storage for saved interview sessions.
+
+Import the JSON files of the old sessions/ directory into the SQLite store
+(run from the project root):
+    python -m src.session_store migrate --source sessions
+
+Convert sessions saved in the original JSON format to the compact format:
+    python -m src.session_store compact --store sqlite
+"""
+import argparse
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import zlib
+from contextlib import contextmanager
+from datetime import datetime
+from config import SESSION_STORE, SESSIONS_DIR, SESSION_DB_PATH, SESSION_FORMAT
+from src.session_format import (
+    SavedSession, CorruptSessionError, encode_session, decode_session, is_compact, read_header
+)
+
+# Columns every store can filter and sort listings on
+SUMMARY_FIELDS = ["session_id", "timestamp", "candidate_name", "candidate_email", "current_stage", "overall_score"]
+
+
+def session_summary(session_id, session_data):
+    """Extract the indexed summary fields from a saved session."""
+    candidate_info = session_data.get("candidate_info") or {}
+    assessment = session_data.get("technical_assessment") or {}
+    return {
+        "session_id": session_id,
+        "timestamp": session_data.get("timestamp"),
+        "candidate_name": candidate_info.get("name"),
+        "candidate_email": candidate_info.get("email"),
+        "current_stage": session_data.get("current_stage"),
+        "overall_score": assessment.get("overall_score")
+    }
+
+
+def serialize_session(session_data, session_format=SESSION_FORMAT):
+    """Serialize a session in the configured format: compact bytes or JSON text."""
+    if session_format == "compact":
+        return encode_session(session_data)
+    return json.dumps(session_data)
+
+
+def deserialize_session(stored):
+    """Decode a stored session in either format."""
+    if is_compact(stored):
+        return decode_session(stored)
+    return _parse_json(stored)
+
+
+def _parse_json(text):
+    """Parse a session saved in the original JSON format."""
+    try:
+        session_data = json.loads(text)
+    except ValueError as e:
+        raise CorruptSessionError(f"Unreadable session JSON: {e}") from e
+    if not isinstance(session_data, dict):
+        raise CorruptSessionError("Session JSON is not an object")
+    return session_data
+
+
+def atomic_write(path, data):
+    """Write bytes to a file so that readers and crashes only ever see the old or the new contents.
+
+    The data goes to a temporary file in the same directory, is flushed to disk
+    and then renamed over the target; the directory is synced so the rename
+    itself survives a crash.
+    """
+    directory = os.path.dirname(path) or "."
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.remove(temp_path)
+        except FileNotFoundError:
+            pass
+        raise
+
+    if hasattr(os, "O_DIRECTORY"):
+        dir_fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+# Summary fields the search filter matches against
+SEARCH_FIELDS = ["candidate_name", "candidate_email", "session_id"]
+
+
+def _matches(summary, search=None, prefix=False, stage=None, min_score=None, since=None):
+    """Check a summary against the listing filters."""
+    if search:
+        needle = search.lower()
+        values = [(summary[key] or "").lower() for key in SEARCH_FIELDS]
+        if not any(value.startswith(needle) if prefix else needle in value for value in values):
+            return False
+    if stage and summary["current_stage"] != stage:
+        return False
+    if min_score is not None and (summary["overall_score"] or 0) < min_score:
+        return False
+    if since and (summary["timestamp"] or "") < since:
+        return False
+    return True
+
+
+class SessionStore:
+    """Interface for the stores saved sessions are kept in.
+
+    Sessions are identified by a string ID and stored as the dict built by
+    SessionManager.save_session. Listings return summary dicts (see
+    SUMMARY_FIELDS), newest first, and can be filtered by a search string
+    matched against the candidate name, email and session ID (as a substring,
+    or a prefix with `prefix=True`), stage, minimum overall score and earliest
+    timestamp. `version` changes whenever the stored sessions change, so
+    callers can cache listings.
+
+    Loading data that cannot be decoded raises CorruptSessionError; `check`
+    decodes a session fully and `quarantine` moves a corrupt one out of the
+    store for inspection.
+    """
+
+    name = None
+
+    def save(self, session_id, session_data):
+        """Store a session, replacing any session with the same ID."""
+        raise NotImplementedError
+
+    def load(self, session_id):
+        """Return the stored session, or None if there is no such session."""
+        raise NotImplementedError
+
+    def load_lazy(self, session_id):
+        """Return the stored session as a SavedSession, or None if there is no such session.
+
+        Stores keeping the compact format return it without decoding the transcript.
+        """
+        session_data = self.load(session_id)
+        return SavedSession(session_data=session_data) if session_data is not None else None
+
+    def delete(self, session_id):
+        """Remove a session; returns whether it existed."""
+        raise NotImplementedError
+
+    def legacy_sessions(self):
+        """Return the IDs of sessions still stored in the original JSON format."""
+        raise NotImplementedError
+
+    def session_ids(self):
+        """Return the IDs of every stored session, including ones that cannot be decoded."""
+        raise NotImplementedError
+
+    def check(self, session_id):
+        """Decode a session completely, raising CorruptSessionError if any part of it is unreadable."""
+        self.load(session_id)
+
+    def quarantine(self, session_id, reason=""):
+        """Move a corrupt session out of the store; returns whether it was found."""
+        raise NotImplementedError
+
+    def list_sessions(self, offset=0, limit=50, search=None, prefix=False, stage=None, min_score=None, since=None):
+        """Return one page of session summaries, newest first."""
+        raise NotImplementedError
+
+    def count_sessions(self, search=None, prefix=False, stage=None, min_score=None, since=None):
+        """Return how many sessions match the filters."""
+        raise NotImplementedError
+
+    def version(self):
+        """Return a value that changes whenever sessions are saved or deleted."""
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the store."""
+
+
+class JsonSessionStore(SessionStore):
+    """One file per session in a directory.
+
+    Sessions are written as compact .session files (or, with
+    SESSION_FORMAT=json, the original pretty-printed .json files); both are
+    read. Listing has to open every file, so this store is only suitable for
+    small numbers of sessions.
+    """
+
+    name = "json"
+
+    EXTENSIONS = {"compact": ".session", "json": ".json"}
+
+    def __init__(self, directory=SESSIONS_DIR, session_format=SESSION_FORMAT):
+        """Initialize the store for a directory."""
+        self.directory = directory
+        self.session_format = session_format
+
+    @staticmethod
+    def _session_id(session_id):
+        """Strip a file extension from a session ID."""
+        for extension in JsonSessionStore.EXTENSIONS.values():
+            if session_id.endswith(extension):
+                return session_id[:-len(extension)]
+        return session_id
+
+    def _path(self, session_id, session_format):
+        """Return the file path of a session ID in a format."""
+        return os.path.join(self.directory, self._session_id(session_id) + self.EXTENSIONS[session_format])
+
+    def save(self, session_id, session_data):
+        """Store a session file atomically, replacing one in the other format."""
+        os.makedirs(self.directory, exist_ok=True)
+        if self.session_format == "compact":
+            atomic_write(self._path(session_id, "compact"), encode_session(session_data))
+        else:
+            atomic_write(self._path(session_id, "json"), json.dumps(session_data, indent=4).encode("utf-8"))
+
+        for session_format in self.EXTENSIONS:
+            if session_format != self.session_format:
+                self._remove(self._path(session_id, session_format))
+
+    def load(self, session_id):
+        """Read a session file in either format."""
+        saved = self.load_lazy(session_id)
+        return saved.to_dict() if saved is not None else None
+
+    def load_lazy(self, session_id):
+        """Read a session file; compact files are decoded lazily."""
+        try:
+            with open(self._path(session_id, "compact"), "rb") as f:
+                return SavedSession(blob=f.read())
+        except FileNotFoundError:
+            pass
+        try:
+            with open(self._path(session_id, "json"), "r") as f:
+                return SavedSession(session_data=_parse_json(f.read()))
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _remove(path):
+        """Remove a file if it exists; returns whether it did."""
+        try:
+            os.remove(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    def delete(self, session_id):
+        """Remove a session's file in either format."""
+        removed = [self._remove(self._path(session_id, session_format)) for session_format in self.EXTENSIONS]
+        return any(removed)
+
+    def legacy_sessions(self):
+        """Return the IDs of the sessions saved as .json files."""
+        os.makedirs(self.directory, exist_ok=True)
+        return sorted(filename[:-len(".json")] for filename in os.listdir(self.directory) if filename.endswith(".json"))
+
+    def session_ids(self):
+        """Return the IDs of every session file."""
+        os.makedirs(self.directory, exist_ok=True)
+        return sorted({
+            self._session_id(filename) for filename in os.listdir(self.directory)
+            if self._session_id(filename) != filename and not filename.startswith(".")
+        })
+
+    def quarantine(self, session_id, reason=""):
+        """Move a session's files into the quarantine/ subdirectory."""
+        quarantine_dir = os.path.join(self.directory, "quarantine")
+        os.makedirs(quarantine_dir, exist_ok=True)
+        moved = False
+        for session_format in self.EXTENSIONS:
+            path = self._path(session_id, session_format)
+            try:
+                os.replace(path, os.path.join(quarantine_dir, os.path.basename(path)))
+                moved = True
+            except FileNotFoundError:
+                pass
+        return moved
+
+    def remove_stale_temp_files(self, max_age=3600):
+        """Delete temporary files left behind by writers that crashed more than `max_age` seconds ago."""
+        os.makedirs(self.directory, exist_ok=True)
+        removed = 0
+        cutoff = datetime.now().timestamp() - max_age
+        for filename in os.listdir(self.directory):
+            path = os.path.join(self.directory, filename)
+            if filename.startswith(".") and filename.endswith(".tmp"):
+                try:
+                    if os.path.getmtime(path) < cutoff:
+                        os.remove(path)
+                        removed += 1
+                except FileNotFoundError:
+                    pass
+        return removed
+
+    def _read_summary_data(self, filename):
+        """Read the fields a summary needs from a session file: only the header of a compact file."""
+        path = os.path.join(self.directory, filename)
+        if filename.endswith(self.EXTENSIONS["compact"]):
+            with open(path, "rb") as f:
+                return read_header(f)
+        with open(path, "r") as f:
+            return json.load(f)
+
+    def _summaries(self, **filters):
+        """Read the summary of every session file matching the filters."""
+        os.makedirs(self.directory, exist_ok=True)
+        summaries = {}
+        for filename in os.listdir(self.directory):
+            session_id = self._session_id(filename)
+            if session_id == filename or session_id in summaries or filename.startswith("."):
+                continue
+            try:
+                session_data = self._read_summary_data(filename) or {}
+            except (ValueError, OSError, zlib.error):
+                continue
+            summary = session_summary(session_id, session_data)
+            if _matches(summary, **filters):
+                summaries[session_id] = summary
+        return sorted(summaries.values(), key=lambda summary: (summary["timestamp"] or "", summary["session_id"]), reverse=True)
+
+    def list_sessions(self, offset=0, limit=50, search=None, prefix=False, stage=None, min_score=None, since=None):
+        """Return one page of session summaries, newest first."""
+        summaries = self._summaries(search=search, prefix=prefix, stage=stage, min_score=min_score, since=since)
+        return summaries[offset:offset + limit]
+
+    def count_sessions(self, search=None, prefix=False, stage=None, min_score=None, since=None):
+        """Return how many sessions match the filters."""
+        return len(self._summaries(search=search, prefix=prefix, stage=stage, min_score=min_score, since=since))
+
+    def version(self):
+        """Return the directory's modification time, which changes when files are added or removed."""
+        try:
+            return os.stat(self.directory).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+
+class SqliteSessionStore(SessionStore):
+    """Sessions in a SQLite database in WAL mode.
+
+    The summary fields are stored in indexed columns next to the session data
+    (compact bytes, or JSON text for sessions saved in the original format),
+    so listings and filters never have to decode the sessions themselves.
+    """
+
+    name = "sqlite"
+
+    SCHEMA = [
+        """
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            timestamp TEXT,
+            candidate_name TEXT,
+            candidate_email TEXT,
+            current_stage TEXT,
+            overall_score REAL,
+            data TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_sessions_timestamp ON sessions (timestamp)",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_candidate_name ON sessions (candidate_name COLLATE NOCASE)",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_candidate_email ON sessions (candidate_email COLLATE NOCASE)",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_session_id ON sessions (session_id COLLATE NOCASE)",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_current_stage ON sessions (current_stage)",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_overall_score ON sessions (overall_score)",
+        "CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value INTEGER NOT NULL)",
+        """
+        CREATE TABLE IF NOT EXISTS quarantined_sessions (
+            session_id TEXT,
+            quarantined_at TEXT,
+            reason TEXT,
+            data BLOB
+        )
+        """,
+        "INSERT OR IGNORE INTO store_meta (key, value) VALUES ('version', 0)"
+    ]
+
+    BUMP_VERSION = "UPDATE store_meta SET value = value + 1 WHERE key = 'version'"
+
+    def __init__(self, path=SESSION_DB_PATH, session_format=SESSION_FORMAT):
+        """Initialize the store, creating the database and its indexes if needed."""
+        self.path = path
+        self.session_format = session_format
+        self._lock = threading.RLock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # One connection shared by every thread: Streamlit runs each rerun on a
+        # new thread, so per-thread connections would pile up and never close
+        self._shared = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._shared.row_factory = sqlite3.Row
+        self._shared.execute("PRAGMA journal_mode=WAL")
+        self._shared.execute("PRAGMA synchronous=NORMAL")
+        with self._connection() as connection:
+            for statement in self.SCHEMA:
+                connection.execute(statement)
+
+    @contextmanager
+    def _connection(self):
+        """Hold the shared connection for one transaction, committing it on success."""
+        with self._lock:
+            with self._shared as connection:
+                yield connection
+
+    def _query(self, sql, params=()):
+        """Run a read query and return all its rows."""
+        with self._lock:
+            return self._shared.execute(sql, params).fetchall()
+
+    def save(self, session_id, session_data):
+        """Insert or replace a session row."""
+        summary = session_summary(session_id, session_data)
+        with self._connection() as connection:
+            connection.execute(
+                """
+                INSERT OR REPLACE INTO sessions
+                    (session_id, timestamp, candidate_name, candidate_email, current_stage, overall_score, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                [summary[key] for key in SUMMARY_FIELDS] + [serialize_session(session_data, self.session_format)]
+            )
+            connection.execute(self.BUMP_VERSION)
+
+    def save_many(self, sessions, replace=True):
+        """Insert or replace many (session_id, session_data) pairs in one transaction.
+
+        With `replace` False, sessions that already have a row are left alone.
+        Returns the number of rows written.
+        """
+        rows = [
+            [session_summary(session_id, session_data)[key] for key in SUMMARY_FIELDS] + [serialize_session(session_data, self.session_format)]
+            for session_id, session_data in sessions
+        ]
+        with self._connection() as connection:
+            saved = connection.executemany(
+                f"""
+                INSERT OR {'REPLACE' if replace else 'IGNORE'} INTO sessions
+                    (session_id, timestamp, candidate_name, candidate_email, current_stage, overall_score, data)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                """,
+                rows
+            ).rowcount
+            connection.execute(self.BUMP_VERSION)
+        return saved
+
+    def load(self, session_id):
+        """Return a session's stored data."""
+        rows = self._query("SELECT data FROM sessions WHERE session_id = ?", (session_id,))
+        return deserialize_session(rows[0]["data"]) if rows else None
+
+    def load_lazy(self, session_id):
+        """Return a session's stored data without decoding a compact transcript."""
+        rows = self._query("SELECT data FROM sessions WHERE session_id = ?", (session_id,))
+        if not rows:
+            return None
+        row = rows[0]
+        if is_compact(row["data"]):
+            return SavedSession(blob=row["data"])
+        return SavedSession(session_data=_parse_json(row["data"]))
+
+    def delete(self, session_id):
+        """Remove a session row."""
+        with self._connection() as connection:
+            deleted = connection.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,)).rowcount > 0
+            if deleted:
+                connection.execute(self.BUMP_VERSION)
+            return deleted
+
+    def legacy_sessions(self):
+        """Return the IDs of the sessions stored as JSON text."""
+        rows = self._query("SELECT session_id FROM sessions WHERE typeof(data) = 'text' ORDER BY session_id")
+        return [row["session_id"] for row in rows]
+
+    def session_ids(self):
+        """Return the IDs of every session row."""
+        return [row["session_id"] for row in self._query("SELECT session_id FROM sessions ORDER BY session_id")]
+
+    def quarantine(self, session_id, reason=""):
+        """Move a session row into the quarantined_sessions table."""
+        with self._connection() as connection:
+            moved = connection.execute(
+                "INSERT INTO quarantined_sessions (session_id, quarantined_at, reason, data) "
+                "SELECT session_id, ?, ?, data FROM sessions WHERE session_id = ?",
+                (datetime.now().isoformat(), reason, session_id)
+            ).rowcount > 0
+            if moved:
+                connection.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+                connection.execute(self.BUMP_VERSION)
+            return moved
+
+    @staticmethod
+    def _where(search=None, prefix=False, stage=None, min_score=None, since=None):
+        """Build the WHERE clause and parameters for the listing filters."""
+        clauses = []
+        params = []
+        if search:
+            # A prefix pattern can use the NOCASE indexes; a substring pattern has to scan
+            escaped = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            pattern = escaped + "%" if prefix else "%" + escaped + "%"
+            clauses.append("(" + " OR ".join(f"{field} LIKE ? ESCAPE '\\'" for field in SEARCH_FIELDS) + ")")
+            params.extend([pattern] * len(SEARCH_FIELDS))
+        if stage:
+            clauses.append("current_stage = ?")
+            params.append(stage)
+        if min_score is not None:
+            clauses.append("overall_score >= ?")
+            params.append(min_score)
+        if since:
+            clauses.append("timestamp >= ?")
+            params.append(since)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def list_sessions(self, offset=0, limit=50, search=None, prefix=False, stage=None, min_score=None, since=None):
+        """Return one page of session summaries, newest first."""
+        where, params = self._where(search, prefix, stage, min_score, since)
+        rows = self._query(
+            f"SELECT {', '.join(SUMMARY_FIELDS)} FROM sessions{where} "
+            "ORDER BY timestamp DESC, session_id DESC LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        )
+        return [dict(row) for row in rows]
+
+    def count_sessions(self, search=None, prefix=False, stage=None, min_score=None, since=None):
+        """Return how many sessions match the filters."""
+        where, params = self._where(search, prefix, stage, min_score, since)
+        return self._query(f"SELECT COUNT(*) FROM sessions{where}", params)[0][0]
+
+    def version(self):
+        """Return the counter bumped in the same transaction as every save and delete."""
+        return self._query("SELECT value FROM store_meta WHERE key = 'version'")[0][0]
+
+    def import_legacy_sessions(self, source=SESSIONS_DIR):
+        """Import the session files of the json store the first time this database is opened.
+
+        Sessions that already have a row are kept, so a repeated or concurrent
+        import never overwrites a newer save. Returns the number of sessions
+        imported.
+        """
+        if self._query("SELECT 1 FROM store_meta WHERE key = 'legacy_imported'"):
+            return 0
+        imported = 0
+        if os.path.isdir(source):
+            imported, _ = migrate_json_sessions(source, self, replace=False)
+        with self._connection() as connection:
+            connection.execute("INSERT OR IGNORE INTO store_meta (key, value) VALUES ('legacy_imported', 1)")
+        return imported
+
+    def close(self):
+        """Close the store's connection."""
+        with self._lock:
+            self._shared.close()
+
+
+def create_session_store(name=SESSION_STORE):
+    """Create a session store by name ("sqlite" or "json")."""
+    if name == SqliteSessionStore.name:
+        store = SqliteSessionStore()
+        # Sessions saved before SQLite became the default stay visible
+        store.import_legacy_sessions()
+        return store
+    if name == JsonSessionStore.name:
+        return JsonSessionStore()
+    raise ValueError(f"Unknown session store: {name}")
+
+
+def migrate_json_sessions(source, store, batch_size=500, replace=True):
+    """Import every session file of a json store directory (either format) into a store.
+
+    With `replace` False, sessions the store already has are kept.
+    Returns (imported, skipped), where skipped counts files that could not be decoded.
+    """
+    imported = 0
+    skipped = 0
+    batch = []
+
+    def flush():
+        nonlocal imported
+        if hasattr(store, "save_many"):
+            imported += store.save_many(batch, replace=replace)
+        else:
+            for session_id, session_data in batch:
+                if replace or store.load_lazy(session_id) is None:
+                    store.save(session_id, session_data)
+                    imported += 1
+        batch.clear()
+
+    source_store = JsonSessionStore(source)
+    for session_id in source_store.session_ids():
+        try:
+            session_data = source_store.load(session_id)
+        except (OSError, CorruptSessionError):
+            skipped += 1
+            continue
+        if session_data is None:
+            continue
+
+        batch.append((session_id, session_data))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    return imported, skipped
+
+
+def compact_sessions(store, batch_size=500):
+    """Rewrite every session a store holds in the original JSON format in the compact format.
+
+    Sessions that cannot be decoded are moved to quarantine and the rest are
+    still converted. Returns (converted, quarantined).
+    """
+    converted = 0
+    quarantined = 0
+    batch = []
+
+    def flush():
+        if hasattr(store, "save_many"):
+            store.save_many(batch)
+        else:
+            for session_id, session_data in batch:
+                store.save(session_id, session_data)
+        batch.clear()
+
+    for session_id in store.legacy_sessions():
+        try:
+            session_data = store.load(session_id)
+        except CorruptSessionError as e:
+            if store.quarantine(session_id, reason=str(e)):
+                quarantined += 1
+            continue
+        if session_data is None:
+            continue
+        batch.append((session_id, session_data))
+        converted += 1
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    return converted, quarantined
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    migrate_parser = subparsers.add_parser("migrate", help="import JSON session files into the SQLite store")
+    migrate_parser.add_argument("--source", default=SESSIONS_DIR, help="session directory of the json store")
+    migrate_parser.add_argument("--db", default=SESSION_DB_PATH, help="SQLite database to import into")
+    compact_parser = subparsers.add_parser("compact", help="convert sessions saved as JSON to the compact format")
+    compact_parser.add_argument("--store", default=SESSION_STORE, choices=["sqlite", "json"], help="store to convert")
+    compact_parser.add_argument("--source", default=SESSIONS_DIR, help="session directory of the json store")
+    compact_parser.add_argument("--db", default=SESSION_DB_PATH, help="database of the sqlite store")
+    args = parser.parse_args()
+
+    if args.command == "compact":
+        if args.store == "sqlite":
+            store = SqliteSessionStore(args.db, session_format="compact")
+        else:
+            store = JsonSessionStore(args.source, session_format="compact")
+        converted, quarantined = compact_sessions(store)
+        print(f"Converted {converted} sessions to the compact format ({quarantined} corrupt sessions quarantined); {store.count_sessions()} sessions in total")
+        store.close()
+        return
+
+    store = SqliteSessionStore(args.db)
+    imported, skipped = migrate_json_sessions(args.source, store)
+    print(f"Imported {imported} sessions into {args.db} ({skipped} unreadable sessions skipped); {store.count_sessions()} sessions in total")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+import os
+from dataclasses import dataclass
+from types import MappingProxyType
+from config import TECH_KEYWORDS, TECH_TAXONOMY_PATH
+from src.tech_matcher import load_taxonomy, normalize_alias
+
+# Common abbreviations and variations, and the canonical names they are reported as.
+# Abbreviations are matched on their own, not only when they are also keywords,
+# so "py", "nodejs" or "postgres" count; bare "ci" and "cd" are left out since
+# they are everyday words ("cd into the folder"), so only "ci/cd" is matched.
+TECH_ALIASES = {
+    "javascript": ["js"],
+    "typescript": ["ts"],
+    "python": ["py"],
+    "react.js": ["react", "reactjs"],
+    "node.js": ["node", "nodejs"],
+    "express.js": ["express", "expressjs"],
+    "postgresql": ["postgres"],
+    "kubernetes": ["k8s"],
+    "ci/cd": ["cicd", "ci-cd"],
+    "continuous integration": [],
+    "continuous deployment": [],
+    "machine learning": ["ml"],
+    "artificial intelligence": ["ai"],
+    "natural language processing": ["nlp"]
+}
+
+# Categories of canonical names none of whose aliases are in TECH_KEYWORDS
+EXTRA_CATEGORIES = {
+    "node.js": ["web_frameworks"],
+    "ci/cd": ["devops_tools"],
+    "continuous integration": ["devops_tools"],
+    "continuous deployment": ["devops_tools"]
+}
+
+
+@dataclass(frozen=True)
+class SkillIndex:
+    """Immutable lookup tables from skill aliases to canonical names and categories.
+
+    Every alias (including each canonical name itself) maps to one canonical
+    name, and every canonical name to the categories it belongs to; a skill
+    can be in several (swift, kotlin and firebase are). A canonical name
+    inherits the categories of its aliases, so "react.js" is a web framework
+    because "react" is.
+    """
+
+    aliases: MappingProxyType
+    categories: MappingProxyType
+    category_names: tuple
+
+    @classmethod
+    def build(cls, keywords=TECH_KEYWORDS, taxonomy_path=TECH_TAXONOMY_PATH):
+        """Build the index from the keyword categories, TECH_ALIASES and an optional taxonomy file."""
+        aliases = {}
+        categories = {}
+        category_names = list(keywords)
+
+        for category, names in keywords.items():
+            for name in names:
+                aliases[normalize_alias(name)] = normalize_alias(name)
+                categories.setdefault(normalize_alias(name), set()).add(category)
+
+        for canonical, abbreviations in TECH_ALIASES.items():
+            for alias in [canonical] + abbreviations:
+                aliases[alias] = canonical
+
+        # Taxonomy skills only add to the built-in names
+        if taxonomy_path and os.path.exists(taxonomy_path):
+            for entry in load_taxonomy(taxonomy_path):
+                canonical = normalize_alias(entry["name"])
+                for alias in [canonical] + [normalize_alias(alias) for alias in entry.get("aliases") or []]:
+                    aliases.setdefault(alias, canonical)
+                for category in entry.get("categories") or []:
+                    categories.setdefault(canonical, set()).add(category)
+                    if category not in category_names:
+                        category_names.append(category)
+
+        for canonical, extra in EXTRA_CATEGORIES.items():
+            categories.setdefault(canonical, set()).update(extra)
+
+        # Canonical names inherit the categories of their aliases
+        canonical_categories = {}
+        for alias, canonical in aliases.items():
+            canonical_categories.setdefault(canonical, set()).update(categories.get(alias, ()))
+            canonical_categories[canonical].update(categories.get(canonical, ()))
+
+        return cls(
+            aliases=MappingProxyType(aliases),
+            categories=MappingProxyType({
+                canonical: frozenset(found) for canonical, found in canonical_categories.items()
+            }),
+            category_names=tuple(category_names)
+        )
+
+    def canonical(self, name):
+        """Return the canonical name of a skill alias, or None if it is unknown."""
+        return self.aliases.get(normalize_alias(name))
+
+    def categories_of(self, name):
+        """Return the categories of a skill, given its canonical name or any alias."""
+        normalized = normalize_alias(name)
+        return self.categories.get(self.aliases.get(normalized, normalized), frozenset())
@@ -0,0 +1,58 @@
+import time
+from config import STREAM_RENDER_MAX_FPS, STREAM_RENDER_MIN_CHARS
+
+class StreamRenderer:
+    """Class to render a streamed response into a Streamlit placeholder at a capped rate.
+
+    Chunks are buffered in a list and the placeholder is only redrawn when the
+    frame interval has passed or enough new text has arrived, followed by one
+    final render without the cursor.
+    """
+
+    def __init__(self, placeholder, max_fps=STREAM_RENDER_MAX_FPS, min_chars=STREAM_RENDER_MIN_CHARS, cursor="▌"):
+        """Initialize the renderer for a placeholder created with st.empty()."""
+        self.placeholder = placeholder
+        self.interval = 1.0 / max_fps if max_fps else 0.0
+        self.min_chars = min_chars
+        self.cursor = cursor
+        self.parts = []
+        self.chunks_received = 0
+        self.ui_updates = 0
+        self._pending_chars = 0
+        self._last_flush = 0.0
+
+    def add(self, text):
+        """Buffer a chunk of text and redraw if a frame is due."""
+        if not text:
+            return
+        self.parts.append(text)
+        self.chunks_received += 1
+        self._pending_chars += len(text)
+
+        now = time.monotonic()
+        if now - self._last_flush >= self.interval or (self.min_chars and self._pending_chars >= self.min_chars):
+            self._render(self.text() + self.cursor)
+            self._last_flush = now
+
+    def text(self):
+        """Return the text received so far."""
+        if len(self.parts) > 1:
+            # Collapse the buffer so later joins only touch new chunks
+            self.parts = ["".join(self.parts)]
+        return self.parts[0] if self.parts else ""
+
+    def finish(self):
+        """Render the complete response without the cursor and return it."""
+        full_text = self.text()
+        self._render(full_text)
+        return full_text
+
+    def stats(self):
+        """Return how many chunks were received and how many UI updates were sent."""
+        return {"chunks_received": self.chunks_received, "ui_updates": self.ui_updates}
+
+    def _render(self, text):
+        """Send the text to the browser."""
+        self.placeholder.markdown(text)
+        self.ui_updates += 1
+        self._pending_chars = 0
@@ -0,0 +1,126 @@
+import json
+import re
+from config import STAGES, STRUCTURED_TRAILER_MARKER
+from src.field_extractor import CANDIDATE_FIELDS
+
+
+class TrailerSplitter:
+    """Split a streamed structured response into candidate-facing text and its JSON trailer.
+
+    Text is passed through as it arrives, except for a tail that could be the
+    start of the trailer marker, which is held back until the next chunk shows
+    whether the marker follows. Everything after the marker is collected as the
+    trailer and never shown to the candidate. Without a marker, text is passed
+    through unchanged.
+    """
+
+    def __init__(self, marker=STRUCTURED_TRAILER_MARKER):
+        """Initialize the splitter for the given trailer marker."""
+        self.marker = marker
+        self.text_parts = []
+        self.trailer_parts = []
+        self._pending = ""
+        self._in_trailer = False
+
+    def feed(self, chunk):
+        """Add a chunk and return the part of it that can be shown now."""
+        if self._in_trailer:
+            self.trailer_parts.append(chunk)
+            return ""
+        if not self.marker:
+            return self._emit(chunk)
+
+        buffer = self._pending + chunk
+        index = buffer.find(self.marker)
+        if index >= 0:
+            self._in_trailer = True
+            self._pending = ""
+            self.trailer_parts.append(buffer[index + len(self.marker):])
+            return self._emit(buffer[:index].rstrip())
+
+        # Hold back the longest suffix that is a prefix of the marker
+        held = 0
+        for size in range(min(len(self.marker) - 1, len(buffer)), 0, -1):
+            if self.marker.startswith(buffer[-size:]):
+                held = size
+                break
+        self._pending = buffer[len(buffer) - held:] if held else ""
+        return self._emit(buffer[:len(buffer) - held])
+
+    def finish(self):
+        """Flush any held-back text once the stream has ended."""
+        pending, self._pending = self._pending, ""
+        return self._emit(pending)
+
+    @property
+    def text(self):
+        """Return the candidate-facing text received so far."""
+        return "".join(self.text_parts)
+
+    def trailer(self):
+        """Parse the trailer, or return None if it was missing or malformed."""
+        if not self._in_trailer:
+            return None
+        return parse_trailer("".join(self.trailer_parts))
+
+    def _emit(self, text):
+        """Record text as candidate-facing and return it."""
+        if text:
+            self.text_parts.append(text)
+        return text
+
+
+def _score(value):
+    """Clamp a score to the 1-5 scale, or return None if it isn't a number."""
+    try:
+        return round(min(max(float(value), 1.0), 5.0), 1)
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_trailer(text):
+    """Parse and normalize a JSON trailer.
+
+    Returns a dict with "candidate_info" (known fields only), "tech_stack"
+    (lowercase names), "next_stage" (a valid stage or None), "scores"
+    (technology -> 1-5) and "overall_score" (1-5 or None), or None if the
+    trailer is not a JSON object.
+    """
+    # Tolerate a fenced code block around the JSON
+    text = re.sub(r'^```(?:json)?\s*|\s*```$', '', (text or "").strip())
+    try:
+        data = json.loads(text)
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+
+    candidate_info = data.get("candidate_info") or {}
+    if not isinstance(candidate_info, dict):
+        candidate_info = {}
+
+    tech_stack = data.get("tech_stack") or []
+    if not isinstance(tech_stack, list):
+        tech_stack = []
+
+    next_stage = data.get("next_stage")
+
+    scores = {}
+    raw_scores = data.get("scores") or {}
+    if isinstance(raw_scores, dict):
+        for technology, value in raw_scores.items():
+            score = _score(value)
+            if str(technology).strip() and score is not None:
+                scores[str(technology).strip()] = score
+
+    return {
+        "candidate_info": {
+            key: str(value).strip()
+            for key, value in candidate_info.items()
+            if key in CANDIDATE_FIELDS and value not in (None, "") and str(value).strip()
+        },
+        "tech_stack": [str(tech).strip().lower() for tech in tech_stack if str(tech).strip()],
+        "next_stage": next_stage if next_stage in STAGES else None,
+        "scores": scores,
+        "overall_score": _score(data.get("overall_score"))
+    }
@@ -1,68 +1,83 @@
-import re
-from config import TECH_KEYWORDS
+import threading
+from config import TECH_FUZZY_MATCHING, TECH_FUZZY_MIN_CONFIDENCE, TECH_FUZZY_BUDGET_MS
+from src.skill_index import SkillIndex
+from src.tech_matcher import TechMatcher
+from src.fuzzy_matcher import FuzzyTechMatcher
 
 class TechAnalyzer:
     """Class for analyzing and extracting technical skills from text."""
     
-    def __init__(self):
-        """Initialize with available tech keywords from config."""
-        self.all_keywords = []
-        for category in TECH_KEYWORDS.values():
-            self.all_keywords.extend(category)
+    # Skill index and the exact and fuzzy matchers over its aliases, built once per process
+    _skill_index = None
+    _matcher = None
+    _fuzzy_matcher = None
+    _matcher_lock = threading.Lock()
     
-    def extract_tech(self, text):
-        """Extract technical skills from a text message."""
-        text = text.lower()
-        
-        # Extract known keywords
-        found_techs = []
+    def __init__(self, fuzzy=TECH_FUZZY_MATCHING, min_confidence=TECH_FUZZY_MIN_CONFIDENCE, fuzzy_budget_ms=TECH_FUZZY_BUDGET_MS):
+        """Initialize with the shared skill index and matchers.
         
-        # Direct matching of keywords
-        for tech in self.all_keywords:
-            # Match whole words only (using word boundaries)
-            if re.search(r'\b' + re.escape(tech) + r'\b', text):
-                found_techs.append(tech)
+        `fuzzy_budget_ms` caps the fuzzy pass per message; None lets it
+        check every word.
+        """
+        self.skill_index, self.matcher, self.fuzzy_matcher = self.shared_index()
+        self.all_keywords = list(self.skill_index.aliases)
+        self.fuzzy = fuzzy
+        self.min_confidence = min_confidence
+        self.fuzzy_budget_ms = fuzzy_budget_ms
+    
+    @classmethod
+    def shared_index(cls):
+        """Get the process-wide skill index and tech matchers, building them on first use."""
+        with cls._matcher_lock:
+            if cls._skill_index is None:
+                cls._skill_index = SkillIndex.build()
+                cls._matcher = TechMatcher(cls._skill_index.aliases)
+                cls._fuzzy_matcher = FuzzyTechMatcher(cls._skill_index.aliases)
+            return cls._skill_index, cls._matcher, cls._fuzzy_matcher
+    
+    def match_tech(self, text):
+        """Return {"technology", "confidence", "text"} for every skill in a message.
         
-        # Special case handling for common abbreviations and variations
-        special_cases = {
-            "javascript": ["js"],
-            "typescript": ["ts"],
-            "python": ["py"],
-            "react.js": ["react", "reactjs"],
-            "node.js": ["node", "nodejs"],
-            "express.js": ["express", "expressjs"],
-            "postgresql": ["postgres"],
-            "kubernetes": ["k8s"],
-            "continuous integration": ["ci"],
-            "continuous deployment": ["cd"],
-            "machine learning": ["ml"],
-            "artificial intelligence": ["ai"],
-            "natural language processing": ["nlp"]
-        }
+        Exact alias matches have confidence 1.0. With fuzzy matching on, words
+        outside the exact matches are also checked for misspelled skills,
+        whatever their confidence.
+        """
+        spans = self.matcher.find_spans(text)
+        matches = []
+        for start, end, canonical in spans:
+            if all(match["technology"] != canonical for match in matches):
+                matches.append({"technology": canonical, "confidence": 1.0, "text": text[start:end]})
         
-        # Check for special cases
-        for full_name, abbreviations in special_cases.items():
-            for abbr in abbreviations:
-                if abbr in found_techs and full_name not in found_techs:
-                    found_techs.remove(abbr)
-                    found_techs.append(full_name)
+        if self.fuzzy:
+            for match in self.fuzzy_matcher.find(text, skip_spans=[(start, end) for start, end, _ in spans], budget_ms=self.fuzzy_budget_ms):
+                if all(found["technology"] != match["technology"] for found in matches):
+                    matches.append(match)
+        return matches
+    
+    def extract_tech(self, text):
+        """Extract technical skills from a text message.
         
-        return found_techs
+        One scan finds every known alias on word boundaries, preferring the
+        longest (so "react native" is not also reported as "react"), and
+        reports each as its full name (so "k8s" becomes "kubernetes").
+        Misspelled skills are added only when matched with at least
+        `min_confidence`.
+        """
+        return [match["technology"] for match in self.match_tech(text) if match["confidence"] >= self.min_confidence]
     
     def categorize_tech_stack(self, tech_list):
         """Categorize a list of technologies by type."""
         categorized = {}
+        for tech in tech_list:
+            for category in self.skill_index.categories_of(tech):
+                categorized.setdefault(category, []).append(tech)
         
-        for category, keywords in TECH_KEYWORDS.items():
-            category_name = category.replace("_", " ").title()
-            categorized[category_name] = []
-            
-            for tech in tech_list:
-                if tech.lower() in keywords:
-                    categorized[category_name].append(tech)
-        
-        # Remove empty categories
-        return {k: v for k, v in categorized.items() if v}
+        # Keep the categories in TECH_KEYWORDS order and drop empty ones
+        return {
+            category.replace("_", " ").title(): categorized[category]
+            for category in self.skill_index.category_names
+            if category in categorized
+        }
     
     def suggest_related_technologies(self, tech_list):
         """Suggest related technologies based on the current tech stack."""
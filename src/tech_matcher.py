@@ -0,0 +1,108 @@
+import csv
+import json
+import re
+
+# Whitespace inside a multi-word alias matches any run of whitespace in the text
+_SPACE = re.compile(r"\s+")
+
+
+def normalize_alias(alias):
+    """Normalize an alias for lookup: lowercase with single spaces."""
+    return _SPACE.sub(" ", str(alias or "").strip().lower())
+
+
+def load_taxonomy(path):
+    """Load skill entries from a .json, .jsonl or .csv taxonomy file.
+
+    Each entry is a dict with a canonical "name" and optional "aliases" and
+    "categories" lists. JSON files hold {"skills": [...]} (or a bare list),
+    JSONL files one entry per line, and CSV files name, categories and aliases
+    columns with ";"-separated lists.
+    """
+    if path.endswith(".csv"):
+        with open(path, "r", newline="", encoding="utf-8") as f:
+            return [
+                {
+                    "name": row.get("name"),
+                    "categories": [item for item in (row.get("categories") or "").split(";") if item.strip()],
+                    "aliases": [item for item in (row.get("aliases") or "").split(";") if item.strip()]
+                }
+                for row in csv.DictReader(f)
+            ]
+
+    with open(path, "r", encoding="utf-8") as f:
+        if path.endswith(".jsonl"):
+            entries = [json.loads(line) for line in f if line.strip()]
+        else:
+            data = json.load(f)
+            entries = data.get("skills", []) if isinstance(data, dict) else data
+    return [entry for entry in entries if isinstance(entry, dict) and entry.get("name")]
+
+
+class TechMatcher:
+    """Finds skill aliases in text with one pass of a single compiled trie.
+
+    The aliases are merged into a character trie and compiled into one regex
+    whose alternations only branch where aliases diverge, so each text
+    position costs about the same however many aliases there are. Matches
+    respect word boundaries, prefer the longest alias at each position and
+    are reported as canonical names in the order they first appear.
+    """
+
+    def __init__(self, aliases):
+        """Build the matcher from a mapping of alias -> canonical name."""
+        self.aliases = {normalize_alias(alias): canonical for alias, canonical in aliases.items() if normalize_alias(alias)}
+        trie = {}
+        for alias in self.aliases:
+            node = trie
+            for char in alias:
+                node = node.setdefault(char, {})
+            node[""] = True
+        self.pattern = re.compile(r"(?<!\w)(?:" + self._trie_pattern(trie) + r")(?!\w)") if trie else None
+
+    @classmethod
+    def _trie_pattern(cls, node):
+        """Compile a trie node into a regex, with longer continuations tried before stopping."""
+        branches = []
+        for char in sorted(char for char in node if char):
+            child = node[char]
+            token = r"\s+" if char == " " else re.escape(char)
+            branches.append(token + cls._trie_pattern(child))
+
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            # The alias may end here; the optional group is greedy, so longer aliases win
+            return "(?:" + body + ")?"
+        return body
+
+    def find_spans(self, text):
+        """Return (start, end, canonical name) for every alias in a text."""
+        if not self.pattern or not text:
+            return []
+        spans = []
+        for match in self.pattern.finditer(text.lower()):
+            canonical = self.aliases.get(normalize_alias(match.group(0)))
+            if canonical:
+                spans.append((match.start(), match.end(), canonical))
+        return spans
+
+    def find(self, text):
+        """Return the canonical names of the aliases in a text, in order of first appearance."""
+        found = []
+        for _, _, canonical in self.find_spans(text):
+            if canonical not in found:
+                found.append(canonical)
+        return found
+
+    @staticmethod
+    def taxonomy_aliases(entries):
+        """Build an alias -> canonical table from taxonomy entries."""
+        aliases = {}
+        for entry in entries:
+            canonical = normalize_alias(entry["name"])
+            aliases[canonical] = canonical
+            for alias in entry.get("aliases") or []:
+                aliases.setdefault(normalize_alias(alias), canonical)
+        return aliases
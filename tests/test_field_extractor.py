@@ -0,0 +1,54 @@
+import pytest
+from src.field_extractor import extract_candidate_fields, extract_phone
+
+
+@pytest.mark.parametrize("message, experience", [
+    ("I have 5 years of experience", "5 years of experience"),
+    ("About 3.5 yrs in backend work", "3.5 yrs"),
+    ("10+ years of professional experience", "10+ years of professional experience"),
+    ("five years", "five years"),
+    ("a couple of years of work experience", "a couple of years of work experience"),
+    ("18 months", "18 months"),
+    ("I'm a fresher", "fresher"),
+    ("I am a fresh graduate", "fresh graduate"),
+    ("no professional experience yet", "no professional experience")
+])
+def test_experience(message, experience):
+    assert extract_candidate_fields(message)["experience"] == experience
+
+
+@pytest.mark.parametrize("message", ["I am 25 years old", "25 years of age"])
+def test_age_is_not_experience(message):
+    assert "experience" not in extract_candidate_fields(message)
+
+
+def test_bare_answer_to_the_experience_question():
+    assert extract_candidate_fields("about a year", expected_field="experience") == {"experience": "about a year"}
+
+
+def test_experience_is_not_read_as_a_phone_number():
+    fields = extract_candidate_fields("I have 12 years of experience, call me on +44 20 7946 0958")
+    assert fields["experience"] == "12 years of experience"
+    assert fields["phone"] == "+442079460958"
+
+
+def test_every_field_in_one_message():
+    fields = extract_candidate_fields(
+        "My name is John Smith, email john@example.com, 5 years of experience, "
+        "applying for Backend Engineer, based in Berlin"
+    )
+    assert fields == {
+        "name": "John Smith",
+        "email": "john@example.com",
+        "experience": "5 years of experience",
+        "position": "Backend Engineer",
+        "location": "Berlin"
+    }
+
+
+def test_name_stops_at_the_next_clause():
+    assert extract_candidate_fields("I am Jane and I live in Paris") == {"name": "Jane", "location": "Paris"}
+
+
+def test_short_numbers_are_not_phones():
+    assert extract_phone("room 12345") is None
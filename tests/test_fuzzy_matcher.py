@@ -0,0 +1,33 @@
+from src.fuzzy_matcher import FuzzyTechMatcher, bounded_edit_distance
+
+ALIASES = {"kubernetes": "kubernetes", "tensorflow": "tensorflow", "postgresql": "postgresql", "react": "react", "java": "java"}
+
+
+def test_bounded_edit_distance():
+    assert bounded_edit_distance("kubernets", "kubernetes", 2) == 1
+    assert bounded_edit_distance("kubernetes", "kubernetes", 0) == 0
+    assert bounded_edit_distance("kafka", "kubernetes", 2) is None
+
+
+def test_typos_and_split_words():
+    matches = FuzzyTechMatcher(ALIASES).find("I deploy to kubernets and train in tensor flow", budget_ms=None)
+    assert {match["technology"]: match["confidence"] for match in matches} == {"kubernetes": 0.9, "tensorflow": 0.95}
+
+
+def test_short_words_are_left_to_the_exact_matcher():
+    matcher = FuzzyTechMatcher(ALIASES)
+    assert "java" not in matcher.aliases
+    assert matcher.find("I use jawa", budget_ms=None) == []
+    assert matcher.find("I use reakt", budget_ms=None) == [{"technology": "react", "confidence": 0.8, "text": "reakt"}]
+
+
+def test_skip_spans_and_stop():
+    matcher = FuzzyTechMatcher(ALIASES)
+    text = "postgress and kubernets"
+    assert [canonical for _, canonical, _, _ in matcher.find_all(text, budget_ms=None)] == ["postgresql", "kubernetes"]
+    assert [canonical for _, canonical, _, _ in matcher.find_all(text, [(0, 9)], budget_ms=None)] == ["kubernetes"]
+    assert [canonical for _, canonical, _, _ in matcher.find_all(text, budget_ms=None, stop=10)] == ["postgresql"]
+
+
+def test_expired_budget_returns_nothing():
+    assert FuzzyTechMatcher(ALIASES).find("kubernets " * 50, budget_ms=-1) == []
@@ -0,0 +1,26 @@
+import threading
+import pytest
+from src.request_scheduler import RequestScheduler
+
+
+class StopRender(BaseException):
+    """Stand-in for Streamlit's rerun/stop exceptions."""
+
+
+def test_acquire_removes_ticket_when_on_wait_raises():
+    scheduler = RequestScheduler(requests_per_minute=1, tokens_per_minute=0, max_retries=0)
+    scheduler.acquire(10)
+
+    def on_wait(position, expected_wait):
+        raise StopRender()
+
+    with pytest.raises(StopRender):
+        scheduler.acquire(10, on_wait=on_wait)
+    assert scheduler.queue_length() == 0
+
+    # A later request is not stuck behind the abandoned ticket
+    scheduler.request_bucket.tokens = scheduler.request_bucket.capacity
+    done = threading.Event()
+    thread = threading.Thread(target=lambda: (scheduler.acquire(10), done.set()), daemon=True)
+    thread.start()
+    assert done.wait(timeout=2)
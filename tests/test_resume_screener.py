@@ -0,0 +1,44 @@
+import json
+import pytest
+from src.resume_screener import iter_chunks, iter_documents, screen_batch
+
+RESUME = (
+    "Senior engineer with machine learning experience. Built services in Python and Django, "
+    "deployed on kubernets with postgresql and redis. Trained models in tensor flow and scikit-learn. "
+) * 5
+
+
+def test_chunks_cover_the_text():
+    chunks = list(iter_chunks({"id": 1, "text": RESUME}, chunk_size=50))
+    assert len(chunks) > 1
+    assert "".join(text[:stop] for text, stop in chunks) == RESUME
+
+
+@pytest.mark.parametrize("chunk_size", [6, 17, 64, 333])
+def test_results_do_not_depend_on_chunk_size(chunk_size):
+    whole = screen_batch([{"id": 1, "text": RESUME}], chunk_size=8192)[0]
+    chunked = screen_batch([{"id": 1, "text": RESUME}], chunk_size=chunk_size)[0]
+    assert chunked == whole
+    assert {match["technology"]: match["mentions"] for match in whole["matches"]}["machine learning"] == 5
+
+
+def test_text_files_are_read_in_chunks(tmp_path):
+    (tmp_path / "a.txt").write_text(RESUME)
+    documents = list(iter_documents(str(tmp_path)))
+    assert documents == [{"id": "a.txt", "path": str(tmp_path / "a.txt")}]
+    assert screen_batch(documents, chunk_size=40)[0]["matches"] == screen_batch([{"id": "a.txt", "text": RESUME}])[0]["matches"]
+
+
+def test_bad_jsonl_lines_are_reported(tmp_path):
+    source = tmp_path / "resumes.jsonl"
+    source.write_text("\n".join([
+        json.dumps({"id": "ok", "text": "Python developer"}),
+        "{not json",
+        json.dumps(["not", "an", "object"]),
+        json.dumps({"id": "empty"})
+    ]) + "\n")
+
+    results = screen_batch(list(iter_documents(str(source))))
+    assert [result["id"] for result in results] == ["ok", 2, 3, "empty"]
+    assert results[0]["skills"] == ["python"]
+    assert all("error" in result for result in results[1:])
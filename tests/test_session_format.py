@@ -0,0 +1,52 @@
+import pytest
+from src.session_format import (
+    CorruptSessionError, SavedSession, decode_header, decode_session, encode_session, is_compact
+)
+
+
+def sample_session():
+    return {
+        "interview_id": "abc",
+        "candidate_info": {"name": "Jane", "tech_stack": ["python"]},
+        "current_stage": "technical_questions",
+        "messages": [
+            {"role": "assistant", "content": "Hello"},
+            {"role": "user", "content": "Hi, I'm Jane"},
+            {"role": "user", "content": "I use python"}
+        ],
+        "sentiment_data": [
+            {"message": "Hi, I'm Jane", "sentiment": "positive", "score": 0.5},
+            {"message": "I use python", "sentiment": "neutral", "score": 0.0}
+        ]
+    }
+
+
+def test_round_trip():
+    blob = encode_session(sample_session())
+    assert is_compact(blob)
+    assert decode_session(blob) == sample_session()
+
+
+def test_header_is_decoded_without_the_transcript():
+    saved = SavedSession(blob=encode_session(sample_session()))
+    assert saved.header["candidate_info"]["name"] == "Jane"
+    assert saved.header["message_count"] == 3
+    assert not saved.decoded
+    assert saved.to_dict() == sample_session()
+    assert saved.decoded
+
+
+@pytest.mark.parametrize("damage", [
+    lambda blob: blob[:6],
+    lambda blob: blob[:len(blob) // 2],
+    lambda blob: blob[:12] + b"\x00" * (len(blob) - 12)
+])
+def test_damaged_blob_raises_corrupt_session_error(damage):
+    blob = damage(encode_session(sample_session()))
+    with pytest.raises(CorruptSessionError):
+        decode_session(blob)
+
+
+def test_non_compact_data_raises_corrupt_session_error():
+    with pytest.raises(CorruptSessionError):
+        decode_header(b'{"messages": []}')
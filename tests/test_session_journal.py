@@ -0,0 +1,44 @@
+from src.session_journal import SessionJournal
+
+
+def test_append_and_replay(tmp_path):
+    journal = SessionJournal(str(tmp_path))
+    previous = {"messages": [], "current_stage": "greeting"}
+    current = {"messages": [{"role": "user", "content": "Hi"}], "current_stage": "gather_info"}
+
+    last_seq = journal.append("s1", SessionJournal.diff_entries(previous, current))
+    assert last_seq == 2
+    assert journal.last_seq("s1") == 2
+
+    replayed = SessionJournal.replay({"messages": [], "current_stage": "greeting"}, journal.read("s1"))
+    assert replayed["messages"] == current["messages"]
+    assert replayed["current_stage"] == "gather_info"
+    assert replayed["journal_seq"] == 2
+    assert journal.read("s1", after_seq=1) == journal.read("s1")[1:]
+
+
+def test_numbers_after_the_highest_seen_sequence(tmp_path):
+    journal = SessionJournal(str(tmp_path))
+    journal.append("s1", [("message", {"content": "a"})], last_seq=5)
+    # A writer that last saw an older number still continues after the journal
+    assert journal.append("s1", [("message", {"content": "b"})], last_seq=1) == 7
+
+
+def test_torn_final_line_is_skipped(tmp_path):
+    journal = SessionJournal(str(tmp_path))
+    journal.append("s1", [("message", {"content": "a"})])
+    with open(journal.path("s1"), "a") as f:
+        f.write('{"seq": 2, "type": "mess')
+
+    assert [entry["seq"] for entry in journal.read("s1")] == [1]
+    # The next append starts on a fresh line
+    journal.append("s1", [("message", {"content": "b"})])
+    assert [entry["seq"] for entry in journal.read("s1")] == [1, 2]
+
+
+def test_truncate(tmp_path):
+    journal = SessionJournal(str(tmp_path))
+    journal.append("s1", [("message", {"content": "a"})])
+    journal.truncate("s1")
+    assert journal.read("s1") == []
+    assert journal.last_seq("s1") == 0
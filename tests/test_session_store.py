@@ -0,0 +1,174 @@
+import json
+import os
+import pytest
+from src.session_format import CorruptSessionError
+from src.session_integrity import IntegrityScanner
+from src.session_lock import SessionLock
+from src.session_store import JsonSessionStore, SqliteSessionStore, compact_sessions
+
+
+def session(name, stage="gather_info"):
+    return {
+        "candidate_info": {"name": name, "email": f"{name.lower()}@example.com"},
+        "current_stage": stage,
+        "messages": [{"role": "user", "content": f"I'm {name}"}],
+        "sentiment_data": []
+    }
+
+
+@pytest.fixture(params=["json", "sqlite"])
+def make_store(request, tmp_path):
+    stores = []
+
+    def make(session_format="compact"):
+        if request.param == "json":
+            store = JsonSessionStore(str(tmp_path / "sessions"), session_format=session_format)
+        else:
+            store = SqliteSessionStore(str(tmp_path / "sessions.db"), session_format=session_format)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+def corrupt(store, session_id):
+    """Overwrite a stored session with a compact prefix followed by garbage."""
+    garbage = b"TSS\x02\x00\x00\x00\x05garbage"
+    if isinstance(store, JsonSessionStore):
+        with open(os.path.join(store.directory, f"{session_id}.session"), "wb") as f:
+            f.write(garbage)
+    else:
+        with store._connection() as connection:
+            connection.execute("UPDATE sessions SET data = ? WHERE session_id = ?", (garbage, session_id))
+
+
+@pytest.mark.parametrize("session_format", ["compact", "json"])
+def test_round_trip(make_store, session_format):
+    store = make_store(session_format)
+    store.save("session_a", session("Alice"))
+    store.save("session_b", session("Bob", stage="tech_stack"))
+
+    assert store.load("session_a") == session("Alice")
+    assert store.load_lazy("session_b").header["current_stage"] == "tech_stack"
+    assert store.load("missing") is None
+    assert store.session_ids() == ["session_a", "session_b"]
+    assert store.count_sessions(search="bob") == 1
+    assert [summary["session_id"] for summary in store.list_sessions(stage="tech_stack")] == ["session_b"]
+
+    assert store.delete("session_a")
+    assert store.session_ids() == ["session_b"]
+
+
+def test_save_bumps_version(make_store):
+    store = make_store()
+    before = store.version()
+    store.save("session_a", session("Alice"))
+    assert store.version() != before
+
+
+def test_corrupt_session_is_quarantined(make_store):
+    store = make_store()
+    store.save("session_a", session("Alice"))
+    corrupt(store, "session_a")
+
+    with pytest.raises(CorruptSessionError):
+        store.load("session_a")
+    assert store.quarantine("session_a", reason="test")
+    assert store.session_ids() == []
+
+
+def test_compact_quarantines_corrupt_legacy_sessions(make_store):
+    store = make_store("json")
+    store.save("session_a", session("Alice"))
+    store.save("session_b", session("Bob"))
+    store.save("session_c", session("Carol"))
+    if isinstance(store, JsonSessionStore):
+        with open(os.path.join(store.directory, "session_b.json"), "w") as f:
+            f.write("{not json")
+    else:
+        with store._connection() as connection:
+            connection.execute("UPDATE sessions SET data = '{not json' WHERE session_id = 'session_b'")
+
+    store.session_format = "compact"
+    assert compact_sessions(store) == (2, 1)
+    assert store.legacy_sessions() == []
+    assert store.session_ids() == ["session_a", "session_c"]
+    assert store.load("session_c") == session("Carol")
+
+
+def test_sqlite_store_imports_session_files_once(tmp_path):
+    source = tmp_path / "sessions"
+    JsonSessionStore(str(source), session_format="json").save("session_a", session("Alice"))
+    JsonSessionStore(str(source), session_format="compact").save("session_b", session("Bob"))
+    (source / "session_c.json").write_text("{not json")
+
+    store = SqliteSessionStore(str(tmp_path / "sessions.db"))
+    store.save("session_a", session("Alicia"))
+    assert store.import_legacy_sessions(str(source)) == 1
+    # A session the database already had is not overwritten
+    assert store.load("session_a")["candidate_info"]["name"] == "Alicia"
+    assert store.load("session_b") == session("Bob")
+
+    store.delete("session_b")
+    assert store.import_legacy_sessions(str(source)) == 0
+    assert store.session_ids() == ["session_a"]
+    store.close()
+
+
+def test_sqlite_store_shares_one_connection_across_threads(tmp_path):
+    import threading
+    store = SqliteSessionStore(str(tmp_path / "sessions.db"))
+    threads = [threading.Thread(target=store.save, args=(f"session_{i}", session(f"N{i}"))) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.count_sessions() == 20
+    assert store.version() == 20
+    store.close()
+
+
+@pytest.fixture
+def lock_dir(tmp_path, monkeypatch):
+    directory = str(tmp_path / "locks")
+    monkeypatch.setattr(SessionLock.__init__, "__defaults__", (directory, 0.05))
+    monkeypatch.setattr(SessionLock.remove_stale, "__defaults__", (directory,))
+    return directory
+
+
+def test_lock_file_is_removed_on_release(lock_dir):
+    with SessionLock("session_a"):
+        assert os.listdir(lock_dir) == ["session_a.lock"]
+        with pytest.raises(TimeoutError):
+            SessionLock("session_a").acquire()
+    assert os.listdir(lock_dir) == []
+
+
+def test_integrity_scan_quarantines_corrupt_sessions(make_store, lock_dir):
+    store = make_store()
+    store.save("session_a", session("Alice"))
+    store.save("session_b", session("Bob"))
+    corrupt(store, "session_b")
+    os.makedirs(lock_dir)
+    open(os.path.join(lock_dir, "stale.lock"), "w").close()
+
+    result = IntegrityScanner.scan(store, pause=0)
+    assert result["checked"] == 2
+    assert result["quarantined"] == ["session_b"]
+    assert result["lock_files_removed"] == 1
+    assert store.session_ids() == ["session_a"]
+
+
+def test_integrity_scan_skips_locked_sessions(make_store, lock_dir):
+    store = make_store()
+    store.save("session_a", session("Alice"))
+    store.save("session_b", session("Bob"))
+    corrupt(store, "session_a")
+
+    with SessionLock("session_a"):
+        result = IntegrityScanner.scan(store, pause=0)
+    assert result["skipped"] == ["session_a"]
+    assert result["quarantined"] == []
+    assert store.session_ids() == ["session_a", "session_b"]
@@ -3,6 +3,8 @@ import streamlit as st
 import os
 import json
 from datetime import datetime
+# Candidate field extraction lives in src.field_extractor; re-exported for existing imports
+from src.field_extractor import extract_email, extract_phone
 
 def format_timestamp(timestamp_str):
     """Format an ISO timestamp string to a readable format."""
@@ -12,23 +14,6 @@ def format_timestamp(timestamp_str):
     except:
         return timestamp_str
 
-def extract_email(text):
-    """Extract an email address from text."""
-    email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-    match = re.search(email_pattern, text)
-    return match.group(0) if match else None
-
-def extract_phone(text):
-    """Extract a phone number from text."""
-    # Remove non-numeric characters
-    digits = re.sub(r'\D', '', text)
-    
-    # Check for typical phone number patterns
-    if len(digits) >= 10:
-        return digits[-10:]  # Return last 10 digits
-    
-    return None
-
 def sanitize_filename(name):
     """Convert a string to a valid filename."""
     # Replace spaces and special characters